@@ -0,0 +1,4 @@
+from .coverage import COVERAGE_KINDS, DOSES, GROUPS, REGIONS
+from .coverage import coverage, age_at_dose, dose_completion
+from .dataset import get_dataset
+from .store import DIMENSIONS, COLUMNS, get_store, filter_expression, count_records, read_records
@@ -0,0 +1,290 @@
+"""
+HepB vaccination coverage, ported from the R notebooks in `data/coverage`.
+
+Every step is a column-wise pandas/NumPy operation over the long-format dataset
+(one row per dose): no Python loop runs per child or per dose. The pipeline is
+`read_doses` -> `prepare_doses` -> `dose_status`, and the metrics below group the
+result by province or region and birth cohort (`year_dob`).
+"""
+
+from typing import Callable, Optional
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+COLUMNS = ["pid", "vacname", "vacdate", "dob", "province_reg"]
+
+# Doses outside the data collection period are entry errors
+FIRST_YEAR = 2014
+LAST_YEAR = 2022
+
+# Boostrix is recorded alongside the HepB doses but does not protect against HepB
+EXCLUDED_VACCINES = ["Boostrix"]
+
+REGIONS = {
+    "RRD": ["Hà Nội", "Vĩnh Phúc", "Bắc Ninh", "Quảng Ninh", "Hải Dương", "Hải Phòng", "Hưng Yên", "Thái Bình", "Hà Nam", "Nam Định", "Ninh Bình"],
+    "NMM": ["Hà Giang", "Cao Bằng", "Bắc Kạn", "Tuyên Quang", "Lào Cai", "Yên Bái", "Thái Nguyên", "Lạng Sơn", "Bắc Giang", "Phú Thọ", "Điện Biên", "Lai Châu", "Sơn La", "Hòa Bình"],
+    "NCC": ["Thanh Hóa", "Nghệ An", "Hà Tĩnh", "Quảng Bình", "Quảng Trị", "Thừa Thiên Huế", "Đà Nẵng", "Quảng Nam", "Quảng Ngãi", "Bình Định", "Phú Yên", "Khánh Hòa", "Ninh Thuận", "Bình Thuận"],
+    "CHL": ["Kon Tum", "Gia Lai", "Đắk Lắk", "Đắk Nông", "Lâm Đồng"],
+    "SE": ["Bình Phước", "Tây Ninh", "Bình Dương", "Đồng Nai", "Bà Rịa - Vũng Tàu", "Thành phố Hồ Chí Minh"],
+    "MKD": ["Long An", "Tiền Giang", "Bến Tre", "Trà Vinh", "Vĩnh Long", "Đồng Tháp", "An Giang", "Kiên Giang", "Cần Thơ", "Hậu Giang", "Sóc Trăng", "Bạc Liêu", "Cà Mau"],
+}
+PROVINCE_REGIONS = {province: region for region, provinces in REGIONS.items() for province in provinces}
+
+# Accepted delays of each dose, for up-to-date and age-specific coverage. A delay is
+# -1 (early), 0 (on schedule), 1 (late) or 2 (very late); the newborn dose delay is
+# 0 (first day), 1 (first week), 2 (first month) or 3 (later).
+DOSES = ["newborn", "newborn_possible", "hbv1", "hbv2", "hbv3"]
+UP_TO_DATE = {
+    "newborn": [0],
+    "newborn_possible": [0, 1, 2],
+    "hbv1": [-1, 0, 1, 2],
+    "hbv2": [-1, 0, 1, 2],
+    "hbv3": [-1, 0, 1, 2],
+}
+AGE_SPECIFIC = {
+    "newborn": [0],
+    "newborn_possible": [0, 1],
+    "hbv1": [0],
+    "hbv2": [0],
+    "hbv3": [0],
+}
+COVERAGE_KINDS = {"up_to_date": UP_TO_DATE, "age_specific": AGE_SPECIFIC}
+
+# Delay column of each dose in the `dose_status` frame
+DELAY_COLUMNS = {
+    "newborn": "newborn_delay",
+    "newborn_possible": "newborn_delay",
+    "hbv1": "hbv1_delay",
+    "hbv2": "hbv2_delay",
+    "hbv3": "hbv3_delay",
+}
+
+# Group columns of the metrics
+GROUPS = {"province": "province_reg", "region": "region"}
+
+
+def read_doses(path: str) -> pd.DataFrame:
+    """Read the dose columns of the long-format parquet, skipping excluded vaccines at scan time."""
+    table = pq.read_table(
+        path,
+        columns=COLUMNS,
+        filters=[("vacname", "not in", EXCLUDED_VACCINES)],
+    )
+    return table.to_pandas()
+
+
+def vac_month(age: np.ndarray) -> np.ndarray:
+    """
+    Bucket the age at dose (days) into the notebook's `vac_month`.
+
+    -2 is the first day, -1 the first week, 0 the first month, then one bucket per
+    30 days up to 11 (330 days and over). A dose before birth is NaN.
+    """
+    month = np.minimum(age // 30, 11).astype(float)
+    month[age < 30] = 0
+    month[age <= 7] = -1
+    month[age <= 1] = -2
+    month[age < 0] = np.nan
+    return month
+
+
+def prepare_doses(doses: pd.DataFrame) -> pd.DataFrame:
+    """Keep the collection period and derive `year_dob`, `vac_age`, `vac_month` and `region`."""
+    vacdate = pd.to_datetime(doses["vacdate"]).dt.tz_localize(None).dt.normalize()
+    dob = pd.to_datetime(doses["dob"]).dt.tz_localize(None).dt.normalize()
+
+    # Doses without a date of birth cannot be placed in a cohort
+    in_period = (vacdate.dt.year.between(FIRST_YEAR, LAST_YEAR) & dob.notna()).to_numpy()
+    vacdate = vacdate[in_period]
+    dob = dob[in_period]
+
+    prepared = pd.DataFrame(
+        {
+            "pid": doses["pid"].to_numpy()[in_period],
+            "vacname": doses["vacname"].to_numpy()[in_period],
+            "vacdate": vacdate.to_numpy(),
+            "province_reg": doses["province_reg"].to_numpy()[in_period],
+            "year_dob": dob.dt.year.to_numpy().astype(int),
+        }
+    )
+    age = (vacdate - dob).dt.days.to_numpy()
+    prepared["vac_age"] = age
+    prepared["vac_month"] = vac_month(age)
+    prepared["province_reg"] = prepared["province_reg"].astype("category")
+    prepared["region"] = (
+        prepared["province_reg"].map(PROVINCE_REGIONS).astype(
+            pd.CategoricalDtype(list(REGIONS))
+        )
+    )
+    return prepared
+
+
+def _ifelse(branches: list[tuple[np.ndarray, Callable, float]], default: float) -> np.ndarray:
+    """
+    Vectorized nested R `ifelse(condition, value, ifelse(...))`.
+
+    The first true condition picks its value. A condition on a missing value is NA in
+    R and so is the result, which `np.select` would treat as false instead.
+    """
+    result = np.full(len(branches[0][0]), np.nan)
+    undecided = np.ones(len(result), dtype=bool)
+    for values, condition, value in branches:
+        missing = undecided & np.isnan(values)
+        hit = undecided & ~missing & condition(values)
+        result[hit] = value
+        undecided &= ~(hit | missing)
+    result[undecided] = default
+    return result
+
+
+def _gt(threshold: float) -> Callable:
+    return lambda values: values > threshold
+
+
+def _ge(threshold: float) -> Callable:
+    return lambda values: values >= threshold
+
+
+def _eq(threshold: float) -> Callable:
+    return lambda values: values == threshold
+
+
+def dose_status(prepared: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build one row per child with the `vac_month` of their first four doses (V1-V4) and
+    the delay of each HepB dose, as the notebooks' `data_wide`.
+    """
+    prepared = prepared.sort_values(["pid", "vacdate"], kind="stable")
+    order = prepared.groupby("pid", sort=False).cumcount().to_numpy()
+
+    children = prepared.loc[order == 0, ["pid", "province_reg", "region", "year_dob"]]
+    children = children.set_index("pid")
+    for dose in range(4):
+        months = prepared.loc[order == dose].set_index("pid")["vac_month"]
+        children[f"V{dose + 1}"] = months.reindex(children.index).to_numpy()
+
+    v1, v2, v3, v4 = (children[f"V{dose}"].to_numpy() for dose in range(1, 5))
+    children["newborn_delay"] = _ifelse(
+        [(v1, _eq(-2), 0), (v1, _eq(-1), 1), (v1, _eq(0), 2)], 3
+    )
+    children["hbv1_delay"] = _ifelse(
+        [
+            (v1, _gt(8), 2), (v1, _gt(2), 1), (v1, _eq(2), 0), (v1, _eq(1), -1),
+            (v2, _gt(8), 2), (v2, _gt(2), 1), (v2, _eq(2), 0),
+        ],
+        -1,
+    )
+    children["hbv2_delay"] = _ifelse(
+        [
+            (v2, _gt(9), 2), (v2, _gt(3), 1), (v2, _eq(3), 0), (v1, _ge(1), -1),
+            (v3, _gt(9), 2), (v3, _gt(3), 1), (v3, _eq(3), 0),
+        ],
+        -1,
+    )
+    children["hbv3_delay"] = _ifelse(
+        [
+            (v3, _gt(10), 2), (v3, _gt(4), 1), (v3, _eq(4), 0), (v2, _ge(3), -1),
+            (v4, _gt(10), 2), (v4, _gt(4), 1), (v4, _eq(4), 0),
+        ],
+        -1,
+    )
+    return children.reset_index()
+
+
+def read_births(path: str) -> pd.DataFrame:
+    """
+    Read birth numbers (GSO) as `province_reg, year_dob, birth_number` rows.
+
+    Region births are the sum of their provinces, so leave out the provinces missing
+    from the vaccination data (e.g. Bình Định) as the notebooks do.
+    """
+    births = pd.read_csv(path, usecols=["province_reg", "year_dob", "birth_number"])
+    births["region"] = births["province_reg"].map(PROVINCE_REGIONS)
+    return births
+
+
+def _with_coverage(
+    counts: pd.Series, by: str, births: Optional[pd.DataFrame]
+) -> list[dict]:
+    """Join group/cohort counts with the birth numbers into coverage rows."""
+    group = GROUPS[by]
+    result = counts.rename("count").reset_index().rename(columns={group: "group"})
+    result = result[result["count"] > 0]
+
+    if births is None:
+        result["coverage"] = np.nan
+    else:
+        born = births.groupby([group, "year_dob"])["birth_number"].sum()
+        born = born.rename_axis(["group", "year_dob"]).rename("births").reset_index()
+        result = result.merge(born, on=["group", "year_dob"], how="left")
+        result["coverage"] = (result["count"] / result["births"] * 100).round(1)
+
+    result["group"] = result["group"].astype(str)
+    result["year_dob"] = result["year_dob"].astype(int)
+    result["count"] = result["count"].astype(int)
+    result = result[["group", "year_dob", "count", "coverage"]].astype(object)
+    return result.where(result.notna(), None).to_dict("records")
+
+
+def coverage(
+    status: pd.DataFrame,
+    kind: str,
+    dose: str,
+    by: str = "province",
+    births: Optional[pd.DataFrame] = None,
+    region: Optional[str] = None,
+) -> list[dict]:
+    """
+    Count the children covered by a dose, per group and birth cohort.
+
+    Args:
+        status (pd.DataFrame): Output of `dose_status`.
+        kind (str): `up_to_date` or `age_specific`, see COVERAGE_KINDS.
+        dose (str): One of DOSES.
+        by (str): `province` or `region`.
+        births (pd.DataFrame): Output of `read_births`, to turn counts into percentages.
+        region (str): Only count the provinces of this region.
+
+    Returns:
+        list[dict]: `group`, `year_dob`, `count` and `coverage` (% of births, or None).
+    """
+    covered = status[DELAY_COLUMNS[dose]].isin(COVERAGE_KINDS[kind][dose])
+    if region is not None:
+        covered &= status["region"] == region
+    counts = status[covered].groupby([GROUPS[by], "year_dob"], observed=True).size()
+    return _with_coverage(counts, by, births)
+
+
+def age_at_dose(
+    prepared: pd.DataFrame,
+    months: list[int],
+    by: str = "province",
+    births: Optional[pd.DataFrame] = None,
+) -> list[dict]:
+    """Count the doses given at the `vac_month` buckets `months`, per group and birth cohort."""
+    doses = prepared[prepared["vac_month"].isin(months)]
+    counts = doses.groupby([GROUPS[by], "year_dob"], observed=True).size()
+    return _with_coverage(counts, by, births)
+
+
+def dose_completion(status: pd.DataFrame, by: str = "province") -> list[dict]:
+    """
+    Count the children per number of up-to-date doses among HBV1-HBV3 (0 to 3),
+    per group and birth cohort.
+    """
+    completed = sum(
+        status[DELAY_COLUMNS[dose]].isin(UP_TO_DATE[dose]).astype(int)
+        for dose in ("hbv1", "hbv2", "hbv3")
+    )
+    counts = (
+        status.assign(completed=completed)
+        .groupby([GROUPS[by], "year_dob", "completed"], observed=True)
+        .size()
+        .rename("children")
+        .reset_index()
+        .rename(columns={GROUPS[by]: "group"})
+    )
+    counts["group"] = counts["group"].astype(str)
+    return counts.astype({"year_dob": int, "completed": int, "children": int}).to_dict("records")
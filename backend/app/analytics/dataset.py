@@ -0,0 +1,31 @@
+import asyncio
+import os
+from typing import Optional
+import pandas as pd
+from app.core.settings import settings
+from app.analytics.coverage import read_doses, prepare_doses, dose_status, read_births
+
+
+# Prepared doses, per-child dose status and birth numbers, loaded once on first use
+_dataset: Optional[tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]] = None
+_lock = asyncio.Lock()
+
+
+def load_dataset() -> tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+    """Read and prepare the coverage dataset. Blocking, takes seconds on the full dataset."""
+    prepared = prepare_doses(read_doses(settings.analytics_dataset_path))
+    status = dose_status(prepared)
+    births = None
+    if settings.analytics_births_path and os.path.exists(settings.analytics_births_path):
+        births = read_births(settings.analytics_births_path)
+    print(f"✅ Coverage dataset loaded: {len(prepared)} doses, {len(status)} children")
+    return prepared, status, births
+
+
+async def get_dataset() -> tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+    """Return the coverage dataset, loading it in a worker thread on first use."""
+    global _dataset
+    async with _lock:
+        if _dataset is None:
+            _dataset = await asyncio.to_thread(load_dataset)
+    return _dataset
@@ -0,0 +1,141 @@
+"""
+Research queries over the columnar store written by `data/partition_dataset.py`.
+
+The store is the cleaned dataset as Parquet, partitioned by `province_reg` and
+vaccination `year`. It is opened memory-mapped and scanned batch by batch: filters on
+the partition columns skip whole directories, other filters are pushed down to the
+Parquet row groups, and only the columns a query needs are read. A cold query therefore
+costs a few batches of memory, not the dataset, unlike `app.analytics.dataset` which
+keeps the coverage dataset in memory.
+"""
+
+from collections import Counter
+from typing import Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as fs
+from app.core.settings import settings
+
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("province_reg", pa.string()), ("year", pa.int16())]), flavor="hive"
+)
+
+# Columns that can be filtered on and grouped by; pid, dates and commune are record-only
+DIMENSIONS = (
+    "province_reg", "year", "district_reg", "vacname", "vactype", "vacplace_type", "sex", "ethnic",
+)
+COLUMNS = (
+    "pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type",
+    "province_reg", "district_reg", "commune_reg", "sex", "dob", "ethnic", "year",
+)
+
+_store: Optional[ds.Dataset] = None
+
+
+def open_store(path: str) -> ds.Dataset:
+    """Open the partitioned store memory-mapped. Only lists the files, reads no data."""
+    parquet = ds.ParquetFileFormat(
+        # Reading ranges straight from the mapping beats buffering whole column chunks
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=False)
+    )
+    return ds.dataset(
+        path,
+        format=parquet,
+        partitioning=PARTITIONING,
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def get_store() -> ds.Dataset:
+    """Return the store, opening it on first use."""
+    global _store
+    if _store is None:
+        _store = open_store(settings.analytics_store_path)
+    return _store
+
+
+def filter_expression(
+    filters: dict[str, list[str]],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+) -> Optional[ds.Expression]:
+    """
+    Combine equality filters and a year range into one scanner expression.
+
+    Args:
+        filters: Accepted values per dimension, e.g. `{"sex": ["Nữ"]}`. Empty lists are ignored.
+        year_from: First vaccination year included.
+        year_to: Last vaccination year included.
+    """
+    conditions = []
+    for column, values in filters.items():
+        if column not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {column}")
+        if values:
+            conditions.append(ds.field(column).isin(values))
+    if year_from is not None:
+        conditions.append(ds.field("year") >= year_from)
+    if year_to is not None:
+        conditions.append(ds.field("year") <= year_to)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def count_records(
+    store: ds.Dataset,
+    group_by: list[str],
+    expression: Optional[ds.Expression] = None,
+) -> list[dict]:
+    """
+    Count the vaccination records matching `expression`, per group.
+
+    Batches are grouped one at a time and their counts merged, so memory is bounded
+    by the batch size and the number of groups.
+
+    Returns:
+        list[dict]: One row per group with its `group_by` values and `count`, largest first.
+    """
+    if not group_by:
+        # Partition-only filters are answered from the Parquet metadata
+        return [{"count": store.count_rows(filter=expression)}]
+
+    for column in group_by:
+        if column not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {column}")
+
+    counts = Counter()
+    scanner = store.scanner(
+        columns=list(group_by), filter=expression, batch_size=settings.analytics_batch_size
+    )
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        grouped = pa.Table.from_batches([batch]).group_by(group_by).aggregate([([], "count_all")])
+        keys = zip(*(grouped.column(column).to_pylist() for column in group_by))
+        for key, count in zip(keys, grouped.column("count_all").to_pylist()):
+            counts[key] += count
+
+    return [
+        {**dict(zip(group_by, key)), "count": count} for key, count in counts.most_common()
+    ]
+
+
+def read_records(
+    store: ds.Dataset,
+    columns: list[str],
+    expression: Optional[ds.Expression] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """Return the first `limit` matching records, reading only `columns`."""
+    for column in columns:
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+
+    scanner = store.scanner(
+        columns=list(columns), filter=expression, batch_size=min(limit, settings.analytics_batch_size)
+    )
+    return scanner.head(limit).to_pylist()
@@ -2,9 +2,17 @@ from fastapi import APIRouter
 from . import auth
 from . import graph
 from . import blockchain
+from . import cache
+from . import stats
+from . import coverage
+from . import research
 
 router = APIRouter(prefix="/api")
 
 router.include_router(auth.router)
 router.include_router(graph.router)
-router.include_router(blockchain.router)
\ No newline at end of file
+router.include_router(blockchain.router)
+router.include_router(cache.router)
+router.include_router(stats.router)
+router.include_router(coverage.router)
+router.include_router(research.router)
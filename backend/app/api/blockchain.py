@@ -1,6 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Body, Path, Query
+from fastapi.responses import StreamingResponse
+from web3.exceptions import ContractLogicError
 from app.api.dependencies import secure_endpoint
 from app.blockchain import *
+from app.cache import cache_key, read_through, invalidate
+from app.core.settings import settings
 from app.schemas import AuthDetails, VaccinationData, VaccinationAddress
 from app.schemas.eth import *
 
@@ -21,7 +25,7 @@ async def read_admin_address(payload: AuthDetails = Depends(secure_endpoint)) ->
     """
     Retrieve the address of the contract owner.
     """
-    return EthAddress(address=get_deployer_address())
+    return EthAddress(address=await get_deployer_address())
 
 
 @router.get("/provider/{address}")
@@ -32,7 +36,7 @@ async def check_provider_registration(
     """
     Check if a healthcare provider is registered on the blockchain.
     """
-    return {"authorized": is_authorized_healthcare_provider(address)}
+    return {"authorized": await is_authorized_healthcare_provider(address)}
 
 
 @router.get("/researcher/{address}")
@@ -43,7 +47,7 @@ async def check_researcher_registration(
     """
     Check if a researcher is registered on the blockchain.
     """
-    return {"authorized": is_authorized_researcher(address)}
+    return {"authorized": await is_authorized_researcher(address)}
 
 
 @router.post("/store")
@@ -57,11 +61,88 @@ async def store_vaccination(
     Store a vaccination record hash on the blockchain.
     """
     data_hash = generate_hash(address, vaccination)
-    tx_hash = store_hash(address, data_hash, message, signature)
+    tx_hash = await store_hash(address, data_hash, message, signature)
+    await invalidate(cache_key("hashes", address.patient))
 
     return EthHash(data_hash=data_hash, tx_hash=tx_hash).model_dump(by_alias=True)
 
 
+@router.get("/tx/{tx_hash}")
+async def read_transaction_status(
+    tx_hash: str = Path(...),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> EthTransactionStatus:
+    """
+    Retrieve the status of a transaction submitted by `/store` or `/anchor`.
+
+    Stores return once the transaction is submitted, so this reports whether it was
+    mined, and its block and gas used.
+    """
+    try:
+        return (await get_transaction_status(tx_hash)).model_dump(by_alias=True)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/anchor")
+async def anchor_vaccination(
+    address: VaccinationAddress = Body(...),
+    vaccination: VaccinationData = Body(...),
+    message: EthMessage = Body(...),
+    signature: str = Body(...),
+) -> EthAnchor:
+    """
+    Anchor a vaccination record hash on the blockchain with the provider's next batch.
+
+    Records are committed as one Merkle root per batch instead of one transaction each.
+    The response holds the batch transaction hash and the record's Merkle proof.
+    """
+    data_hash = generate_hash(address, vaccination)
+    try:
+        anchor = await anchor_hash(address, data_hash, message, signature)
+    except (ValueError, ContractLogicError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await invalidate(cache_key("anchored", address.patient))
+
+    return anchor.model_dump(by_alias=True)
+
+
+@router.get("/anchored/{address}")
+async def get_anchored_vaccinations(
+    address: str = Path(...), payload: AuthDetails = Depends(secure_endpoint)
+) -> list[EthAnchor]:
+    """
+    Retrieve the vaccination record hashes anchored in batches, with their Merkle proofs.
+    """
+    if payload.sub != address:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unauthorized access: address mismatch",
+        )
+
+    async def load_anchored():
+        return [record.model_dump(by_alias=True) for record in get_anchored_records(address)]
+
+    return await read_through(
+        "anchored", cache_key("anchored", address), load_anchored, settings.cache_ttl_hashes
+    )
+
+
+@router.get("/anchored/{address}/verify")
+async def verify_anchored_vaccination(
+    address: str = Path(...),
+    data_hash: str = Query(..., alias="dataHash"),
+) -> EthRecord:
+    """
+    Verify a vaccination record hash anchored in a batch against the on-chain Merkle root.
+    """
+    try:
+        timestamp = await verify_anchored_record(address, data_hash)
+        return EthRecord(data_hash=data_hash, timestamp=timestamp).model_dump(by_alias=True)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/get/{address}")
 async def get_vaccination_hashes(
     address: str = Path(...), payload: AuthDetails = Depends(secure_endpoint)
@@ -75,8 +156,13 @@ async def get_vaccination_hashes(
             detail="Unauthorized access: address mismatch",
         )
 
-    records = get_hashes(address)
-    return [record.model_dump(by_alias=True) for record in records]
+    async def load_hashes():
+        records = await get_hashes(address)
+        return [record.model_dump(by_alias=True) for record in records]
+
+    return await read_through(
+        "hashes", cache_key("hashes", address), load_hashes, settings.cache_ttl_hashes
+    )
 
 
 @router.get("/verify/{address}")
@@ -88,7 +174,25 @@ async def verify_vaccination_hash(
     Verify a vaccination record hash on the blockchain.
     """
     try:
-        data_hash = verify_transaction(address, tx_hash)
-        EthHash(data_hash=data_hash, tx_hash=tx_hash).model_dump(by_alias=True)
+        data_hash = await verify_transaction(tx_hash, address)
+        return EthHash(data_hash=data_hash, tx_hash=tx_hash).model_dump(by_alias=True)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/verify")
+async def verify_vaccination_hashes(
+    transactions: list[EthTransaction] = Body(..., max_length=settings.verify_max_items),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> StreamingResponse:
+    """
+    Verify many vaccination record hashes on the blockchain.
+
+    Results are streamed as newline-delimited JSON, one line per record, in completion order.
+    """
+
+    async def stream_verifications():
+        async for verification in verify_transactions(transactions):
+            yield verification.model_dump_json(by_alias=True) + "\n"
+
+    return StreamingResponse(stream_verifications(), media_type="application/x-ndjson")
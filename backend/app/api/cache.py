@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from app.api.dependencies import secure_endpoint
+from app.cache import get_cache_metrics
+from app.schemas import AuthDetails
+
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@router.get("/metrics")
+async def read_cache_metrics(payload: AuthDetails = Depends(secure_endpoint)) -> dict:
+    """
+    Retrieve the hit and miss counters of every cached route since the server started.
+    """
+    return get_cache_metrics()
@@ -0,0 +1,88 @@
+import asyncio
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Path, Query
+from app.api.dependencies import secure_endpoint
+from app.analytics import coverage, age_at_dose, dose_completion, get_dataset
+from app.cache import cache_key, read_through
+from app.core.settings import settings
+from app.schemas import AuthDetails
+
+
+router = APIRouter(prefix="/coverage", tags=["Coverage Analytics"])
+
+Kind = Literal["up_to_date", "age_specific"]
+Dose = Literal["newborn", "newborn_possible", "hbv1", "hbv2", "hbv3"]
+Group = Literal["province", "region"]
+Region = Literal["RRD", "NMM", "NCC", "CHL", "SE", "MKD"]
+
+
+@router.get("/age-at-dose")
+async def read_age_at_dose(
+    months: list[int] = Query(..., ge=-2, le=11),
+    by: Group = Query("province"),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[dict]:
+    """
+    Count the HepB doses given at the selected months of age, per birth cohort.
+
+    Months follow the notebooks: -2 is the first day, -1 the first week, 0 the first
+    month, then 1 to 11.
+    """
+    months = sorted(set(months))
+
+    async def load():
+        prepared, _, births = await get_dataset()
+        return await asyncio.to_thread(age_at_dose, prepared, months, by, births)
+
+    return await read_through(
+        "coverage",
+        cache_key("coverage", "age_at_dose", by, *months),
+        load,
+        settings.cache_ttl_coverage,
+    )
+
+
+@router.get("/completion")
+async def read_dose_completion(
+    by: Group = Query("province"),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[dict]:
+    """Count the children per number of up-to-date HBV1-HBV3 doses, per birth cohort."""
+
+    async def load():
+        _, status, _ = await get_dataset()
+        return await asyncio.to_thread(dose_completion, status, by)
+
+    return await read_through(
+        "coverage",
+        cache_key("coverage", "completion", by),
+        load,
+        settings.cache_ttl_coverage,
+    )
+
+
+@router.get("/{kind}/{dose}")
+async def read_coverage(
+    kind: Kind = Path(..., title="Coverage Kind"),
+    dose: Dose = Path(..., title="HepB Dose"),
+    by: Group = Query("province"),
+    region: Optional[Region] = Query(None),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[dict]:
+    """
+    Retrieve the coverage curve of a dose by birth cohort, per province or region.
+
+    Each row holds the number of covered children and, when birth numbers are
+    configured, the coverage in percent of births.
+    """
+
+    async def load():
+        _, status, births = await get_dataset()
+        return await asyncio.to_thread(coverage, status, kind, dose, by, births, region)
+
+    return await read_through(
+        "coverage",
+        cache_key("coverage", kind, dose, by, region or "all"),
+        load,
+        settings.cache_ttl_coverage,
+    )
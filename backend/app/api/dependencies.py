@@ -1,5 +1,6 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import JWTError
 from app.core.settings import settings
 from app.auth.jwt import verify_jwt_token
 from app.schemas import AuthDetails
@@ -13,29 +14,29 @@ async def secure_endpoint(
 ) -> AuthDetails:
     """
     Validate the access token and return its payload if valid.
+
+    Tokens are verified once and then answered from the cache of `verify_jwt_token`,
+    so failures are not logged here: a client retrying a bad token would flood the log.
     """
     try:
         payload = verify_jwt_token(credentials.credentials)
-        if not payload.sub.startswith("0x"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid address",
-            )
-        if not payload.contract.startswith("0x"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid contract address",
-            )
-        if payload.contract != settings.contract_address:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect contract address",
-            )
-        return payload
-    except Exception as e:
-        print("Failed to validate token:", e)
+    except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if not payload.sub.startswith("0x"):
+        detail = "Invalid address"
+    elif not payload.contract.startswith("0x"):
+        detail = "Invalid contract address"
+    elif payload.contract != settings.contract_address:
+        detail = "Incorrect contract address"
+    else:
+        return payload
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
@@ -1,10 +1,24 @@
+from typing import Literal, Optional
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from app.api.dependencies import secure_endpoint
-from app.core.graph import AsyncDriver, get_driver, map_node, extract_graph_data
-from app.schemas import AuthDetails, GraphData, GraphLink
+from app.core.graph import (
+    AsyncDriver,
+    get_driver,
+    get_pool_stats,
+    fetch_data,
+    map_node,
+    extract_graph_data,
+    graph_response,
+    GraphBuilder,
+)
+from app.core.settings import settings
+from app.core import queries
+from app.core.search import search_statement
+from app.schemas import AuthDetails, GraphData, GraphPage
 from . import patient
 from . import provider
 from . import vaccination
+from .records import read_records_page
 
 
 router = APIRouter(prefix="/graph", tags=["Neo4j Graph Database"])
@@ -23,75 +37,83 @@ async def read_graph_db_address(
     return {"address": server_info.address}
 
 
-@router.get("/all")
-async def read_graph_db_all(
-    limit: int = Query(10, ge=1, le=1000),
-    driver: AsyncDriver = Depends(get_driver),
+@router.get("/pool")
+async def read_graph_db_pool(
     payload: AuthDetails = Depends(secure_endpoint),
-) -> GraphData:
-    """Fetch all nodes and relationships from the graph database."""
-
-    cypher_query = f"""
-        MATCH r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
-        RETURN r LIMIT {limit}
-    """
-
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
-        return extract_graph_data(data)
+):
+    """Retrieve connection pool statistics of the shared Neo4j driver."""
+    return get_pool_stats()
 
 
-@router.get("/hop")
-async def read_node_hop(
-    id: str = Query(...),
-    type: str = Query(...),
-    address: str = Query(...),
+@router.get("/all")
+async def read_graph_db_all(
+    limit: int = Query(10, ge=1, le=settings.graph_page_max_size),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
     driver: AsyncDriver = Depends(get_driver),
     payload: AuthDetails = Depends(secure_endpoint),
-) -> GraphData:
-    """Fetch nodes and relationships from the graph database related to a node."""
+) -> GraphPage:
+    """
+    Fetch all nodes and relationships from the graph database, one page at a time.
 
+    Pass the returned `next_cursor` to read the following page. With `stream`, the page
+    is returned as NDJSON lines of nodes and links. An empty database is an empty page.
+    """
+    return await read_records_page(
+        driver,
+        queries.READ_ALL_RECORDS_PAGE,
+        queries.READ_ALL_RECORDS_PAGE_AFTER,
+        limit,
+        cursor,
+        stream,
+        None,
+    )
+
+
+# Single-hop and k-hop queries, per way of identifying the start node
+HOP_QUERIES = {
+    "Patient": (queries.HOP_PATIENT, queries.EXPAND_PATIENT),
+    "Vaccination": (queries.HOP_VACCINATION, queries.EXPAND_VACCINATION),
+    "HealthcareProvider": (queries.HOP_HEALTHCARE_PROVIDER, queries.EXPAND_HEALTHCARE_PROVIDER),
+    "wallet": (queries.HOP_WALLET, queries.EXPAND_WALLET),
+}
+
+
+def start_node(id: str, type: str, address: Optional[str]) -> tuple[str, dict]:
+    """Return the HOP_QUERIES key and the query parameters identifying a node."""
     if type == "Patient":
-        condition = ":Patient {pid: '%s'}" % id
+        return type, {"pid": id}
     elif type == "Vaccination":
         pid, name, date = id.split("_")
-        condition = ":Vaccination {pid: '%s', name: '%s', date: '%s'}" % (
-            pid,
-            name,
-            date,
-        )
+        return type, {"pid": pid, "name": name, "date": date}
     elif type == "HealthcareProvider":
-        type, name = id.split("_")
-        condition = ":HealthcareProvider {type: '%s', name: '%s'}" % (type, name)
+        provider_type, name = id.split("_")
+        return type, {"type": provider_type, "name": name}
     elif address is not None:
-        condition = f" {{wallet: '{address}'}}"
+        return "wallet", {"address": address}
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid node type or no address provided",
         )
 
-    cypher_query = f"""
-        MATCH (n{condition})
-        OPTIONAL MATCH (n)-[r_out]->(n_target)
-        OPTIONAL MATCH (n)<-[r_in]-(n_source)
-        RETURN
-            n AS node,
-            collect(DISTINCT r_out) as out,
-            collect(DISTINCT r_in) as in,
-            collect(DISTINCT n_target) as target,
-            collect(DISTINCT n_source) as source
-    """
+
+@router.get("/hop")
+async def read_node_hop(
+    id: str = Query(...),
+    type: str = Query(...),
+    address: str = Query(...),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> GraphData:
+    """Fetch nodes and relationships from the graph database related to a node."""
+    start, parameters = start_node(id, type, address)
+    cypher_query = HOP_QUERIES[start][0]
 
     async with driver.session() as session:
-        result = await session.run(cypher_query)
+        result = await session.run(cypher_query, parameters)
         data = await result.data()
-        graph = GraphData(
-            nodes=[],
-            links=[],
-            root=None,
-        )
+        graph = GraphBuilder()
 
         for record in data:
             node = record.get("node")
@@ -99,54 +121,75 @@ async def read_node_hop(
             in_ = record.get("in")
 
             node = map_node(node)
-            graph.nodes.append(node)
-            graph.root = node
+            graph.set_root(node)
 
             for link in out:
-                target = map_node(link[2])
-                graph.nodes.append(target)
-                graph.links.append(
-                    GraphLink(source=node.id, target=target.id, type=link[1])
-                )
+                target = graph.add_node(map_node(link[2]))
+                graph.add_link(node["id"], target, link[1])
             for link in in_:
-                source = map_node(link[0])
-                graph.nodes.append(source)
-                graph.links.append(
-                    GraphLink(source=source.id, target=node.id, type=link[1])
-                )
+                source = graph.add_node(map_node(link[0]))
+                graph.add_link(source, node["id"], link[1])
+
+        return graph_response(graph.build())
+
 
-        return graph
+@router.get("/expand")
+async def read_node_expansion(
+    id: str = Query(...),
+    type: str = Query(...),
+    address: Optional[str] = Query(None),
+    depth: int = Query(2, ge=1, le=queries.EXPAND_MAX_DEPTH),
+    fan_out: int = Query(20, ge=1, le=settings.expand_max_fan_out),
+    types: Optional[list[Literal["RECEIVED", "ADMINISTERED_BY"]]] = Query(None),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> GraphData:
+    """
+    Fetch the neighbourhood of a node up to `depth` hops away in a single query.
+
+    The node is identified as for `/hop`. Each node follows at most `fan_out` of its
+    relationships, optionally restricted to the relationship `types`.
+    """
+    start, parameters = start_node(id, type, address)
+    data = await fetch_data(
+        driver,
+        HOP_QUERIES[start][1],
+        depth=depth,
+        fan_out_limit=fan_out,
+        node_limit=settings.expand_max_nodes,
+        types=types,
+        **parameters,
+    )
+
+    graph = GraphBuilder()
+    for record in data or []:
+        graph.set_root(map_node(record.get("node")))
+        for node in record.get("nodes"):
+            graph.add_node(map_node(node))
+        for link in record.get("links"):
+            source = map_node(link[0])["id"]
+            target = map_node(link[2])["id"]
+            graph.add_link(source, target, link[1])
+    return graph_response(graph.build())
 
 
 @router.get("/search")
 async def search_graph_db(
-    query: str = Query(...),
+    query: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=settings.search_max_results),
     driver: AsyncDriver = Depends(get_driver),
     payload: AuthDetails = Depends(secure_endpoint),
 ) -> GraphData:
-    """Search the graph database for nodes matching the given query."""
-
-    cypher_query = f"""
-        CALL () {{
-            MATCH r1=(n:Patient {{wallet: '{query}'}})-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
-            RETURN r1 AS r, n
-        }}
-        RETURN r, n
-        UNION
-        CALL () {{
-            MATCH r2=(:Patient)-[:RECEIVED]->(n:Vaccination {{tx_hash: '{query}'}})-[:ADMINISTERED_BY]->(:HealthcareProvider)
-            RETURN r2 AS r, n
-        }}
-        RETURN r, n
-        UNION
-        CALL () {{
-            MATCH r3=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(n:HealthcareProvider {{wallet: '{query}'}})
-            RETURN r3 AS r, n
-        }}
-        RETURN r, n
     """
+    Search the graph database for nodes matching the given query.
 
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
-        return extract_graph_data(data)
+    Patient PIDs, wallets, transaction hashes, vaccine and provider names are matched by
+    word prefix. Nodes are returned by decreasing relevance, with the best hit as root.
+    """
+    statement = search_statement(query, limit)
+    if statement is None:
+        return graph_response(extract_graph_data([]))
+
+    cypher_query, parameters = statement
+    data = await fetch_data(driver, cypher_query, **parameters)
+    return graph_response(extract_graph_data(data or []))
@@ -0,0 +1,31 @@
+from fastapi import HTTPException, status
+from app.blockchain import is_authorized_healthcare_provider
+from app.schemas import AuthDetails, BatchItemResult, BatchResult
+
+
+async def authorize_batch(payload: AuthDetails):
+    """Check once for the whole batch that the caller is an authorized healthcare provider."""
+    if not await is_authorized_healthcare_provider(payload.sub):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unauthorized access: healthcare provider only",
+        )
+
+
+def batch_result(count: int, records: list[dict], not_found: str) -> BatchResult:
+    """
+    Report the status of every item of a batch from the records of its write query.
+
+    Each record carries the `index` of its item and whether it was `created`. Items
+    without a record matched nothing to write to and are reported as `not_found`.
+    """
+    written = {record["index"]: record["created"] for record in records}
+    result = BatchResult(items=[])
+    for index in range(count):
+        if index not in written:
+            item = BatchItemResult(index=index, status="not_found", detail=not_found)
+        else:
+            item = BatchItemResult(index=index, status="created" if written[index] else "updated")
+        setattr(result, item.status, getattr(result, item.status) + 1)
+        result.items.append(item)
+    return result
@@ -1,13 +1,47 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Body, Path
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Body, Path, Query
 from app.api.dependencies import secure_endpoint
-from app.core.graph import AsyncDriver, get_driver, extract_graph_data
+from app.core.graph import (
+    AsyncDriver,
+    get_driver,
+    fetch_data,
+    write_batches,
+    extract_graph_data,
+    graph_response,
+    graph_stream_response,
+    stream_graph,
+)
+from app.core.settings import settings
+from app.core import queries
+from app.cache import cache_key, read_through, invalidate
+from .records import is_paginated, read_records_page
+from .batch import authorize_batch, batch_result
 from app.blockchain import is_authorized_healthcare_provider
-from app.schemas import AuthDetails, GraphData, GraphPatient
+from app.schemas import AuthDetails, BatchResult, GraphPage, GraphPatient
 
 
 router = APIRouter(prefix="/patient")
 
 
+async def invalidate_patients(records: list[dict]):
+    """
+    Invalidate the cached entries of written patients: under their new and previous
+    wallets, and the record pages of the providers that vaccinated them.
+    """
+    wallets = {record["wallet"] for record in records} | {
+        record["previous_wallet"] for record in records
+    }
+    provider_wallets = {wallet for record in records for wallet in record["provider_wallets"]}
+    wallets.discard(None)
+    provider_wallets.discard(None)
+
+    await invalidate(
+        *(cache_key("patient", wallet) for wallet in wallets),
+        *(cache_key("patient_records", wallet) for wallet in wallets),
+        *(cache_key("provider_records", wallet) for wallet in provider_wallets),
+    )
+
+
 @router.get("/{address}")
 async def read_patient(
     address: str = Path(..., title="Patient's Wallet Address"),
@@ -21,51 +55,72 @@ async def read_patient(
             detail="Unauthorized access: address mismatch",
         )
 
-    cypher_query = f"""
-        MATCH (p:Patient {{wallet: '{address}'}})
-        RETURN p
-    """
-
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
+    data = await read_through(
+        "patient",
+        cache_key("patient", address),
+        lambda: fetch_data(driver, queries.READ_PATIENT, address=address),
+        settings.cache_ttl_patient,
+    )
 
-        if len(data) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Patient not found in the graph database",
-            )
-        return GraphPatient.model_validate(data[0].get("p"))
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient not found in the graph database",
+        )
+    return GraphPatient.model_validate(data[0].get("p"))
 
 
 @router.get("/{address}/records")
 async def read_patient_vaccinations(
     address: str = Path(..., title="Patient's Wallet Address"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.graph_page_max_size),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
     driver: AsyncDriver = Depends(get_driver),
     payload: AuthDetails = Depends(secure_endpoint),
-) -> GraphData:
-    """Fetch a patient's vaccination records from the graph database."""
+) -> GraphPage:
+    """
+    Fetch a patient's vaccination records from the graph database.
+
+    With `limit` or `cursor`, records are paginated by vaccination date and the response
+    includes the `next_cursor` to pass for the following page. With `stream`, the graph
+    is returned as NDJSON lines of nodes and links.
+    """
     if payload.sub != address:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized access: address mismatch",
         )
 
-    cypher_query = f"""
-        MATCH r=(n:Patient {{wallet: '{address}'}})-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
-        RETURN r, n
-    """
+    if is_paginated(limit, cursor):
+        return await read_records_page(
+            driver,
+            queries.READ_PATIENT_RECORDS_PAGE,
+            queries.READ_PATIENT_RECORDS_PAGE_AFTER,
+            limit,
+            cursor,
+            stream,
+            "Patient records not found in the graph database",
+            address=address,
+        )
+    if stream:
+        return graph_stream_response(
+            stream_graph(driver, queries.READ_PATIENT_RECORDS, address=address)
+        )
 
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
+    data = await read_through(
+        "patient_records",
+        cache_key("patient_records", address),
+        lambda: fetch_data(driver, queries.READ_PATIENT_RECORDS, address=address),
+        settings.cache_ttl_records,
+    )
 
-        if len(data) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Patient records not found in the graph database",
-            )
-        return extract_graph_data(data)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient records not found in the graph database",
+        )
+    return graph_response(extract_graph_data(data))
 
 
 @router.post("/create")
@@ -76,19 +131,43 @@ async def create_patient(
 ) -> GraphPatient:
     """Create a new patient node (if not exists) in the graph database."""
     # Check if payload.sub is an authorized healthcare provider
-    if not is_authorized_healthcare_provider(payload.sub):
+    if not await is_authorized_healthcare_provider(payload.sub):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized access: healthcare provider only",
         )
 
-    cypher_query = f"""
-    MERGE (p:Patient {{pid: '{patient.pid}'}})
-    SET p.wallet = '{patient.wallet}', p.sex = '{patient.sex}', p.dob = '{patient.dob}', p.ethnic = '{patient.ethnic}', p.reg_province = '{patient.reg_province}', p.reg_district = '{patient.reg_district}', p.reg_commune = '{patient.reg_commune}'
-    RETURN p
-    """
-
     async with driver.session() as session:
-        result = await session.run(cypher_query)
+        result = await session.run(
+            queries.CREATE_PATIENT, patient=patient.model_dump(mode="json")
+        )
         data = await result.data()
-        return GraphPatient.model_validate(data[0].get("p"))
+
+    await invalidate_patients(data)
+    return GraphPatient.model_validate(data[0].get("p"))
+
+
+@router.post("/batch")
+async def create_patients(
+    patients: list[GraphPatient] = Body(..., min_length=1, max_length=settings.batch_max_items),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> BatchResult:
+    """
+    Create or update many patient nodes in the graph database.
+
+    Patients are written in order, one transaction per `batch_chunk_size` of them, and
+    each item reports whether it was created or updated.
+    """
+    await authorize_batch(payload)
+
+    rows = [
+        {"index": index, **patient.model_dump(mode="json")}
+        for index, patient in enumerate(patients)
+    ]
+    records = await write_batches(
+        driver, queries.CREATE_PATIENTS, rows, settings.batch_chunk_size
+    )
+
+    await invalidate_patients(records)
+    return batch_result(len(patients), records, "Patient was not written")
@@ -1,8 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Body, Path
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Body, Path, Query
 from app.api.dependencies import secure_endpoint
-from app.core.graph import AsyncDriver, get_driver, extract_graph_data
+from app.core.graph import (
+    AsyncDriver,
+    get_driver,
+    fetch_data,
+    extract_graph_data,
+    graph_response,
+    graph_stream_response,
+    stream_graph,
+)
+from app.core.settings import settings
+from app.core import queries
+from app.cache import cache_key, read_through, invalidate
+from .records import is_paginated, read_records_page
 from app.blockchain import get_deployer_address
-from app.schemas import AuthDetails, GraphData, GraphHealthcareProvider
+from app.schemas import AuthDetails, GraphPage, GraphHealthcareProvider
 
 
 router = APIRouter(prefix="/provider")
@@ -21,13 +34,8 @@ async def read_provider(
             detail="Unauthorized access: address mismatch",
         )
 
-    cypher_query = f"""
-        MATCH (h:HealthcareProvider {{wallet: '{address}'}})
-        RETURN h
-    """
-
     async with driver.session() as session:
-        result = await session.run(cypher_query)
+        result = await session.run(queries.READ_HEALTHCARE_PROVIDER, address=address)
         data = await result.data()
 
         if len(data) == 0:
@@ -41,31 +49,56 @@ async def read_provider(
 @router.get("/{address}/records")
 async def read_provider_vaccinations(
     address: str = Path(..., title="Healthcare Provider's Wallet Address"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.graph_page_max_size),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
     driver: AsyncDriver = Depends(get_driver),
     payload: AuthDetails = Depends(secure_endpoint),
-) -> GraphData:
-    """Fetch a healthcare provider's vaccination records from the graph database."""
+) -> GraphPage:
+    """
+    Fetch a healthcare provider's vaccination records from the graph database.
+
+    With `limit` or `cursor`, records are paginated by vaccination date and the response
+    includes the `next_cursor` to pass for the following page. With `stream`, the graph
+    is returned as NDJSON lines of nodes and links.
+    """
     if payload.sub != address:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized access: address mismatch",
         )
 
-    cypher_query = f"""
-        MATCH r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(n:HealthcareProvider {{wallet: '{address}'}})
-        RETURN r, n
-    """
+    if is_paginated(limit, cursor):
+        return await read_records_page(
+            driver,
+            queries.READ_HEALTHCARE_PROVIDER_RECORDS_PAGE,
+            queries.READ_HEALTHCARE_PROVIDER_RECORDS_PAGE_AFTER,
+            limit,
+            cursor,
+            stream,
+            "Healthcare provider not found in the graph database",
+            address=address,
+        )
+    if stream:
+        return graph_stream_response(
+            stream_graph(driver, queries.READ_HEALTHCARE_PROVIDER_RECORDS, address=address)
+        )
 
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
+    data = await read_through(
+        "provider_records",
+        cache_key("provider_records", address),
+        lambda: fetch_data(
+            driver, queries.READ_HEALTHCARE_PROVIDER_RECORDS, address=address
+        ),
+        settings.cache_ttl_records,
+    )
 
-        if len(data) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Healthcare provider not found in the graph database",
-            )
-        return extract_graph_data(data)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Healthcare provider not found in the graph database",
+        )
+    return graph_response(extract_graph_data(data))
 
 
 @router.post("/create")
@@ -76,19 +109,18 @@ async def create_provider(
 ) -> GraphHealthcareProvider:
     """Create a new healthcare provider node (if not exists) in the graph database."""
     # Check if payload.sub is admin
-    if not payload.sub != get_deployer_address():
+    if not payload.sub != await get_deployer_address():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Unauthorized access: admin required",
         )
 
-    cypher_query = f"""
-    MERGE (h:HealthcareProvider {{name: '{healthcare_provider.name}', type: '{healthcare_provider.type}'}})
-    SET h.wallet = '{healthcare_provider.wallet}'
-    RETURN h
-    """
-
     async with driver.session() as session:
-        result = await session.run(cypher_query)
+        result = await session.run(
+            queries.CREATE_HEALTHCARE_PROVIDER,
+            healthcare_provider.model_dump(mode="json"),
+        )
         data = await result.data()
-        return GraphHealthcareProvider.model_validate(data[0].get("h"))
+
+    await invalidate(cache_key("provider_records", healthcare_provider.wallet))
+    return GraphHealthcareProvider.model_validate(data[0].get("h"))
@@ -0,0 +1,56 @@
+from typing import Optional
+from fastapi import HTTPException, Response, status
+from app.core.graph import (
+    AsyncDriver,
+    cursor_parameters,
+    extract_graph_data,
+    fetch_graph_page,
+    stream_graph,
+    graph_response,
+    graph_stream_response,
+)
+from app.core.settings import settings
+
+
+def is_paginated(limit: Optional[int], cursor: Optional[str]) -> bool:
+    return limit is not None or cursor is not None
+
+
+async def read_records_page(
+    driver: AsyncDriver,
+    query: str,
+    after_query: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    stream: bool,
+    not_found: Optional[str],
+    **parameters,
+) -> Response:
+    """
+    Answer a records endpoint with one page of a `*_PAGE` query, or of its `*_PAGE_AFTER`
+    counterpart when reading after a cursor.
+
+    The page is either a `GraphPage` JSON document or, with `stream`, NDJSON lines
+    written while the result is read. An empty first page is answered with 404 and
+    `not_found`, or as an empty page when `not_found` is None.
+    """
+    limit = limit or settings.graph_page_max_size
+    try:
+        position = cursor_parameters(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if cursor is not None:
+        query = after_query
+
+    if stream:
+        return graph_stream_response(
+            stream_graph(driver, query, limit, **position, **parameters)
+        )
+
+    page = await fetch_graph_page(driver, query, limit, cursor, **parameters)
+    if page is None:
+        if not_found is not None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        page = {**extract_graph_data([]), "next_cursor": None}
+    return graph_response(page)
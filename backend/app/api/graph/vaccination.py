@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Body, Path
 from app.api.dependencies import secure_endpoint
-from app.core.graph import AsyncDriver, get_driver
-from app.schemas import AuthDetails, GraphVaccination, GraphHealthcareProvider
+from app.core.graph import AsyncDriver, get_driver, fetch_data, write_batches
+from app.core.settings import settings
+from app.core import queries
+from app.cache import cache_key, read_through, invalidate
+from app.schemas import AuthDetails, BatchResult, BatchVaccination, GraphVaccination, GraphHealthcareProvider
+from .batch import authorize_batch, batch_result
 
 
 router = APIRouter(prefix="/vaccination")
@@ -14,21 +18,19 @@ async def read_vaccinations(
     payload: AuthDetails = Depends(secure_endpoint),
 ) -> GraphVaccination:
     """Fetch a single vaccination record from the graph database."""
-    cypher_query = f"""
-        MATCH (v:Vaccination {{tx_hash: '{tx_hash}'}})
-        RETURN v
-    """
-
-    async with driver.session() as session:
-        result = await session.run(cypher_query)
-        data = await result.data()
+    data = await read_through(
+        "vaccination",
+        cache_key("vaccination", tx_hash),
+        lambda: fetch_data(driver, queries.READ_VACCINATION, tx_hash=tx_hash),
+        settings.cache_ttl_vaccination,
+    )
 
-        if len(data) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Vaccination not found in the graph database",
-            )
-        return GraphVaccination.model_validate(data[0].get("v"))
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vaccination not found in the graph database",
+        )
+    return GraphVaccination.model_validate(data[0].get("v"))
 
 
 @router.post("/create")
@@ -41,17 +43,62 @@ async def create_vaccination(
     """Create a new vaccination node (if not exists) in the graph database."""
     # Check if payload.sub is an authorized healthcare provider
 
-    cypher_query = f"""
-    MATCH (p:Patient {{pid: '{vaccination.pid}'}})
-    MATCH (h:HealthcareProvider {{name: '{healthcare_provider.name}', type: '{healthcare_provider.type}'}})
-    MERGE (v:Vaccination {{pid: '{vaccination.pid}', name: '{vaccination.name}', date: '{vaccination.date}', type: '{vaccination.type}'}})
-    SET v.data_hash = '{vaccination.data_hash}', v.tx_hash = '{vaccination.tx_hash}'
-    MERGE (p)-[:RECEIVED]->(v)
-    MERGE (v)-[:ADMINISTERED_BY]->(h)
-    RETURN v
-    """
-
     async with driver.session() as session:
-        result = await session.run(cypher_query)
+        result = await session.run(
+            queries.CREATE_VACCINATION,
+            vaccination={
+                **vaccination.model_dump(mode="json"),
+                "provider_name": healthcare_provider.name,
+                "provider_type": healthcare_provider.type,
+            },
+        )
         data = await result.data()
-        return GraphVaccination.model_validate(data[0].get("v"))
+
+    record = data[0]
+    await invalidate(
+        cache_key("vaccination", vaccination.tx_hash),
+        cache_key("patient_records", record.get("patient_wallet")),
+        cache_key("provider_records", record.get("provider_wallet")),
+    )
+    return GraphVaccination.model_validate(record.get("v"))
+
+
+@router.post("/batch")
+async def create_vaccinations(
+    items: list[BatchVaccination] = Body(..., min_length=1, max_length=settings.batch_max_items),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> BatchResult:
+    """
+    Create or update many vaccination nodes in the graph database.
+
+    Vaccinations are written in order, one transaction per `batch_chunk_size` of them.
+    Each item reports whether it was created or updated, or `not_found` when its patient
+    or healthcare provider does not exist.
+    """
+    await authorize_batch(payload)
+
+    rows = [
+        {
+            "index": index,
+            **item.vaccination.model_dump(mode="json"),
+            "provider_name": item.healthcare_provider.name,
+            "provider_type": item.healthcare_provider.type,
+        }
+        for index, item in enumerate(items)
+    ]
+    records = await write_batches(
+        driver, queries.CREATE_VACCINATIONS, rows, settings.batch_chunk_size
+    )
+
+    tx_hashes = {item.vaccination.tx_hash for item in items if item.vaccination.tx_hash}
+    patient_wallets = {record["patient_wallet"] for record in records if record["patient_wallet"]}
+    provider_wallets = {record["provider_wallet"] for record in records if record["provider_wallet"]}
+    await invalidate(
+        *(cache_key("vaccination", tx_hash) for tx_hash in tx_hashes),
+        *(cache_key("patient_records", wallet) for wallet in patient_wallets),
+        *(cache_key("provider_records", wallet) for wallet in provider_wallets),
+    )
+    return batch_result(
+        len(items), records, "Patient or healthcare provider not found"
+    )
@@ -0,0 +1,101 @@
+import asyncio
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.api.dependencies import secure_endpoint
+from app.analytics import get_store, filter_expression, count_records, read_records
+from app.cache import cache_key, read_through
+from app.core.settings import settings
+from app.schemas import AuthDetails
+
+
+router = APIRouter(prefix="/research", tags=["Research Queries"])
+
+Dimension = Literal[
+    "province_reg", "year", "district_reg", "vacname", "vactype", "vacplace_type", "sex", "ethnic"
+]
+Column = Literal[
+    "pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type",
+    "province_reg", "district_reg", "commune_reg", "sex", "dob", "ethnic", "year",
+]
+
+
+class RecordFilters:
+    """Query parameters shared by the research endpoints, one list of values per dimension."""
+
+    def __init__(
+        self,
+        province_reg: Optional[list[str]] = Query(None),
+        district_reg: Optional[list[str]] = Query(None),
+        vacname: Optional[list[str]] = Query(None),
+        vactype: Optional[list[str]] = Query(None),
+        vacplace_type: Optional[list[str]] = Query(None),
+        sex: Optional[list[str]] = Query(None),
+        ethnic: Optional[list[str]] = Query(None),
+        year_from: Optional[int] = Query(None, ge=2000, le=2100),
+        year_to: Optional[int] = Query(None, ge=2000, le=2100),
+    ):
+        self.values = {
+            "province_reg": sorted(set(province_reg or [])),
+            "district_reg": sorted(set(district_reg or [])),
+            "vacname": sorted(set(vacname or [])),
+            "vactype": sorted(set(vactype or [])),
+            "vacplace_type": sorted(set(vacplace_type or [])),
+            "sex": sorted(set(sex or [])),
+            "ethnic": sorted(set(ethnic or [])),
+        }
+        self.year_from = year_from
+        self.year_to = year_to
+
+    def expression(self):
+        return filter_expression(self.values, self.year_from, self.year_to)
+
+    def key(self) -> list[str]:
+        return [
+            *(f"{column}={','.join(values)}" for column, values in self.values.items() if values),
+            f"year={self.year_from or ''}-{self.year_to or ''}",
+        ]
+
+
+@router.get("/count")
+async def count(
+    group_by: list[Dimension] = Query([]),
+    filters: RecordFilters = Depends(),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[dict]:
+    """
+    Count the vaccination records matching the filters, per group.
+
+    Filters on province and year only read the matching partitions of the store, and
+    only the grouped columns are read.
+    """
+    group_by = list(dict.fromkeys(group_by))
+
+    async def load():
+        return await asyncio.to_thread(count_records, get_store(), group_by, filters.expression())
+
+    try:
+        return await read_through(
+            "research",
+            cache_key("research", "count", ",".join(group_by), *filters.key()),
+            load,
+            settings.cache_ttl_coverage,
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Research store not available")
+
+
+@router.get("/records")
+async def records(
+    columns: list[Column] = Query(["pid", "vacname", "vacdate", "province_reg"]),
+    limit: int = Query(100, ge=1, le=1000),
+    filters: RecordFilters = Depends(),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[dict]:
+    """Retrieve matching vaccination records, reading only the requested columns."""
+    columns = list(dict.fromkeys(columns))
+    try:
+        return await asyncio.to_thread(
+            read_records, get_store(), columns, filters.expression(), limit
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Research store not available")
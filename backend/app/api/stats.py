@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Path, Query
+from app.api.dependencies import secure_endpoint
+from app.core.graph import AsyncDriver, get_driver, fetch_data
+from app.core import queries
+from app.schemas import AuthDetails, AggregateScope, AggregateStats
+
+
+router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+
+@router.get("/")
+async def read_total_stats(
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> AggregateStats:
+    """Retrieve the total number of patients and vaccinations."""
+    return await read_stats("total", "all", driver, payload)
+
+
+@router.get("/{scope}")
+async def read_scope_stats(
+    scope: AggregateScope = Path(..., title="Aggregate Scope"),
+    limit: int = Query(100, ge=1, le=1000),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> list[AggregateStats]:
+    """Retrieve the statistics of every provider, province or vaccine, most vaccinations first."""
+    data = await fetch_data(driver, queries.READ_AGGREGATES, scope=scope, limit=limit)
+    return [AggregateStats.model_validate(record.get("a")) for record in data or []]
+
+
+@router.get("/{scope}/{key}")
+async def read_stats(
+    scope: AggregateScope = Path(..., title="Aggregate Scope"),
+    key: str = Path(..., title="Provider ID, Province or Vaccine Name"),
+    driver: AsyncDriver = Depends(get_driver),
+    payload: AuthDetails = Depends(secure_endpoint),
+) -> AggregateStats:
+    """
+    Retrieve the patient and vaccination counts of one provider, province or vaccine.
+
+    Providers are identified by their graph node ID (`type_name`).
+    """
+    data = await fetch_data(driver, queries.READ_AGGREGATE, scope=scope, key=key)
+
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No statistics found for this key",
+        )
+    return AggregateStats.model_validate(data[0].get("a"))
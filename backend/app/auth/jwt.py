@@ -1,3 +1,6 @@
+import hashlib
+import time
+from collections import OrderedDict
 from jose import jwt, JWTError, ExpiredSignatureError
 from datetime import datetime, timezone
 from app.core.settings import settings
@@ -5,6 +8,11 @@ from app.schemas import AuthDetails
 from app.utils import parse_timedelta
 
 
+# Token digest -> (payload, or the error type and message of a rejected token, expiry as a
+# Unix time), least recently used first. A valid token is trusted until its own `exp`.
+_verified: OrderedDict[bytes, tuple[AuthDetails | tuple[type[JWTError], str], float]] = OrderedDict()
+
+
 def create_jwt_token(address: str) -> str:
     """Generates a JWT token for authenticated users."""
     expires_delta = parse_timedelta(settings.jwt_access_expires_in)
@@ -19,12 +27,58 @@ def create_jwt_token(address: str) -> str:
     )
 
 
-def verify_jwt_token(token: str) -> AuthDetails:
-    """Verifies a JWT token and returns the address of the user."""
+def _decode(token: str) -> dict:
+    """Decode and check a token with the configured `jwt_backend`, raising jose's errors."""
+    if settings.jwt_backend != "pyjwt":
+        return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+
+    # Optional dependency (pip install PyJWT), imported only when selected
+    import jwt as pyjwt
+
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return AuthDetails.model_validate(payload)
-    except ExpiredSignatureError:
-        raise ExpiredSignatureError("Token has expired")
-    except JWTError:
-        raise JWTError("Invalid token")
+        return pyjwt.decode(
+            token,
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm],
+            options={"require": ["exp"]},
+        )
+    except pyjwt.ExpiredSignatureError as e:
+        raise ExpiredSignatureError(str(e))
+    except pyjwt.InvalidTokenError as e:
+        raise JWTError(str(e))
+
+
+def _remember(key: bytes, result: AuthDetails | tuple[type[JWTError], str], expires: float):
+    _verified[key] = (result, expires)
+    if len(_verified) > settings.jwt_cache_size:
+        _verified.popitem(last=False)
+
+
+def verify_jwt_token(token: str) -> AuthDetails:
+    """
+    Verifies a JWT token and returns the address of the user.
+
+    Results are cached by the token's digest: a valid token until its `exp`, a rejected
+    one for `jwt_negative_cache_ttl` seconds.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    cached = _verified.get(key)
+    if cached is not None and cached[1] > now:
+        _verified.move_to_end(key)
+        result = cached[0]
+    else:
+        try:
+            result = AuthDetails.model_validate(_decode(token))
+            _remember(key, result, result.exp)
+        except ExpiredSignatureError:
+            result = (ExpiredSignatureError, "Token has expired")
+            _remember(key, result, now + settings.jwt_negative_cache_ttl)
+        except Exception:
+            result = (JWTError, "Invalid token")
+            _remember(key, result, now + settings.jwt_negative_cache_ttl)
+
+    if isinstance(result, AuthDetails):
+        return result
+    error, message = result
+    raise error(message)
@@ -1,3 +1,5 @@
 from .hash import generate_hash
-from .signature import sign_message, verify_signature
-from .contract import *
\ No newline at end of file
+from .signature import sign_message, verify_signature, verify_signatures
+from .contract import *
+from .transactions import get_transaction_status
+from .anchor import anchor_hash, get_anchored_records, verify_anchored_record
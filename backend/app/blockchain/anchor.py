@@ -0,0 +1,271 @@
+import asyncio
+import json
+import sqlite3
+import time
+from typing import Optional
+from app.core.blockchain import web3, contract
+from app.core.settings import settings
+from app.blockchain.merkle import leaf_hash, merkle_tree, merkle_proof
+from app.blockchain.signature import verify_signature
+from app.blockchain.transactions import submit_transaction, get_transaction_status
+from app.schemas import EthAnchor, EthMessage, VaccinationAddress
+
+
+# Merkle proofs of the records anchored in batches, opened by `setup_anchor_store`.
+# Unlike the event index this is the only copy of the proofs: the chain holds the roots.
+connection: Optional[sqlite3.Connection] = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS anchored_records (
+    patient TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    root TEXT NOT NULL,
+    proof TEXT NOT NULL,
+    tx_hash TEXT,
+    provider TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    PRIMARY KEY (patient, data_hash, root)
+);
+CREATE INDEX IF NOT EXISTS anchored_records_root
+    ON anchored_records (root);
+"""
+
+# Signed records waiting for their batch, per provider: (patient, data_hash, result)
+_queues: dict[str, list[tuple[str, str, asyncio.Future]]] = {}
+# Set when a provider's queue holds a full batch, so it is flushed without waiting
+_full = asyncio.Event()
+# Batches sent by this process and not yet mined: root -> tx_hash
+_sent: dict[str, str] = {}
+
+
+def setup_anchor_store():
+    """Open (or create) the local proof store."""
+    global connection
+    connection = sqlite3.connect(settings.anchor_db_path, check_same_thread=False)
+    connection.executescript(SCHEMA)
+    print("✅ Anchored record store opened")
+
+
+def close_anchor_store():
+    global connection
+    if connection is not None:
+        connection.close()
+        connection = None
+
+
+def queue_hash(provider: str, patient: str, data_hash: str) -> asyncio.Future:
+    """Queue a record for the provider's next batch. The future resolves to its `EthAnchor`."""
+    result = asyncio.get_running_loop().create_future()
+    queue = _queues.setdefault(provider, [])
+    queue.append((patient, data_hash, result))
+    if len(queue) >= settings.anchor_batch_size:
+        _full.set()
+    return result
+
+
+async def anchor_hash(
+    address: VaccinationAddress, data_hash: str, message: EthMessage, signature: str
+) -> EthAnchor:
+    """
+    Queue a vaccination hash to be anchored on the blockchain with the provider's next batch.
+
+    Returns once the batch transaction is sent, with the record's Merkle proof.
+    """
+    if not verify_signature(message, signature, address.healthcare_provider):
+        raise ValueError("Invalid signature")
+
+    return await queue_hash(address.healthcare_provider, address.patient, data_hash)
+
+
+async def _send_batch(provider: str, batch: list[tuple[str, str, asyncio.Future]]):
+    """Anchor the Merkle root of one batch, then resolve each record with its proof."""
+    levels = merkle_tree([leaf_hash(patient, data_hash) for patient, data_hash, _ in batch])
+    root = web3.to_hex(levels[-1][0])
+    proofs = [[web3.to_hex(h) for h in merkle_proof(levels, i)] for i in range(len(batch))]
+
+    # A retried batch, or a retried single record, has the same root: once it is anchored
+    # the stored transaction and proofs are returned instead of sending the root again,
+    # which the contract would reject
+    anchored = connection.execute(
+        """
+        SELECT patient, data_hash, tx_hash, proof FROM anchored_records
+        WHERE root = ? AND tx_hash IS NOT NULL
+        """,
+        (root,),
+    ).fetchall()
+    if anchored:
+        stored = {
+            (patient, data_hash): (tx_hash, json.loads(proof))
+            for patient, data_hash, tx_hash, proof in anchored
+        }
+        for patient, data_hash, result in batch:
+            tx_hash, proof = stored[(patient.lower(), data_hash)]
+            if not result.done():
+                result.set_result(
+                    EthAnchor(data_hash=data_hash, tx_hash=tx_hash, root=root, proof=proof)
+                )
+        return
+
+    # The proofs are stored before the root is sent, so an anchored record never lacks one.
+    # Rows left by a batch with the same root that is still in flight are kept, and only
+    # the rows inserted here are removed if the transaction fails.
+    inserted = []
+    with connection:
+        for (patient, data_hash, _), proof in zip(batch, proofs):
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO anchored_records VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                (patient.lower(), data_hash, root, json.dumps(proof), provider.lower(), int(time.time())),
+            )
+            if cursor.rowcount:
+                inserted.append((patient.lower(), data_hash, root))
+
+    try:
+        tx_hash = await submit_transaction(contract.functions.storeRoot(root, len(batch)), provider)
+    except Exception as e:
+        with connection:
+            connection.executemany(
+                """
+                DELETE FROM anchored_records
+                WHERE patient = ? AND data_hash = ? AND root = ? AND tx_hash IS NULL
+                """,
+                inserted,
+            )
+        for _, _, result in batch:
+            if not result.done():
+                result.set_exception(e)
+        return
+
+    with connection:
+        connection.execute(
+            "UPDATE anchored_records SET tx_hash = ? WHERE root = ?", (tx_hash, root)
+        )
+    _sent[root] = tx_hash
+    for (_, data_hash, result), proof in zip(batch, proofs):
+        if not result.done():
+            result.set_result(
+                EthAnchor(data_hash=data_hash, tx_hash=tx_hash, root=root, proof=proof)
+            )
+
+
+async def flush_anchor_queue():
+    """Send every queued record, in batches of `anchor_batch_size` per provider."""
+
+    async def flush(provider: str, queue: list):
+        for start in range(0, len(queue), settings.anchor_batch_size):
+            await _send_batch(provider, queue[start : start + settings.anchor_batch_size])
+
+    queues = list(_queues.items())
+    _queues.clear()
+    await asyncio.gather(*(flush(provider, queue) for provider, queue in queues))
+
+
+async def run_anchor_queue():
+    """
+    Flush the queued records whenever a provider has a full batch, and at least every
+    `anchor_max_delay` seconds otherwise, then re-queue the records of failed batches.
+    Runs until cancelled, after finishing the flush in progress.
+    """
+    while True:
+        try:
+            await asyncio.wait_for(_full.wait(), settings.anchor_max_delay)
+        except asyncio.TimeoutError:
+            pass
+        _full.clear()
+
+        # A flush in progress is not cancelled with the loop, which waits for it instead:
+        # a batch cancelled mid-send would keep its proofs without a transaction hash
+        # and never resolve its records
+        flush = asyncio.ensure_future(flush_anchor_queue())
+        try:
+            await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            await asyncio.gather(flush, return_exceptions=True)
+            raise
+        except Exception as e:
+            print("Failed to anchor vaccination records:", e)
+
+        try:
+            await settle_anchored_batches()
+        except Exception as e:
+            print("Failed to check anchored batches:", e)
+
+
+def _report_requeued(result: asyncio.Future):
+    # Nobody awaits a re-queued record, so its failure is reported here
+    if not result.cancelled() and result.exception() is not None:
+        print("Failed to re-anchor vaccination record:", result.exception())
+
+
+async def settle_anchored_batches():
+    """
+    Follow up on the batches sent by this process once their transaction settles.
+
+    A batch whose transaction failed or was dropped (see `poll_receipts`) loses its
+    stored proofs, which lead to no anchored root, and its records are queued again.
+    """
+    for root, tx_hash in list(_sent.items()):
+        try:
+            status = (await get_transaction_status(tx_hash)).status
+        except ValueError:
+            # Unknown to the node and no longer tracked: it never made it into a block
+            status = "dropped"
+        if status == "pending":
+            continue
+
+        del _sent[root]
+        if status == "confirmed" or await contract.functions.anchoredRoots(root).call():
+            continue
+
+        rows = connection.execute(
+            "SELECT provider, patient, data_hash FROM anchored_records WHERE root = ? AND tx_hash = ?",
+            (root, tx_hash),
+        ).fetchall()
+        with connection:
+            connection.execute(
+                "DELETE FROM anchored_records WHERE root = ? AND tx_hash = ?", (root, tx_hash)
+            )
+        print(f"Batch {root} was {status}, anchoring its {len(rows)} records again")
+        for provider, patient, data_hash in rows:
+            queue_hash(
+                web3.to_checksum_address(provider), web3.to_checksum_address(patient), data_hash
+            ).add_done_callback(_report_requeued)
+
+
+def get_anchored_records(patient: str) -> list[EthAnchor]:
+    """Return the records of a patient whose batch transaction was sent, oldest first."""
+    rows = connection.execute(
+        """
+        SELECT data_hash, tx_hash, root, proof FROM anchored_records
+        WHERE patient = ? AND tx_hash IS NOT NULL ORDER BY created_at
+        """,
+        (patient.lower(),),
+    ).fetchall()
+    return [
+        EthAnchor(data_hash=data_hash, tx_hash=tx_hash, root=root, proof=json.loads(proof))
+        for data_hash, tx_hash, root, proof in rows
+    ]
+
+
+async def verify_anchored_record(patient: str, data_hash: str) -> int:
+    """
+    Verify a record against the anchored roots with its stored Merkle proof.
+
+    Returns the timestamp of the block that anchored it.
+    """
+    rows = connection.execute(
+        """
+        SELECT proof FROM anchored_records
+        WHERE patient = ? AND data_hash = ? AND tx_hash IS NOT NULL
+        """,
+        (patient.lower(), data_hash),
+    ).fetchall()
+    if not rows:
+        raise ValueError("Record not anchored")
+
+    for (proof,) in rows:
+        timestamp = await contract.functions.verifyRecord(
+            web3.to_checksum_address(patient), data_hash, json.loads(proof)
+        ).call()
+        if timestamp:
+            return timestamp
+    raise ValueError("Record not anchored on chain yet")
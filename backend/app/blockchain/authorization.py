@@ -0,0 +1,61 @@
+import asyncio
+from time import monotonic
+from typing import Optional
+from app.core.blockchain import web3, contract
+from app.core.settings import settings
+
+
+HEALTHCARE_PROVIDER = "healthcare_provider"
+RESEARCHER = "researcher"
+
+# (role, lowercase address) -> (authorized, expiry on the monotonic clock)
+_authorizations: dict[tuple[str, str], tuple[bool, float]] = {}
+
+
+def get_cached_authorization(role: str, address: str) -> Optional[bool]:
+    """Return the cached authorization flag of an address, or None if unknown or expired."""
+    entry = _authorizations.get((role, address.lower()))
+    if entry is None:
+        return None
+    authorized, expires_at = entry
+    if expires_at < monotonic():
+        del _authorizations[(role, address.lower())]
+        return None
+    return authorized
+
+
+def cache_authorization(role: str, address: str, authorized: bool) -> None:
+    """Remember the authorization flag of an address for `authorization_cache_ttl` seconds."""
+    expires_at = monotonic() + settings.authorization_cache_ttl
+    _authorizations[(role, address.lower())] = (authorized, expires_at)
+
+
+async def watch_authorization_events():
+    """
+    Follow the contract's authorization events and update the cache as they are emitted.
+
+    The contract only ever grants authorization, so each `HealthcareProviderAuthorized` or
+    `ResearcherAuthorized` event marks its address as authorized without another RPC call.
+    Runs until cancelled, polling every `authorization_poll_interval` seconds.
+    """
+    events = [
+        (HEALTHCARE_PROVIDER, contract.events.HealthcareProviderAuthorized(), "provider"),
+        (RESEARCHER, contract.events.ResearcherAuthorized(), "researcher"),
+    ]
+    from_block = None
+
+    while True:
+        try:
+            latest = await web3.eth.block_number
+            if from_block is None:
+                from_block = latest + 1
+            elif latest >= from_block:
+                for role, event, argument in events:
+                    logs = await event.get_logs(from_block=from_block, to_block=latest)
+                    for log in logs:
+                        cache_authorization(role, log["args"][argument], True)
+                from_block = latest + 1
+        except Exception as e:
+            print("Failed to poll authorization events:", e)
+
+        await asyncio.sleep(settings.authorization_poll_interval)
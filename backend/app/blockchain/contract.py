@@ -1,6 +1,27 @@
+import asyncio
+from typing import AsyncIterator, Callable
 from app.core.blockchain import web3, contract
+from app.core.settings import settings
 from app.blockchain.signature import verify_signature
-from app.schemas import EthMessage, EthRecord, VaccinationAddress
+from app.blockchain.authorization import (
+    HEALTHCARE_PROVIDER,
+    RESEARCHER,
+    get_cached_authorization,
+    cache_authorization,
+)
+from app.blockchain.indexer import get_indexed_records, get_indexed_transaction
+from app.blockchain.transactions import submit_transaction, get_transaction_receipts
+from app.schemas import (
+    EthMessage,
+    EthRecord,
+    EthTransaction,
+    EthVerification,
+    VaccinationAddress,
+)
+
+
+# The deployer is fixed at deployment, so it is fetched once per process
+_deployer_address = None
 
 
 def get_contract_address() -> str:
@@ -10,54 +31,64 @@ def get_contract_address() -> str:
     return contract.address
 
 
-def get_deployer_address() -> str:
+async def get_deployer_address() -> str:
     """
     Retrieve the address of the contract deployer.
     """
-    return contract.functions.deployer().call()
+    global _deployer_address
+    if _deployer_address is None:
+        _deployer_address = await contract.functions.deployer().call()
+    return _deployer_address
 
 
-def is_authorized_healthcare_provider(address: str) -> bool:
-    return contract.functions.authorizedHealthcareProviders(address).call()
+async def is_authorized_healthcare_provider(address: str) -> bool:
+    authorized = get_cached_authorization(HEALTHCARE_PROVIDER, address)
+    if authorized is None:
+        authorized = await contract.functions.authorizedHealthcareProviders(address).call()
+        cache_authorization(HEALTHCARE_PROVIDER, address, authorized)
+    return authorized
 
 
-def is_authorized_researcher(address: str) -> bool:
-    return contract.functions.authorizedResearchers(address).call()
+async def is_authorized_researcher(address: str) -> bool:
+    authorized = get_cached_authorization(RESEARCHER, address)
+    if authorized is None:
+        authorized = await contract.functions.authorizedResearchers(address).call()
+        cache_authorization(RESEARCHER, address, authorized)
+    return authorized
 
 
-def store_hash(
+async def store_hash(
     address: VaccinationAddress, data_hash: str, message: EthMessage, signature: str
 ) -> str:
     """
     Store vaccination hash on the blockchain.
 
-    The transaction is sent from `address`, but the backend submits it.
+    The transaction is sent from `address`, but the backend submits it. Returns as soon as
+    it is submitted; its receipt is then tracked in the background.
     """
     # Verify signature
     if not verify_signature(message, signature, address.healthcare_provider):
         raise ValueError("Invalid signature")
 
-    txn = contract.functions.storeHash(address.patient, data_hash).transact(
-        {
-            "from": address.healthcare_provider,
-            "to": contract.address,
-            "nonce": web3.eth.get_transaction_count(address.healthcare_provider),
-            "gas": 200000,
-            "gasPrice": web3.to_wei("5", "gwei"),
-        }
+    return await submit_transaction(
+        contract.functions.storeHash(address.patient, data_hash),
+        address.healthcare_provider,
     )
 
-    # Send transaction (signed externally by Metamask)
-    tx_hash = web3.eth.send_raw_transaction(txn)
-    return "0x" + tx_hash.hex()
 
-
-def get_hashes(address: str) -> list[EthRecord]:
+async def get_hashes(address: str) -> list[EthRecord]:
     """
     Retrieve vaccination record hashes of one patient from the blockchain.
+
+    Served from the local event index once it has caught up with the chain head,
+    otherwise from the contract.
     """
+    records = get_indexed_records(address)
+    if records is not None:
+        return [EthRecord(data_hash=h, timestamp=ts) for h, ts in records]
+
     # Call contract and return result
-    hashes, timestamps = contract.functions.getHashes(address).call()
+    hashes, timestamps = await contract.functions.getHashes(address).call()
 
     return [
         EthRecord(data_hash=web3.to_hex(h), timestamp=ts)
@@ -65,7 +96,7 @@ def get_hashes(address: str) -> list[EthRecord]:
     ]
 
 
-def grant_access(address: str, message: EthMessage, signature: str) -> str:
+async def grant_access(address: str, message: EthMessage, signature: str) -> str:
     """
     Grant access to the vaccination record (for a researcher).
     """
@@ -73,35 +104,104 @@ def grant_access(address: str, message: EthMessage, signature: str) -> str:
     if not verify_signature(message, signature, address):
         raise ValueError("Invalid signature")
 
-    # Send transaction (signed externally by Metamask)
-    tx_hash = contract.functions.grantAccess(address).transact(
-        {
-            "from": address,
-            "to": contract.address,
-            "nonce": web3.eth.get_transaction_count(address),
-            "gas": 200000,
-            "gasPrice": web3.to_wei("5", "gwei"),
-        }
-    )
-    return tx_hash.hex()
+    return await submit_transaction(contract.functions.grantAccess(address), address)
 
 
-def verify_transaction(tx_hash: str, address: str) -> str:
-    """
-    Verify a vaccination record on the blockchain given the transaction hash and the patient's address. Return the data hash.
-    """
-    tx_receipt = web3.eth.get_transaction_receipt(tx_hash)
+def _check_indexed(indexed: tuple[str, str], address: str) -> str:
+    patient, data_hash = indexed
+    if patient.lower() != address.lower():
+        raise ValueError("Patient address mismatch")
+    return data_hash
+
 
+def _check_receipt(tx_receipt, address: str) -> str:
     if tx_receipt is None:
         raise ValueError("Transaction not found")
 
     processed_logs = contract.events.VaccinationStored().process_receipt(tx_receipt)
+    if len(processed_logs) == 0:
+        raise ValueError("Transaction did not store a vaccination record")
 
     event_data = processed_logs[0]["args"]
     event_patient = event_data["patient"]
     event_hash = event_data["dataHash"]
 
-    if event_patient == address:
+    if event_patient.lower() == address.lower():
         return "0x" + event_hash.hex()
     else:
         raise ValueError("Patient address mismatch")
+
+
+def _verification(transaction: EthTransaction, check: Callable[[], str]) -> EthVerification:
+    try:
+        return EthVerification(
+            patient=transaction.patient, tx_hash=transaction.tx_hash, data_hash=check()
+        )
+    except ValueError as e:
+        return EthVerification(
+            patient=transaction.patient, tx_hash=transaction.tx_hash, error=str(e)
+        )
+
+
+async def verify_transaction(tx_hash: str, address: str) -> str:
+    """
+    Verify a vaccination record on the blockchain given the transaction hash and the patient's address. Return the data hash.
+
+    Indexed transactions are verified locally; others fall back to fetching the receipt.
+    """
+    indexed = get_indexed_transaction(tx_hash)
+    if indexed is not None:
+        return _check_indexed(indexed, address)
+
+    tx_receipt = await web3.eth.get_transaction_receipt(tx_hash)
+    return _check_receipt(tx_receipt, address)
+
+
+async def verify_transactions(
+    transactions: list[EthTransaction],
+) -> AsyncIterator[EthVerification]:
+    """
+    Verify many (patient, transaction hash) pairs, yielding each result as soon as it is known.
+
+    Indexed transactions are verified locally. The receipts of the others are fetched in
+    JSON-RPC batches of `verify_batch_size`, with at most `verify_batch_concurrency`
+    batches in flight, and each receipt is decoded once.
+    """
+    pending = []
+    for transaction in transactions:
+        indexed = get_indexed_transaction(transaction.tx_hash)
+        if indexed is None:
+            pending.append(transaction)
+        else:
+            yield _verification(
+                transaction, lambda: _check_indexed(indexed, transaction.patient)
+            )
+
+    semaphore = asyncio.Semaphore(settings.verify_batch_concurrency)
+
+    async def verify_batch(batch: list[EthTransaction]) -> list[EthVerification]:
+        async with semaphore:
+            try:
+                receipts = await get_transaction_receipts([t.tx_hash for t in batch])
+            except Exception as e:
+                return [
+                    EthVerification(patient=t.patient, tx_hash=t.tx_hash, error=str(e))
+                    for t in batch
+                ]
+
+        verifications = []
+        for transaction, receipt in zip(batch, receipts):
+            verifications.append(
+                _verification(
+                    transaction, lambda: _check_receipt(receipt, transaction.patient)
+                )
+            )
+        return verifications
+
+    batches = [
+        pending[i : i + settings.verify_batch_size]
+        for i in range(0, len(pending), settings.verify_batch_size)
+    ]
+    for batch in asyncio.as_completed([verify_batch(batch) for batch in batches]):
+        for verification in await batch:
+            yield verification
@@ -0,0 +1,177 @@
+import asyncio
+import sqlite3
+from typing import Optional
+from app.core.blockchain import web3, contract
+from app.core.settings import settings
+
+
+# Local mirror of the contract's VaccinationStored events, opened by `setup_indexer`
+connection: Optional[sqlite3.Connection] = None
+
+# Chain head read by the last poll of `run_indexer`
+_head: Optional[int] = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vaccination_records (
+    patient TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS vaccination_records_patient
+    ON vaccination_records (patient, block_number, log_index);
+CREATE INDEX IF NOT EXISTS vaccination_records_block
+    ON vaccination_records (block_number);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+def setup_indexer():
+    """Open (or create) the local record store."""
+    global connection
+    connection = sqlite3.connect(settings.indexer_db_path, check_same_thread=False)
+    connection.executescript(SCHEMA)
+    print("✅ Vaccination record index opened. Checkpoint:", get_checkpoint())
+
+
+def close_indexer():
+    global connection
+    if connection is not None:
+        connection.close()
+        connection = None
+
+
+def get_checkpoint() -> Optional[int]:
+    """Return the last block fully indexed, or None if indexing has not started."""
+    row = connection.execute("SELECT block_number FROM checkpoint WHERE id = 1").fetchone()
+    return row[0] if row else None
+
+
+def get_indexed_records(patient: str) -> Optional[list[tuple[str, int]]]:
+    """
+    Return the (data_hash, timestamp) records of a patient in on-chain order.
+
+    Returns None unless the store has indexed up to the chain head of the last poll (it
+    may still be catching up from `indexer_start_block`, or not have polled yet), so
+    callers can fall back to the chain.
+    """
+    if connection is None or _head is None:
+        return None
+    checkpoint = get_checkpoint()
+    if checkpoint is None or checkpoint < _head:
+        return None
+    return connection.execute(
+        """
+        SELECT data_hash, timestamp FROM vaccination_records
+        WHERE patient = ? ORDER BY block_number, log_index
+        """,
+        (patient.lower(),),
+    ).fetchall()
+
+
+def get_indexed_transaction(tx_hash: str) -> Optional[tuple[str, str]]:
+    """Return the (patient, data_hash) stored by a transaction, or None if not indexed."""
+    if connection is None:
+        return None
+    return connection.execute(
+        "SELECT patient, data_hash FROM vaccination_records WHERE tx_hash = ? LIMIT 1",
+        (tx_hash.lower(),),
+    ).fetchone()
+
+
+async def index_blocks(from_block: int, to_block: int) -> int:
+    """
+    Replace the indexed records of a block range with the logs currently on chain.
+
+    Re-reading a range that was already indexed drops the records of blocks that were
+    reorganized away. Returns the number of records written.
+    """
+    logs = await contract.events.VaccinationStored().get_logs(
+        from_block=from_block, to_block=to_block
+    )
+
+    timestamps = {}
+    rows = []
+    for log in logs:
+        block_number = log["blockNumber"]
+        if block_number not in timestamps:
+            block = await web3.eth.get_block(block_number)
+            timestamps[block_number] = block["timestamp"]
+        rows.append(
+            (
+                log["args"]["patient"].lower(),
+                web3.to_hex(log["args"]["dataHash"]),
+                block_number,
+                web3.to_hex(log["transactionHash"]),
+                log["logIndex"],
+                timestamps[block_number],
+            )
+        )
+
+    with connection:
+        connection.execute(
+            "DELETE FROM vaccination_records WHERE block_number BETWEEN ? AND ?",
+            (from_block, to_block),
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO vaccination_records VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (1, ?)",
+            (to_block,),
+        )
+    return len(rows)
+
+
+def rewind(block_number: int):
+    """Drop the records above a block and move the checkpoint back to it."""
+    with connection:
+        connection.execute(
+            "DELETE FROM vaccination_records WHERE block_number > ?", (block_number,)
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO checkpoint (id, block_number) VALUES (1, ?)",
+            (block_number,),
+        )
+
+
+async def run_indexer():
+    """
+    Follow VaccinationStored logs from the checkpoint and mirror them into the local store.
+
+    Every poll re-reads the last `indexer_reorg_depth` blocks before the checkpoint so
+    that records from reorganized blocks are replaced, and drops the records above the
+    head if a reorg made the chain shorter. Runs until cancelled.
+    """
+    global _head
+    while True:
+        try:
+            latest = await web3.eth.block_number
+            checkpoint = get_checkpoint()
+            if checkpoint is not None and checkpoint > latest:
+                rewind(latest)
+                checkpoint = latest
+
+            if checkpoint is None:
+                from_block = settings.indexer_start_block
+            else:
+                from_block = max(
+                    settings.indexer_start_block,
+                    checkpoint - settings.indexer_reorg_depth + 1,
+                )
+
+            _head = latest
+            while from_block <= latest:
+                to_block = min(from_block + settings.indexer_batch_size - 1, latest)
+                await index_blocks(from_block, to_block)
+                from_block = to_block + 1
+        except Exception as e:
+            print("Failed to index vaccination records:", e)
+
+        await asyncio.sleep(settings.indexer_poll_interval)
@@ -0,0 +1,46 @@
+from eth_abi import encode
+from eth_utils import keccak
+
+
+# Same construction as the contract's `verifyRecord`: leaves are hashed twice so a leaf
+# can never be mistaken for an inner node, and pairs are hashed in sorted order so a
+# proof needs no left/right flags.
+
+
+def leaf_hash(patient: str, data_hash: str) -> bytes:
+    return keccak(keccak(encode(["address", "bytes32"], [patient, bytes.fromhex(data_hash[2:])])))
+
+
+def _parent(a: bytes, b: bytes) -> bytes:
+    return keccak(a + b) if a < b else keccak(b + a)
+
+
+def merkle_tree(leaves: list[bytes]) -> list[list[bytes]]:
+    """Return every level of the tree, from the leaves up to the root. An odd node moves up as is."""
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_proof(levels: list[list[bytes]], index: int) -> list[bytes]:
+    """Return the sibling hashes from leaf `index` up to the root."""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def process_proof(leaf: bytes, proof: list[bytes]) -> bytes:
+    """Recompute the root a proof leads to from its leaf."""
+    node = leaf
+    for sibling in proof:
+        node = _parent(node, sibling)
+    return node
@@ -1,9 +1,24 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from eth_account import Account
 from app.core.blockchain import web3
+from app.core.settings import settings
 from app.schemas.eth import EthMessage
 from eth_account.datastructures import SignedMessage
 from eth_account.messages import encode_defunct, encode_typed_data
 
 
+# (signature, message digest) -> recovered lowercase address, least recently used first
+_recovered: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+
+# Worker processes of `verify_signatures`, started on first use
+_executor: Optional[ProcessPoolExecutor] = None
+
+
 def sign_message(message: EthMessage | str, private_key: str) -> str:
     """Sign message with private key"""
     if isinstance(message, str):
@@ -17,11 +32,130 @@ def sign_message(message: EthMessage | str, private_key: str) -> str:
     return signed_message.signature.hex()
 
 
+def _payload(message: EthMessage | str) -> str | dict:
+    return message if isinstance(message, str) else message.model_dump()
+
+
+def _digest(payload: str | dict) -> Optional[bytes]:
+    """
+    Hash a text or typed-data message; typed data is hashed in a canonical key order.
+
+    Returns None if the payload has no canonical form, so the message is verified uncached.
+    """
+    if isinstance(payload, str):
+        return hashlib.sha256(b"text:" + payload.encode()).digest()
+    try:
+        # The json module, unlike orjson, encodes uint256 values beyond 64 bits
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(b"typed:" + body.encode()).digest()
+
+
+def _recover(payload: str | dict, signature: str) -> str:
+    """Recover the lowercase signer address. Top-level so worker processes can run it."""
+    if isinstance(payload, str):
+        encoded_message = encode_defunct(text=payload)
+    else:
+        encoded_message = encode_typed_data(full_message=payload)
+    return Account.recover_message(encoded_message, signature=signature).lower()
+
+
+def _recover_chunk(items: list[tuple[str | dict, str]]) -> list[Optional[str]]:
+    """Recover the signers of a chunk of a batch in a worker process, None if malformed."""
+    addresses = []
+    for payload, signature in items:
+        try:
+            addresses.append(_recover(payload, signature))
+        except Exception:
+            addresses.append(None)
+    return addresses
+
+
+def _remember(key: tuple[str, bytes], address: str):
+    _recovered[key] = address
+    if len(_recovered) > settings.signature_cache_size:
+        _recovered.popitem(last=False)
+
+
+def recover_address(message: EthMessage | str, signature: str) -> str:
+    """
+    Recover the lowercase address that signed a message.
+
+    Recoveries are memoized by signature and message digest, so a retried login or store
+    skips both the typed-data encoding and the secp256k1 recovery.
+    """
+    payload = _payload(message)
+    digest = _digest(payload)
+    if digest is None:
+        return _recover(payload, signature)
+
+    key = (signature.lower(), digest)
+    address = _recovered.get(key)
+    if address is None:
+        address = _recover(payload, signature)
+        _remember(key, address)
+    else:
+        _recovered.move_to_end(key)
+    return address
+
+
 def verify_signature(message: EthMessage | str, signature: str, address: str) -> bool:
     """Verify MetaMask signature"""
-    if isinstance(message, str):
-        encoded_message = encode_defunct(text=message)
-    else:
-        encoded_message = encode_typed_data(full_message=message.model_dump())
-    recovered = web3.eth.account.recover_message(encoded_message, signature=signature)
-    return address.lower() == recovered.lower()
+    return address.lower() == recover_address(message, signature)
+
+
+async def verify_signatures(
+    items: list[tuple[EthMessage | str, str, str]],
+) -> list[Optional[bool]]:
+    """
+    Verify many (message, signature, address) triples, e.g. for a bulk import.
+
+    Signatures not in the recovery cache are recovered in chunks across
+    `signature_workers` processes. A malformed signature is reported as None instead of
+    failing the batch.
+    """
+    global _executor
+    payloads = [_payload(message) for message, _, _ in items]
+    digests = [_digest(payload) for payload in payloads]
+    keys = [
+        None if digest is None else (signature.lower(), digest)
+        for digest, (_, signature, _) in zip(digests, items)
+    ]
+
+    # Answers are kept here rather than read back from the cache, which a batch larger
+    # than `signature_cache_size` evicts from before it is done
+    recovered: list[Optional[str]] = [None if key is None else _recovered.get(key) for key in keys]
+    missing = [i for i, address in enumerate(recovered) if address is None]
+
+    if missing:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.signature_workers)
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(missing) // settings.signature_workers)
+        chunks = [missing[start : start + chunk_size] for start in range(0, len(missing), chunk_size)]
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    _executor, _recover_chunk, [(payloads[i], items[i][1]) for i in chunk]
+                )
+                for chunk in chunks
+            )
+        )
+        for chunk, addresses in zip(chunks, results):
+            for i, address in zip(chunk, addresses):
+                recovered[i] = address
+                if address is not None and keys[i] is not None:
+                    _remember(keys[i], address)
+
+    return [
+        None if signer is None else address.lower() == signer
+        for signer, (_, _, address) in zip(recovered, items)
+    ]
+
+
+def close_signature_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+from time import monotonic
+from typing import Optional
+from web3._utils.method_formatters import receipt_formatter
+from web3.contract.async_contract import AsyncContractFunction
+from web3.exceptions import TransactionNotFound
+from app.core.blockchain import web3
+from app.core.settings import settings
+from app.schemas import EthTransactionStatus
+
+
+# Next nonce of each sender (lowercase address), and the lock serializing its allocation
+_nonces: dict[str, int] = {}
+_nonce_locks: dict[str, asyncio.Lock] = {}
+# Nonces given back by a failed send or a dropped transaction while later ones were still
+# outstanding, reused lowest first so no gap stalls the sender's pending transactions
+_freed_nonces: dict[str, list[int]] = {}
+# Submissions of each sender between nonce allocation and the node's answer
+_sending: dict[str, int] = {}
+
+# (value, expiry on the monotonic clock) of the gas price, and of the gas limit per function.
+# Each lock lets a burst of submissions wait for one estimate instead of each sending its own.
+_gas_price: Optional[tuple[int, float]] = None
+_gas_price_lock = asyncio.Lock()
+_gas_limits: dict[str, tuple[int, float]] = {}
+_gas_limit_lock = asyncio.Lock()
+
+# Transactions sent by this process: status, and when it was submitted or settled
+_transactions: dict[str, tuple[EthTransactionStatus, float]] = {}
+
+
+async def get_gas_price() -> int:
+    """Return the node's gas price, fetched at most every `tx_gas_price_ttl` seconds."""
+    global _gas_price
+    async with _gas_price_lock:
+        if _gas_price is None or _gas_price[1] < monotonic():
+            _gas_price = (await web3.eth.gas_price, monotonic() + settings.tx_gas_price_ttl)
+        return _gas_price[0]
+
+
+async def get_gas_limit(function: AsyncContractFunction, sender: str) -> int:
+    """
+    Return a gas limit for a contract function, estimated at most every `tx_gas_limit_ttl`
+    seconds per function name.
+
+    The estimate of one call is reused for calls with other arguments, so the limit keeps
+    `tx_gas_limit_margin` of headroom over the largest estimate seen.
+    """
+    async with _gas_limit_lock:
+        cached = _gas_limits.get(function.fn_name)
+        if cached is not None and cached[1] >= monotonic():
+            return cached[0]
+
+        limit = int(await function.estimate_gas({"from": sender}) * settings.tx_gas_limit_margin)
+        if cached is not None:
+            limit = max(limit, cached[0])
+        _gas_limits[function.fn_name] = (limit, monotonic() + settings.tx_gas_limit_ttl)
+        return limit
+
+
+def reset_nonce(sender: str):
+    """Forget a sender's nonce, so the next one is read from the node's pending count."""
+    _nonces.pop(sender.lower(), None)
+    _freed_nonces.pop(sender.lower(), None)
+
+
+def release_nonce(sender: str, nonce: int):
+    """
+    Give back a nonce that no transaction will use.
+
+    While other nonces of the sender are outstanding (being sent, or pending) the node's
+    pending count could hand one of them out again, so the nonce is kept for reuse.
+    Otherwise the next nonce is read from the node again.
+    """
+    key = sender.lower()
+    outstanding = _sending.get(key, 0) > 0 or any(
+        status.status == "pending" and (status.sender or "").lower() == key
+        for status, _ in _transactions.values()
+    )
+    if outstanding:
+        heapq.heappush(_freed_nonces.setdefault(key, []), nonce)
+    else:
+        reset_nonce(sender)
+
+
+async def submit_transaction(function: AsyncContractFunction, sender: str) -> str:
+    """
+    Send a contract transaction from `sender` without waiting for it to be mined.
+
+    Nonces are allocated locally, so concurrent submissions from the same sender get
+    consecutive nonces instead of reading the same pending count, and are sent without
+    waiting for each other. Receipts are polled by `run_receipt_poller`.
+
+    Returns:
+        str: The transaction hash, whose status is then tracked by `get_transaction_status`.
+    """
+    key = sender.lower()
+    gas = await get_gas_limit(function, sender)
+    gas_price = await get_gas_price()
+
+    async with _nonce_locks.setdefault(key, asyncio.Lock()):
+        if _freed_nonces.get(key):
+            nonce = heapq.heappop(_freed_nonces[key])
+        else:
+            if key not in _nonces:
+                _nonces[key] = await web3.eth.get_transaction_count(sender, "pending")
+            nonce = _nonces[key]
+            _nonces[key] = nonce + 1
+        _sending[key] = _sending.get(key, 0) + 1
+
+    try:
+        tx_hash = await function.transact(
+            {"from": sender, "nonce": nonce, "gas": gas, "gasPrice": gas_price}
+        )
+    except Exception:
+        _sending[key] -= 1
+        release_nonce(sender, nonce)
+        raise
+    _sending[key] -= 1
+
+    tx_hash = web3.to_hex(tx_hash)
+    _transactions[tx_hash] = (
+        EthTransactionStatus(tx_hash=tx_hash, status="pending", sender=sender, nonce=nonce),
+        monotonic(),
+    )
+    return tx_hash
+
+
+async def get_transaction_receipts(tx_hashes: list[str]) -> list[Optional[dict]]:
+    """
+    Fetch many transaction receipts with a single JSON-RPC batch request.
+
+    The provider is called directly rather than through `web3.batch_requests()`, whose
+    batching mode is shared by every coroutine using the client.
+    """
+    responses = await web3.provider.make_batch_request(
+        [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in tx_hashes]
+    )
+    if not isinstance(responses, list):
+        raise ValueError(responses.get("error", "Invalid batch response"))
+
+    return [
+        receipt_formatter(response["result"]) if response.get("result") else None
+        for response in responses
+    ]
+
+
+def _settle(status: EthTransactionStatus, receipt) -> EthTransactionStatus:
+    return status.model_copy(
+        update={
+            "status": "confirmed" if receipt["status"] == 1 else "failed",
+            "block_number": receipt["blockNumber"],
+            "gas_used": receipt["gasUsed"],
+        }
+    )
+
+
+async def poll_receipts():
+    """Settle the pending transactions that were mined, and forget old settled ones."""
+    now = monotonic()
+    pending = []
+    for tx_hash, (status, since) in list(_transactions.items()):
+        if status.status == "pending":
+            pending.append(tx_hash)
+        elif since + settings.tx_status_ttl < now:
+            del _transactions[tx_hash]
+
+    for start in range(0, len(pending), settings.verify_batch_size):
+        batch = pending[start : start + settings.verify_batch_size]
+        receipts = await get_transaction_receipts(batch)
+        for tx_hash, receipt in zip(batch, receipts):
+            status, since = _transactions[tx_hash]
+            if receipt is not None:
+                _transactions[tx_hash] = (_settle(status, receipt), now)
+            elif since + settings.tx_pending_timeout < now:
+                # Evicted from the mempool: its nonce is free again
+                _transactions[tx_hash] = (status.model_copy(update={"status": "dropped"}), now)
+                release_nonce(status.sender, status.nonce)
+
+
+async def run_receipt_poller():
+    """Poll the receipts of pending transactions every `tx_poll_interval` seconds, until cancelled."""
+    while True:
+        try:
+            await poll_receipts()
+        except Exception as e:
+            print("Failed to poll transaction receipts:", e)
+
+        await asyncio.sleep(settings.tx_poll_interval)
+
+
+async def get_transaction_status(tx_hash: str) -> EthTransactionStatus:
+    """
+    Return the status of a transaction.
+
+    Transactions sent by this process are answered locally; others (e.g. sent by another
+    worker) are looked up on the chain.
+    """
+    tracked = _transactions.get(tx_hash.lower())
+    if tracked is not None:
+        return tracked[0]
+
+    (receipt,) = await get_transaction_receipts([tx_hash])
+    status = EthTransactionStatus(tx_hash=tx_hash, status="pending")
+    if receipt is not None:
+        return _settle(status, receipt)
+    try:
+        await web3.eth.get_transaction(tx_hash)
+    except TransactionNotFound:
+        raise ValueError("Transaction not found")
+    return status
@@ -0,0 +1,2 @@
+from .read_through import cache_key, read_through, invalidate
+from .metrics import get_cache_metrics
@@ -0,0 +1,28 @@
+from collections import defaultdict
+
+
+# Per-namespace counters of cache lookups, since the process started
+_counters: dict[str, dict[str, int]] = defaultdict(
+    lambda: {"hits": 0, "coalesced": 0, "misses": 0, "errors": 0}
+)
+
+
+def record(namespace: str, outcome: str) -> None:
+    """
+    Count one cache lookup outcome for a namespace: "hits", "coalesced" (found after
+    waiting for a concurrent load), "misses" or "errors".
+    """
+    _counters[namespace][outcome] += 1
+
+
+def get_cache_metrics() -> dict:
+    """Return the hit/miss counters and hit ratio of every cache namespace."""
+    metrics = {}
+    for namespace, counters in _counters.items():
+        served = counters["hits"] + counters["coalesced"]
+        lookups = served + counters["misses"]
+        metrics[namespace] = {
+            **counters,
+            "hit_ratio": served / lookups if lookups else 0.0,
+        }
+    return metrics
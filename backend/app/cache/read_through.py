@@ -0,0 +1,99 @@
+from redis.asyncio.lock import Lock
+from redis.exceptions import RedisError, LockError, LockNotOwnedError
+from typing import Any, Awaitable, Callable, Optional
+from app.core.cache import redis_client, get_cache, set_cache, delete_cache
+from app.core.settings import settings
+from app.cache.metrics import record
+
+
+def cache_key(namespace: str, *parts: str) -> str:
+    """Build a namespaced cache key, e.g. `hbv:patient:0xabc`."""
+    return ":".join([settings.cache_namespace, namespace, *map(str, parts)])
+
+
+# Cached in place of a `None` result, so a storm of lookups of a missing key is answered
+# from the cache too
+_MISSING = {"__missing__": True}
+
+
+async def read_through(
+    namespace: str,
+    key: str,
+    loader: Callable[[], Awaitable[Optional[Any]]],
+    ttl: int,
+) -> Optional[Any]:
+    """
+    Return the cached value of `key`, or load it with `loader` and cache it for `ttl` seconds.
+
+    Concurrent misses on the same key are collapsed into a single load: the first caller
+    takes a Redis lock while loading, the others wait up to `cache_lock_wait` seconds for
+    it and read the cached value, then load it themselves. A `None` result (e.g. not found)
+    is cached for `cache_ttl_missing` seconds. If Redis is unavailable the value is loaded
+    directly so the cache never fails a request.
+
+    Args:
+        namespace (str): Metrics namespace of the cached route.
+        key (str): Full cache key, see `cache_key`.
+        loader (Callable): Coroutine function loading the JSON-serializable value.
+        ttl (int): Expiry of the cached value in seconds.
+    """
+    try:
+        value = await get_cache(key)
+        if value is not None:
+            record(namespace, "hits")
+            return None if value == _MISSING else value
+
+        lock = redis_client.lock(
+            f"{key}:lock",
+            timeout=settings.cache_lock_timeout,
+            blocking_timeout=settings.cache_lock_wait,
+        )
+        if not await lock.acquire():
+            # Another request is still loading: load too rather than keep waiting
+            record(namespace, "misses")
+            return await loader()
+
+        # Another request may have filled the cache while we waited for the lock
+        value = await get_cache(key)
+        if value is not None:
+            record(namespace, "coalesced")
+            await _release(lock)
+            return None if value == _MISSING else value
+    except (RedisError, LockError) as e:
+        print("Cache unavailable, reading through:", e)
+        record(namespace, "errors")
+        return await loader()
+
+    # The value is loaded once: a Redis failure from here on only skips caching it
+    record(namespace, "misses")
+    try:
+        value = await loader()
+        if value is None:
+            await set_cache(key, _MISSING, settings.cache_ttl_missing)
+        else:
+            await set_cache(key, value, ttl)
+    except RedisError as e:
+        print("Failed to cache value:", e)
+        record(namespace, "errors")
+    finally:
+        await _release(lock)
+    return value
+
+
+async def _release(lock: Lock) -> None:
+    """Release a single-flight lock, which may have expired during a slow load."""
+    try:
+        await lock.release()
+    except LockNotOwnedError:
+        # Expired: at worst another request loaded the value too
+        pass
+    except RedisError as e:
+        print("Failed to release cache lock:", e)
+
+
+async def invalidate(*keys: str) -> None:
+    """Drop cached values after a write, ignoring Redis failures (the TTL still applies)."""
+    try:
+        await delete_cache(*keys)
+    except RedisError as e:
+        print("Failed to invalidate cache:", e)
@@ -0,0 +1,92 @@
+"""
+Materialized vaccination statistics, stored as `(:Aggregate {scope, key})` nodes.
+
+Each aggregate holds the `patients` and `vaccinations` counts of one provider, province
+or vaccine, plus a single `total` aggregate. They are rebuilt from the graph after a
+bulk import and kept up to date incrementally by the create queries in
+`app.core.queries`, so reading them is an index lookup instead of a traversal.
+Like `app.core.schema`, this module only depends on the Neo4j driver.
+"""
+
+from neo4j import AsyncDriver
+
+
+SCOPES = ("total", "provider", "province", "vaccine")
+
+CLEAR_AGGREGATES = """
+    MATCH (a:Aggregate)
+    DETACH DELETE a
+"""
+
+BUILD_AGGREGATES = [
+    """
+    CALL () { MATCH (p:Patient) RETURN count(p) AS patients }
+    CALL () { MATCH (:Patient)-[:RECEIVED]->(v:Vaccination) RETURN count(v) AS vaccinations }
+    CREATE (:Aggregate {
+        scope: "total", key: "all", patients: patients, vaccinations: vaccinations, updated: timestamp()
+    })
+    """,
+    # Keys match the node IDs of app.core.graph, e.g. HealthcareProvider -> type_name
+    """
+    MATCH (p:Patient)-[:RECEIVED]->(v:Vaccination)-[:ADMINISTERED_BY]->(h:HealthcareProvider)
+    WITH h, count(DISTINCT p) AS patients, count(DISTINCT v) AS vaccinations
+    CREATE (:Aggregate {
+        scope: "provider", key: h.type + "_" + h.name,
+        patients: patients, vaccinations: vaccinations, updated: timestamp()
+    })
+    """,
+    # Vaccinations count towards the province their patient is registered in
+    """
+    MATCH (p:Patient)
+    WHERE p.reg_province IS NOT NULL
+    WITH p, COUNT { (p)-[:RECEIVED]->(:Vaccination) } AS received
+    WITH p.reg_province AS province, count(p) AS patients, sum(received) AS vaccinations
+    CREATE (:Aggregate {
+        scope: "province", key: province,
+        patients: patients, vaccinations: vaccinations, updated: timestamp()
+    })
+    """,
+    """
+    MATCH (p:Patient)-[:RECEIVED]->(v:Vaccination)
+    WITH v.name AS vaccine, count(DISTINCT p) AS patients, count(v) AS vaccinations
+    CREATE (:Aggregate {
+        scope: "vaccine", key: vaccine,
+        patients: patients, vaccinations: vaccinations, updated: timestamp()
+    })
+    """,
+]
+
+
+async def rebuild_aggregates(driver: AsyncDriver) -> int:
+    """
+    Recompute every aggregate from the graph in one transaction.
+
+    Readers keep seeing the previous aggregates until the rebuild commits.
+
+    Returns:
+        int: Number of aggregate nodes created.
+    """
+
+    async def rebuild(tx) -> int:
+        await (await tx.run(CLEAR_AGGREGATES)).consume()
+        created = 0
+        for query in BUILD_AGGREGATES:
+            summary = await (await tx.run(query)).consume()
+            created += summary.counters.nodes_created
+        return created
+
+    async with driver.session() as session:
+        return await session.execute_write(rebuild)
+
+
+async def ensure_aggregates(driver: AsyncDriver):
+    """Build the aggregates if the database has none yet, e.g. after an offline import."""
+    async with driver.session() as session:
+        result = await session.run(
+            "MATCH (a:Aggregate {scope: 'total', key: 'all'}) RETURN count(a) AS count"
+        )
+        record = await result.single()
+
+    if record["count"] == 0:
+        created = await rebuild_aggregates(driver)
+        print("✅ Aggregate statistics built:", created, "aggregates")
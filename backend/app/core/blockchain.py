@@ -1,20 +1,32 @@
-from web3 import Web3
-from web3.contract import Contract
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
 from app.core.settings import settings
 
-# Connect to Ethereum blockchain
-web3 = Web3(Web3.HTTPProvider(settings.blockchain_rpc))
+# Connect to Ethereum blockchain (non-blocking, so RPC latency never stalls the event loop).
+# Constant answers such as eth_chainId, which web3 checks before every transaction, are cached.
+web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(settings.blockchain_rpc, cache_allowed_requests=True))
 
 # Smart contract ABI & Address
 contract_address = settings.contract_address
 contract_abi = settings.contract_abi
 
-contract: Contract = web3.eth.contract(address=contract_address, abi=contract_abi)
+contract: AsyncContract = web3.eth.contract(address=contract_address, abi=contract_abi)
+
+async def setup_blockchain():
+    # Share one pooled HTTP session for every RPC call
+    session = ClientSession(
+        connector=TCPConnector(limit=settings.blockchain_rpc_pool_size),
+        timeout=ClientTimeout(total=settings.blockchain_rpc_timeout),
+    )
+    await web3.provider.cache_async_session(session)
 
-def setup_blockchain():
     # Check connection status
-    if web3.is_connected():
-        network_id = web3.net.version
+    if await web3.is_connected():
+        network_id = await web3.net.version
         print("✅ Connected to Ethereum network with ID:", network_id)
     else:
         raise Exception("❌ Unable to connect to Ethereum blockchain")
+
+async def close_blockchain():
+    await web3.provider.disconnect()
@@ -13,6 +13,11 @@ async def get_cache(key: str) -> dict:
     value = await redis_client.get(key)
     return json.loads(value) if value else None
 
-async def set_cache(key: str, value: dict) -> None:
-    json_value = json.dumps(value)
-    await redis_client.set(key, json_value)
\ No newline at end of file
+async def set_cache(key: str, value: dict, ttl: int | None = None) -> None:
+    # Like the graph responses, values the json module can't encode (e.g. dates) are strings
+    json_value = json.dumps(value, default=str)
+    await redis_client.set(key, json_value, ex=ttl)
+
+async def delete_cache(*keys: str) -> None:
+    if keys:
+        await redis_client.delete(*keys)
@@ -1,7 +1,13 @@
-from neo4j import GraphDatabase, AsyncGraphDatabase, AsyncDriver
+import base64
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from neo4j import AsyncGraphDatabase, AsyncDriver
 from app.core.settings import settings
+from app.core.schema import bootstrap_schema
+from app.core.aggregates import ensure_aggregates
 from app.schemas.graph import *
-from typing import AsyncGenerator, Any
+from typing import AsyncIterator, Optional
 
 
 URI = settings.neo4j_uri
@@ -9,96 +15,337 @@ USER = settings.neo4j_user
 PASSWORD = settings.neo4j_password
 AUTH = (USER, PASSWORD)
 
+# Process-wide driver, created once by the application lifespan and shared by every request
+driver: Optional[AsyncDriver] = None
 
-async def get_driver() -> AsyncGenerator[AsyncDriver, Any]:
-    async with AsyncGraphDatabase.driver(URI, auth=AUTH) as driver:
-        yield driver
 
+def create_driver() -> AsyncDriver:
+    """Create a pooled Neo4j driver configured from the settings."""
+    return AsyncGraphDatabase.driver(
+        URI,
+        auth=AUTH,
+        max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+        connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout,
+        max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+        liveness_check_timeout=settings.neo4j_liveness_check_timeout,
+    )
+
+
+async def get_driver() -> AsyncDriver:
+    """Dependency returning the shared driver. Sessions borrow connections from its pool."""
+    if driver is None:
+        raise RuntimeError("Neo4j driver is not initialized")
+    return driver
 
-def setup_graph_db():
+
+async def setup_graph_db():
+    """
+    Open the shared driver, check that the database is reachable, migrate its schema
+    and build the aggregate statistics if they are missing.
+    """
+    global driver
+    driver = create_driver()
     try:
-        with GraphDatabase.driver(URI, auth=AUTH) as driver:
-            driver.verify_connectivity()
-            with driver.session() as session:
-                result = session.run("MATCH (n) RETURN count(n)")
-                print("✅ Connected to Neo4j instance. Node count:", result.single()[0])
+        await driver.verify_connectivity()
+        async with driver.session() as session:
+            result = await session.run("MATCH (n) RETURN count(n)")
+            record = await result.single()
+            print("✅ Connected to Neo4j instance. Node count:", record[0])
     except Exception as e:
         print("❌ Failed to connect to Neo4j:", e)
+        return
+
+    try:
+        await bootstrap_schema(driver)
+    except Exception as e:
+        print("❌ Failed to migrate the Neo4j schema:", e)
+
+    try:
+        await ensure_aggregates(driver)
+    except Exception as e:
+        print("❌ Failed to build the aggregate statistics:", e)
+
+
+async def close_graph_db():
+    """Close the shared driver and every connection in its pool."""
+    global driver
+    if driver is not None:
+        await driver.close()
+        driver = None
+
+
+async def fetch_data(driver: AsyncDriver, query: str, **parameters) -> Optional[list[dict]]:
+    """Run a read query and return its records, or None if it matched nothing."""
+    async with driver.session() as session:
+        result = await session.run(query, parameters)
+        data = await result.data()
+    return data or None
+
+
+async def write_batches(
+    driver: AsyncDriver, query: str, rows: list[dict], chunk_size: int
+) -> list[dict]:
+    """
+    Run an UNWIND `$rows` write query with one transaction per chunk of `rows`.
+
+    Chunks are written in order on one session, so a failed chunk leaves the earlier
+    ones committed and the later ones unwritten.
+
+    Returns:
+        list[dict]: The records returned by every chunk.
+    """
+
+    async def write(tx, chunk: list[dict]) -> list[dict]:
+        result = await tx.run(query, rows=chunk)
+        return await result.data()
+
+    data = []
+    async with driver.session() as session:
+        for start in range(0, len(rows), chunk_size):
+            # execute_write retries transient errors such as deadlocks with other writers
+            data += await session.execute_write(write, rows[start : start + chunk_size])
+    return data
 
 
-def map_node(node: dict) -> GraphNode:
+def get_pool_stats() -> dict:
+    """Report the connection pool usage of the shared driver, per server address."""
+    # The driver has no public metrics API, so read the pool bookkeeping directly
+    pool = getattr(driver, "_pool", None)
+    stats = {
+        "max_size": settings.neo4j_max_connection_pool_size,
+        "acquisition_timeout": settings.neo4j_connection_acquisition_timeout,
+        "servers": [],
+    }
+    if pool is None:
+        return stats
+
+    for address, connections in list(pool.connections.items()):
+        in_use = sum(1 for connection in connections if connection.in_use)
+        stats["servers"].append(
+            {
+                "address": str(address),
+                "total": len(connections),
+                "in_use": in_use,
+                "idle": len(connections) - in_use,
+                "pending": pool.connections_reservations.get(address, 0),
+            }
+        )
+    return stats
+
+
+# Fields of each node type, in schema order, so the lean path emits the same JSON as the models
+PATIENT_FIELDS = tuple(GraphPatient.model_fields)
+VACCINATION_FIELDS = tuple(GraphVaccination.model_fields)
+HEALTHCARE_PROVIDER_FIELDS = tuple(GraphHealthcareProvider.model_fields)
+
+
+def _node(id: str, type: str, node: dict, fields: tuple[str]) -> GraphNodeDict:
+    return {"id": id, "type": type, "data": {field: node.get(field) for field in fields}}
+
+
+def patient_node(node: dict) -> GraphNodeDict:
+    return _node(node.get("pid"), "Patient", node, PATIENT_FIELDS)
+
+
+def vaccination_node(node: dict) -> GraphNodeDict:
+    id = f"{node.get('pid')}_{node.get('name')}_{node.get('date')}"
+    return _node(id, "Vaccination", node, VACCINATION_FIELDS)
+
+
+def healthcare_provider_node(node: dict) -> GraphNodeDict:
+    id = f"{node.get('type')}_{node.get('name')}"
+    return _node(id, "HealthcareProvider", node, HEALTHCARE_PROVIDER_FIELDS)
+
+
+def map_node(node: dict) -> GraphNodeDict:
     if node.get("ethnic") is not None:
-        id = node.get("pid")
-        type = "Patient"
-        data = GraphPatient.model_validate(node)
+        return patient_node(node)
     elif node.get("date") is not None:
-        id = f"{node.get('pid')}_{node.get('name')}_{node.get('date')}"
-        type = "Vaccination"
-        data = GraphVaccination.model_validate(node)
+        return vaccination_node(node)
     elif node.get("type") is not None:
-        id = f"{node.get('type')}_{node.get('name')}"
-        type = "HealthcareProvider"
-        data = GraphHealthcareProvider.model_validate(node)
+        return healthcare_provider_node(node)
     else:
         raise ValueError("Invalid node type:", node)
-    return GraphNode(id=id, type=type, data=data)
 
 
-def extract_graph_data(data: list[dict[str]]) -> GraphData:
+class GraphBuilder:
+    """
+    Accumulate the nodes and links of a graph response, each exactly once.
+
+    Nodes are indexed by ID and links by (source, target, type), so repeated paths,
+    duplicate relationships and nodes reached from several directions cost O(1) to skip.
+    """
+
+    def __init__(self):
+        self.nodes: dict[str, GraphNodeDict] = {}
+        self.links: dict[tuple[str, str, str], GraphLinkDict] = {}
+        self.root: Optional[GraphNodeDict] = None
+
+    def add_node(self, node: GraphNodeDict) -> str:
+        self.nodes.setdefault(node["id"], node)
+        return node["id"]
+
+    def add_link(self, source: str, target: str, type: str) -> None:
+        key = (source, target, type)
+        if key not in self.links:
+            self.links[key] = {"source": source, "target": target, "type": type}
+
+    def set_root(self, node: GraphNodeDict) -> None:
+        # The first root wins, which is the best hit for ranked results
+        if self.root is None:
+            self.root = node
+        self.add_node(node)
+
+    def add_record(self, record: dict) -> None:
+        """Add a `r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)` record."""
+        root: dict = record.get("n")
+        if root is not None:
+            self.set_root(map_node(root))
+
+        chain: list = record.get("r")
+        patient = self.add_node(patient_node(chain[0]))
+        vaccination = self.add_node(vaccination_node(chain[2]))
+        healthcare_provider = self.add_node(healthcare_provider_node(chain[4]))
+
+        self.add_link(patient, vaccination, "RECEIVED")
+        self.add_link(vaccination, healthcare_provider, "ADMINISTERED_BY")
+
+    def build(self) -> GraphDataDict:
+        return {
+            "nodes": list(self.nodes.values()),
+            "links": list(self.links.values()),
+            "root": self.root,
+        }
+
+
+def extract_graph_data(data: list[dict[str]]) -> GraphDataDict:
     """Extract graph data from a list of records. The input needs to be the result from this Cypher query:
     MATCH r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
 
     If `n` is included in the cypher query and the result, it will be treated as the root node.
+
+    Nodes are built as plain dicts shaped like `GraphData`, without per-node validation:
+    the records come from our own database, and `graph_response` serializes them directly.
+    """
+    builder = GraphBuilder()
+    for record in data:
+        builder.add_record(record)
+    return builder.build()
+
+
+class GraphStream(GraphBuilder):
     """
-    graph_data = GraphData(
-        nodes=[],
-        links=[],
-        root=None
+    GraphBuilder that emits nodes and links as NDJSON lines instead of keeping them.
+
+    Only the IDs of emitted nodes and the keys of emitted links are remembered, which is
+    enough to deduplicate without buffering the whole graph. Each line is one of
+    `{"root": node}`, `{"node": node}`, `{"link": link}` or `{"next_cursor": cursor}`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lines: list[bytes] = []
+
+    def add_node(self, node: GraphNodeDict) -> str:
+        if node["id"] not in self.nodes:
+            self.nodes[node["id"]] = None
+            self.lines.append(orjson.dumps({"node": node}, default=str) + b"\n")
+        return node["id"]
+
+    def add_link(self, source: str, target: str, type: str) -> None:
+        key = (source, target, type)
+        if key not in self.links:
+            self.links[key] = None
+            link = {"source": source, "target": target, "type": type}
+            self.lines.append(orjson.dumps({"link": link}) + b"\n")
+
+    def set_root(self, node: GraphNodeDict) -> None:
+        if self.root is None:
+            self.root = node
+            self.lines.append(orjson.dumps({"root": node}, default=str) + b"\n")
+        self.add_node(node)
+
+    def set_next_cursor(self, cursor: Optional[str]) -> None:
+        self.lines.append(orjson.dumps({"next_cursor": cursor}) + b"\n")
+
+    def flush(self) -> bytes:
+        chunk = b"".join(self.lines)
+        self.lines.clear()
+        return chunk
+
+
+def encode_cursor(record: dict) -> str:
+    """Encode the keyset position of a record returned by a `*_PAGE` query."""
+    position = orjson.dumps([record["cursor_date"], record["cursor_id"]])
+    return base64.urlsafe_b64encode(position).decode()
+
+
+def cursor_parameters(cursor: Optional[str]) -> dict:
+    """
+    Decode a cursor into the `$after_date` and `$after_id` parameters of a `*_PAGE` query.
+
+    Raises ValueError if the cursor was not produced by `encode_cursor`.
+    """
+    if cursor is None:
+        return {"after_date": None, "after_id": None}
+    try:
+        after_date, after_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    return {"after_date": after_date, "after_id": after_id}
+
+
+async def fetch_graph_page(
+    driver: AsyncDriver, query: str, limit: int, cursor: Optional[str], **parameters
+) -> Optional[GraphPageDict]:
+    """
+    Read one page of records with a `*_PAGE` query and extract its graph.
+
+    Returns None if the first page is empty, so callers can answer 404 as for unpaginated reads.
+    """
+    data = await fetch_data(
+        driver, query, limit=limit, **cursor_parameters(cursor), **parameters
     )
-    unique_ids = set()
+    if data is None and cursor is None:
+        return None
 
-    for record in data:
-        root: dict = record.get("n")
-        if root is not None:
-            graph_data.root = map_node(root)
+    data = data or []
+    graph: GraphPageDict = extract_graph_data(data)
+    graph["next_cursor"] = encode_cursor(data[-1]) if len(data) == limit else None
+    return graph
 
-        chain: list = record.get("r")
-        patient = GraphPatient.model_validate(chain[0])
-        vaccination = GraphVaccination.model_validate(chain[2])
-        healthcare_provider = GraphHealthcareProvider.model_validate(chain[4])
-
-        patient_id = patient.pid
-        vaccination_id = f"{vaccination.pid}_{vaccination.name}_{vaccination.date}"
-        healthcare_provider_id = (
-            f"{healthcare_provider.type}_{healthcare_provider.name}"
-        )
 
-        for node in [
-            GraphNode(id=patient_id, type="Patient", data=patient),
-            GraphNode(
-                id=vaccination_id,
-                type="Vaccination",
-                data=vaccination,
-            ),
-            GraphNode(
-                id=healthcare_provider_id,
-                type="HealthcareProvider",
-                data=healthcare_provider,
-            ),
-        ]:
-            if node.id not in unique_ids:
-                graph_data.nodes.append(node)
-                unique_ids.add(node.id)
-
-        graph_data.links.extend(
-            [
-                GraphLink(source=patient_id, target=vaccination_id, type="RECEIVED"),
-                GraphLink(
-                    source=vaccination_id,
-                    target=healthcare_provider_id,
-                    type="ADMINISTERED_BY",
-                ),
-            ]
-        )
+async def stream_graph(
+    driver: AsyncDriver, query: str, limit: Optional[int] = None, **parameters
+) -> AsyncIterator[bytes]:
+    """
+    Run a records query and yield its graph as NDJSON chunks while the result is read.
+
+    With a `limit`, the query must be a `*_PAGE` query and the stream ends with the cursor
+    of the next page.
+    """
+    graph = GraphStream()
+    count = 0
+    last = None
+    async with driver.session() as session:
+        result = await session.run(query, parameters, limit=limit)
+        async for record in result:
+            last = record.data()
+            count += 1
+            graph.add_record(last)
+            yield graph.flush()
+
+    if limit is not None:
+        graph.set_next_cursor(encode_cursor(last) if count == limit else None)
+        yield graph.flush()
+
+
+def graph_stream_response(chunks: AsyncIterator[bytes]) -> StreamingResponse:
+    """Stream the output of `stream_graph` as NDJSON."""
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
 
-    return graph_data
+def graph_response(graph_data: GraphDataDict) -> Response:
+    """Serialize graph data straight to JSON bytes, skipping FastAPI's response validation."""
+    # Neo4j temporal values (if any) are written as ISO strings, like the models would
+    return Response(orjson.dumps(graph_data, default=str), media_type="application/json")
@@ -0,0 +1,346 @@
+# Catalog of the Cypher queries used by the graph endpoints.
+#
+# Every value is passed as a `$parameter`, never interpolated into the query text,
+# so each query string stays constant and Neo4j reuses its cached execution plan.
+
+# Full vaccination chain: (:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+
+# Keyset pagination: records are ordered by vaccination date then element ID. The first
+# page and the pages after a ($after_date, $after_id) cursor are separate queries, each
+# with a single range predicate on v.date, so the vaccination_date index provides the
+# order and a page reads `$limit` records instead of sorting all of them.
+_FIRST_PAGE = """
+    WHERE v.date IS NOT NULL
+"""
+
+_AFTER_CURSOR = """
+    WHERE v.date >= $after_date
+        AND (v.date > $after_date OR elementId(v) > $after_id)
+"""
+
+_RECORDS_PAGE = """
+    WITH r, n, v.date AS cursor_date, elementId(v) AS cursor_id
+    ORDER BY cursor_date, cursor_id
+    LIMIT $limit
+    RETURN r, n, cursor_date, cursor_id
+"""
+
+_ALL_RECORDS = """
+    MATCH r=(:Patient)-[:RECEIVED]->(v:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+"""
+
+READ_ALL_RECORDS_PAGE = _ALL_RECORDS + _FIRST_PAGE + """
+    WITH r, v, null AS n
+""" + _RECORDS_PAGE
+
+READ_ALL_RECORDS_PAGE_AFTER = _ALL_RECORDS + _AFTER_CURSOR + """
+    WITH r, v, null AS n
+""" + _RECORDS_PAGE
+
+# Search: every branch yields ranked (n, score) hits, then the records through each hit
+
+_SEARCH_RECORDS = """
+    CALL (n) {
+        CALL (n) {
+            MATCH r=(n)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+            RETURN r
+            UNION
+            MATCH r=(:Patient)-[:RECEIVED]->(n)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+            RETURN r
+            UNION
+            MATCH r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(n)
+            RETURN r
+        }
+        RETURN r LIMIT $record_limit
+    }
+    RETURN r, n, score
+    ORDER BY score DESC
+"""
+
+# Exact wallet lookup, for queries that are a full 0x address
+SEARCH_ADDRESS = """
+    CALL () {
+        MATCH (n:Patient {wallet: $query}) RETURN n
+        UNION
+        MATCH (n:HealthcareProvider {wallet: $query}) RETURN n
+    }
+    WITH n, 1.0 AS score
+""" + _SEARCH_RECORDS
+
+# Exact transaction lookup, for queries that are a full 32-byte hash
+SEARCH_TX_HASH = """
+    MATCH (n:Vaccination {tx_hash: $query})
+    WITH n, 1.0 AS score
+""" + _SEARCH_RECORDS
+
+# Full-text search over the *_search indexes of app.core.schema, $query is a Lucene query
+SEARCH_FULLTEXT = """
+    CALL () {
+        CALL db.index.fulltext.queryNodes("patient_search", $query, {limit: $limit})
+        YIELD node, score RETURN node, score
+        UNION ALL
+        CALL db.index.fulltext.queryNodes("vaccination_search", $query, {limit: $limit})
+        YIELD node, score RETURN node, score
+        UNION ALL
+        CALL db.index.fulltext.queryNodes("healthcare_provider_search", $query, {limit: $limit})
+        YIELD node, score RETURN node, score
+    }
+    WITH node AS n, score
+    ORDER BY score DESC
+    LIMIT $limit
+""" + _SEARCH_RECORDS
+
+# Single-hop neighbourhood of a node, one query per way of identifying the node
+
+_HOP_EXPANSION = """
+    OPTIONAL MATCH (n)-[r_out]->(n_target)
+    OPTIONAL MATCH (n)<-[r_in]-(n_source)
+    RETURN
+        n AS node,
+        collect(DISTINCT r_out) as out,
+        collect(DISTINCT r_in) as in,
+        collect(DISTINCT n_target) as target,
+        collect(DISTINCT n_source) as source
+"""
+
+_MATCH_PATIENT = "MATCH (n:Patient {pid: $pid})"
+
+_MATCH_VACCINATION = "MATCH (n:Vaccination {pid: $pid, name: $name, date: $date})"
+
+_MATCH_HEALTHCARE_PROVIDER = "MATCH (n:HealthcareProvider {type: $type, name: $name})"
+
+# Wallets are only set on patients and providers, so match those labels to use their indexes
+_MATCH_WALLET = """
+    CALL () {
+        MATCH (n:Patient {wallet: $address}) RETURN n
+        UNION
+        MATCH (n:HealthcareProvider {wallet: $address}) RETURN n
+    }
+"""
+
+HOP_PATIENT = _MATCH_PATIENT + _HOP_EXPANSION
+
+HOP_VACCINATION = _MATCH_VACCINATION + _HOP_EXPANSION
+
+HOP_HEALTHCARE_PROVIDER = _MATCH_HEALTHCARE_PROVIDER + _HOP_EXPANSION
+
+HOP_WALLET = _MATCH_WALLET + _HOP_EXPANSION
+
+# k-hop neighbourhood of a node, expanded breadth-first up to EXPAND_MAX_DEPTH levels.
+# Each level is unrolled so the query text stays constant: levels beyond $depth unwind
+# an empty frontier. Every frontier node expands at most $fan_out_limit relationships (of
+# $types, or any type if null), and a level adds at most $node_limit new nodes, so the
+# expansion never builds a cartesian product of neighbours.
+
+EXPAND_MAX_DEPTH = 3
+
+_EXPAND_LEVEL = """
+    CALL (frontier) {
+        UNWIND CASE WHEN $depth >= %d THEN frontier ELSE [] END AS source
+        CALL (source) {
+            MATCH (source)-[r]-(m)
+            WHERE $types IS NULL OR type(r) IN $types
+            RETURN r, m
+            LIMIT $fan_out_limit
+        }
+        RETURN collect(DISTINCT r) AS level_links, collect(DISTINCT m) AS reached
+    }
+    WITH n, seen, links, level_links, [m IN reached WHERE NOT m IN seen][..$node_limit] AS frontier
+    WITH n, frontier, seen + frontier AS seen, links, level_links
+    WITH n, frontier, seen,
+        links + [r IN level_links WHERE startNode(r) IN seen AND endNode(r) IN seen] AS links
+"""
+
+_EXPANSION = (
+    """
+    WITH n, [n] AS frontier, [n] AS seen, [] AS links
+"""
+    + "".join(_EXPAND_LEVEL % level for level in range(1, EXPAND_MAX_DEPTH + 1))
+    + """
+    RETURN n AS node, seen AS nodes, links
+"""
+)
+
+EXPAND_PATIENT = _MATCH_PATIENT + _EXPANSION
+
+EXPAND_VACCINATION = _MATCH_VACCINATION + _EXPANSION
+
+EXPAND_HEALTHCARE_PROVIDER = _MATCH_HEALTHCARE_PROVIDER + _EXPANSION
+
+EXPAND_WALLET = _MATCH_WALLET + _EXPANSION
+
+# Aggregate statistics, see app.core.aggregates
+
+# Apply the `update` maps ({scope, key, patients, vaccinations}) of a create query to the
+# aggregates. Setting `updated` first takes the write lock, so concurrent creates cannot
+# read the same counts and lose an increment.
+_UPDATE_AGGREGATES = """
+        WITH update WHERE update.key IS NOT NULL
+        MERGE (a:Aggregate {scope: update.scope, key: update.key})
+        SET a.updated = timestamp()
+        WITH a, update
+        SET a.patients = coalesce(a.patients, 0) + update.patients,
+            a.vaccinations = coalesce(a.vaccinations, 0) + update.vaccinations
+"""
+
+READ_AGGREGATE = """
+    MATCH (a:Aggregate {scope: $scope, key: $key})
+    RETURN a
+"""
+
+READ_AGGREGATES = """
+    MATCH (a:Aggregate {scope: $scope})
+    RETURN a
+    ORDER BY a.vaccinations DESC
+    LIMIT $limit
+"""
+
+# Patient
+
+READ_PATIENT = """
+    MATCH (p:Patient {wallet: $address})
+    RETURN p
+"""
+
+READ_PATIENT_RECORDS = """
+    MATCH r=(n:Patient {wallet: $address})-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+    RETURN r, n
+"""
+
+_PATIENT_RECORDS = """
+    MATCH r=(n:Patient {wallet: $address})-[:RECEIVED]->(v:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+"""
+
+READ_PATIENT_RECORDS_PAGE = _PATIENT_RECORDS + _FIRST_PAGE + _RECORDS_PAGE
+
+READ_PATIENT_RECORDS_PAGE_AFTER = _PATIENT_RECORDS + _AFTER_CURSOR + _RECORDS_PAGE
+
+# A new patient counts towards its province, and a patient moving province takes its
+# vaccinations along. The body reads the patient from `row`, shared by the single and
+# batch creates, and keeps the `previous_wallet` whose cached entries an update leaves stale.
+_CREATE_PATIENT = """
+    MERGE (p:Patient {pid: row.pid})
+    ON CREATE SET p._created = true
+    WITH row, p, p._created IS NOT NULL AS created, p.reg_province AS previous_province, p.wallet AS previous_wallet
+    REMOVE p._created
+    SET p.wallet = row.wallet, p.sex = row.sex, p.dob = row.dob, p.ethnic = row.ethnic, p.reg_province = row.reg_province, p.reg_district = row.reg_district, p.reg_commune = row.reg_commune
+    WITH row, p, created, previous_province, previous_wallet, COUNT { (p)-[:RECEIVED]->(:Vaccination) } AS received
+    CALL (p, created, previous_province, received) {
+        UNWIND CASE
+            WHEN created THEN [
+                {scope: "total", key: "all", patients: 1, vaccinations: 0},
+                {scope: "province", key: p.reg_province, patients: 1, vaccinations: 0}
+            ]
+            WHEN previous_province <> p.reg_province THEN [
+                {scope: "province", key: previous_province, patients: -1, vaccinations: -received},
+                {scope: "province", key: p.reg_province, patients: 1, vaccinations: received}
+            ]
+            ELSE []
+        END AS update
+""" + _UPDATE_AGGREGATES + """
+    }
+"""
+
+# Wallets of the providers whose record pages show the patient
+_PATIENT_PROVIDER_WALLETS = (
+    "COLLECT { MATCH (p)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(h:HealthcareProvider) "
+    "RETURN DISTINCT h.wallet }"
+)
+
+CREATE_PATIENT = """
+    WITH $patient AS row
+""" + _CREATE_PATIENT + """
+    RETURN p, p.wallet AS wallet, previous_wallet, """ + _PATIENT_PROVIDER_WALLETS + """ AS provider_wallets
+"""
+
+# Each row runs in its own subquery so later rows see the patients and aggregates
+# written by earlier ones, e.g. the same pid twice in a batch is created then updated
+CREATE_PATIENTS = """
+    UNWIND $rows AS row
+    CALL (row) {
+""" + _CREATE_PATIENT + """
+        RETURN created, p.wallet AS wallet, previous_wallet, """ + _PATIENT_PROVIDER_WALLETS + """ AS provider_wallets
+    }
+    RETURN row.index AS index, created, wallet, previous_wallet, provider_wallets
+"""
+
+# Healthcare provider
+
+READ_HEALTHCARE_PROVIDER = """
+    MATCH (h:HealthcareProvider {wallet: $address})
+    RETURN h
+"""
+
+READ_HEALTHCARE_PROVIDER_RECORDS = """
+    MATCH r=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(n:HealthcareProvider {wallet: $address})
+    RETURN r, n
+"""
+
+_HEALTHCARE_PROVIDER_RECORDS = """
+    MATCH r=(:Patient)-[:RECEIVED]->(v:Vaccination)-[:ADMINISTERED_BY]->(n:HealthcareProvider {wallet: $address})
+"""
+
+READ_HEALTHCARE_PROVIDER_RECORDS_PAGE = _HEALTHCARE_PROVIDER_RECORDS + _FIRST_PAGE + _RECORDS_PAGE
+
+READ_HEALTHCARE_PROVIDER_RECORDS_PAGE_AFTER = (
+    _HEALTHCARE_PROVIDER_RECORDS + _AFTER_CURSOR + _RECORDS_PAGE
+)
+
+CREATE_HEALTHCARE_PROVIDER = """
+    MERGE (h:HealthcareProvider {name: $name, type: $type})
+    SET h.wallet = $wallet
+    RETURN h
+"""
+
+# Vaccination
+
+READ_VACCINATION = """
+    MATCH (v:Vaccination {tx_hash: $tx_hash})
+    RETURN v
+"""
+
+# A new vaccination counts everywhere, and its patient counts for the provider and the
+# vaccine when it is their first vaccination there. The body reads the vaccination and
+# its provider from `row`, shared by the single and batch creates.
+_CREATE_VACCINATION = """
+    MATCH (p:Patient {pid: row.pid})
+    MATCH (h:HealthcareProvider {name: row.provider_name, type: row.provider_type})
+    MERGE (v:Vaccination {pid: row.pid, name: row.name, date: row.date, type: row.type})
+    ON CREATE SET v._created = true
+    WITH row, p, h, v, v._created IS NOT NULL AS created
+    REMOVE v._created
+    SET v.data_hash = row.data_hash, v.tx_hash = row.tx_hash
+    MERGE (p)-[:RECEIVED]->(v)
+    MERGE (v)-[:ADMINISTERED_BY]->(h)
+    WITH row, p, h, v, created
+    CALL (p, h, v, created) {
+        WITH p, h, v, created,
+            COUNT { (p)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(h) } = 1 AS first_at_provider,
+            COUNT { (p)-[:RECEIVED]->(:Vaccination {name: v.name}) } = 1 AS first_of_vaccine
+        UNWIND CASE WHEN created THEN [
+            {scope: "total", key: "all", patients: 0, vaccinations: 1},
+            {scope: "province", key: p.reg_province, patients: 0, vaccinations: 1},
+            {scope: "provider", key: h.type + "_" + h.name,
+                patients: CASE WHEN first_at_provider THEN 1 ELSE 0 END, vaccinations: 1},
+            {scope: "vaccine", key: v.name,
+                patients: CASE WHEN first_of_vaccine THEN 1 ELSE 0 END, vaccinations: 1}
+        ] ELSE [] END AS update
+""" + _UPDATE_AGGREGATES + """
+    }
+"""
+
+CREATE_VACCINATION = """
+    WITH $vaccination AS row
+""" + _CREATE_VACCINATION + """
+    RETURN v, p.wallet AS patient_wallet, h.wallet AS provider_wallet
+"""
+
+# Rows whose patient or provider does not exist return nothing
+CREATE_VACCINATIONS = """
+    UNWIND $rows AS row
+    CALL (row) {
+""" + _CREATE_VACCINATION + """
+        RETURN created, p.wallet AS patient_wallet, h.wallet AS provider_wallet
+    }
+    RETURN row.index AS index, created, patient_wallet, provider_wallet
+"""
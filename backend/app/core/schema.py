@@ -0,0 +1,186 @@
+"""
+Graph schema bootstrap: indexes and uniqueness constraints for every lookup key.
+
+Every statement is idempotent (`IF NOT EXISTS`), so the migration runs safely at
+application startup and from the data import CLI. This module only depends on the
+Neo4j driver so that the scripts in `data/` can import it without the app settings.
+"""
+
+import re
+from neo4j import AsyncDriver
+from app.core import queries
+
+
+# (name, label, properties) of the keys looked up by the graph endpoints and the importer
+UNIQUE_KEYS = [
+    ("patient_pid", "Patient", ["pid"]),
+    ("patient_wallet", "Patient", ["wallet"]),
+    ("vaccination_tx_hash", "Vaccination", ["tx_hash"]),
+    ("vaccination_key", "Vaccination", ["pid", "name", "date", "type"]),
+    ("healthcare_provider_wallet", "HealthcareProvider", ["wallet"]),
+    ("healthcare_provider_key", "HealthcareProvider", ["name", "type"]),
+    ("aggregate_key", "Aggregate", ["scope", "key"]),
+]
+
+# Range indexes for lookups that do not use a full unique key
+RANGE_INDEXES = [
+    ("vaccination_pid", "Vaccination", ["pid"]),
+    ("vaccination_date", "Vaccination", ["date"]),
+    ("aggregate_scope", "Aggregate", ["scope"]),
+]
+
+# Full-text indexes behind /graph/search, queried by name in queries.SEARCH_FULLTEXT
+FULLTEXT_INDEXES = [
+    ("patient_search", "Patient", ["pid", "wallet"]),
+    ("vaccination_search", "Vaccination", ["name", "tx_hash"]),
+    ("healthcare_provider_search", "HealthcareProvider", ["name", "wallet"]),
+]
+
+# Plan operators that read every node of a label (or of the whole graph)
+SCAN_OPERATORS = ("NodeByLabelScan", "AllNodesScan")
+
+# Plan operators that sort their whole input. PartialSort and PartialTop, which only
+# order ties of an order the index already provides, don't match.
+SORT_OPERATORS = ("Sort", "Top")
+
+# Page queries over every record, whose order must come from the vaccination_date index
+INDEX_ORDERED_QUERIES = ("READ_ALL_RECORDS_PAGE", "READ_ALL_RECORDS_PAGE_AFTER")
+
+
+def _properties(variable: str, properties: list[str]) -> str:
+    return ", ".join(f"{variable}.{prop}" for prop in properties)
+
+
+def constraint_statement(name: str, label: str, properties: list[str]) -> str:
+    return (
+        f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) "
+        f"REQUIRE ({_properties('n', properties)}) IS UNIQUE"
+    )
+
+
+def index_statement(name: str, label: str, properties: list[str]) -> str:
+    return (
+        f"CREATE RANGE INDEX {name} IF NOT EXISTS FOR (n:{label}) "
+        f"ON ({_properties('n', properties)})"
+    )
+
+
+def fulltext_index_statement(name: str, label: str, properties: list[str]) -> str:
+    return (
+        f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) "
+        f"ON EACH [{_properties('n', properties)}]"
+    )
+
+
+async def _execute(session, query: str, **parameters):
+    result = await session.run(query, parameters)
+    await result.consume()
+
+
+async def migrate_schema(driver: AsyncDriver, timeout: int = 300) -> list[str]:
+    """
+    Create the indexes and uniqueness constraints, then wait for them to come online.
+
+    A uniqueness constraint is rejected when existing data already holds duplicates;
+    in that case a plain range index is created for the same key instead.
+
+    Returns:
+        list[str]: Names of the keys that fell back to a non-unique index.
+    """
+    fallbacks = []
+    async with driver.session() as session:
+        for name, label, properties in UNIQUE_KEYS:
+            try:
+                await _execute(session, constraint_statement(name, label, properties))
+            except Exception as e:
+                print(f"⚠️ Unique constraint {name} rejected, using a range index:", e)
+                await _execute(session, index_statement(name, label, properties))
+                fallbacks.append(name)
+
+        for name, label, properties in RANGE_INDEXES:
+            await _execute(session, index_statement(name, label, properties))
+
+        for name, label, properties in FULLTEXT_INDEXES:
+            await _execute(session, fulltext_index_statement(name, label, properties))
+
+        await _execute(session, "CALL db.awaitIndexes($timeout)", timeout=timeout)
+    return fallbacks
+
+
+def _find_operators(plan: dict, operators: tuple[str]) -> list[str]:
+    found = []
+    operator = plan.get("operatorType", "").split("@")[0]
+    if operator.startswith(operators):
+        found.append(operator)
+    for child in plan.get("children", []):
+        found.extend(_find_operators(child, operators))
+    return found
+
+
+async def _explain(session, query: str) -> dict:
+    # EXPLAIN only plans the query, so placeholder values are enough
+    parameters = {
+        param: 1 if param.endswith("limit") else ""
+        for param in re.findall(r"\$(\w+)", query)
+    }
+    result = await session.run("EXPLAIN " + query, parameters)
+    summary = await result.consume()
+    return summary.plan or {}
+
+
+async def find_label_scans(driver: AsyncDriver) -> dict[str, list[str]]:
+    """
+    EXPLAIN every query of the catalog and report the ones that still plan label scans.
+
+    Returns:
+        dict[str, list[str]]: Query name mapped to the scan operators in its plan.
+    """
+    scans = {}
+    async with driver.session() as session:
+        for name, query in vars(queries).items():
+            if name.startswith("_") or not name.isupper() or not isinstance(query, str):
+                continue
+            operators = _find_operators(await _explain(session, query), SCAN_OPERATORS)
+            if operators:
+                scans[name] = operators
+    return scans
+
+
+async def find_full_sorts(driver: AsyncDriver) -> dict[str, list[str]]:
+    """
+    EXPLAIN the `INDEX_ORDERED_QUERIES` and report the ones that sort every record
+    instead of reading them in index order.
+
+    Returns:
+        dict[str, list[str]]: Query name mapped to the sort operators in its plan.
+    """
+    sorts = {}
+    async with driver.session() as session:
+        for name in INDEX_ORDERED_QUERIES:
+            plan = await _explain(session, getattr(queries, name))
+            operators = _find_operators(plan, SORT_OPERATORS)
+            if operators:
+                sorts[name] = operators
+    return sorts
+
+
+async def bootstrap_schema(driver: AsyncDriver):
+    """
+    Run the schema migration and print the queries still planning label scans or
+    full sorts.
+    """
+    fallbacks = await migrate_schema(driver)
+    print(
+        "✅ Graph schema ready:",
+        len(UNIQUE_KEYS) - len(fallbacks), "unique constraints,",
+        len(RANGE_INDEXES) + len(fallbacks), "range indexes,",
+        len(FULLTEXT_INDEXES), "full-text indexes",
+    )
+
+    scans = await find_label_scans(driver)
+    for name, operators in scans.items():
+        print(f"⚠️ {name} still plans a label scan:", ", ".join(operators))
+
+    sorts = await find_full_sorts(driver)
+    for name, operators in sorts.items():
+        print(f"⚠️ {name} sorts every record instead of using the date index:", ", ".join(operators))
@@ -0,0 +1,44 @@
+import re
+from typing import Optional
+from app.core import queries
+from app.core.settings import settings
+
+
+ADDRESS_PATTERN = re.compile(r"^0x[0-9a-fA-F]{40}$")
+HASH_PATTERN = re.compile(r"^0x[0-9a-fA-F]{64}$")
+
+# Characters with a meaning in the Lucene query syntax
+LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def fulltext_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a Lucene query matching every word as a prefix.
+
+    Returns None if no searchable word is left once the syntax characters are removed.
+    """
+    # Prefix (wildcard) terms are not analyzed, so split on the syntax characters like the
+    # standard analyzer does when indexing: "HepB-1" is indexed as "hepb" and "1"
+    words = LUCENE_SPECIAL.sub(" ", text.lower()).split()
+    return " AND ".join(word + "*" for word in words) or None
+
+
+def search_statement(text: str, limit: int) -> Optional[tuple[str, dict]]:
+    """
+    Pick the search query and its parameters for a user query.
+
+    A full 0x address or 32-byte hash is looked up exactly through the unique indexes,
+    anything else goes through the full-text indexes. Returns None if nothing is searchable.
+    """
+    text = text.strip()
+    parameters = {"record_limit": settings.search_records_per_hit}
+
+    if ADDRESS_PATTERN.match(text):
+        return queries.SEARCH_ADDRESS, {**parameters, "query": text}
+    if HASH_PATTERN.match(text):
+        return queries.SEARCH_TX_HASH, {**parameters, "query": text}
+
+    query = fulltext_query(text)
+    if query is None:
+        return None
+    return queries.SEARCH_FULLTEXT, {**parameters, "query": query, "limit": limit}
@@ -18,6 +18,31 @@ def load_contract_abi(path) -> list:
 class Settings(BaseSettings):
     frontend_origins: str = "http://localhost:3000,http://localhost:8000"
     blockchain_rpc: str = "http://localhost:8545"
+    blockchain_rpc_pool_size: int = 100  # concurrent HTTP connections to the RPC node
+    blockchain_rpc_timeout: float = 30.0  # seconds
+    authorization_cache_ttl: float = 300.0  # seconds an on-chain authorization flag is trusted
+    authorization_poll_interval: float = 15.0  # seconds between authorization event polls
+
+    indexer_db_path: str = "config/vaccination_index.db"  # local mirror of VaccinationStored events
+    indexer_start_block: int = 0  # contract deployment block
+    indexer_reorg_depth: int = 12  # blocks re-read on every poll to absorb reorgs
+    indexer_batch_size: int = 2000  # blocks per eth_getLogs request
+    indexer_poll_interval: float = 5.0  # seconds
+    anchor_db_path: str = "config/anchor_proofs.db"  # Merkle proofs of the records anchored in batches
+    anchor_batch_size: int = 256  # records per anchored Merkle root
+    anchor_max_delay: float = 2.0  # seconds a record waits for its batch to fill
+    tx_gas_price_ttl: float = 15.0  # seconds a gas price estimate is reused
+    tx_gas_limit_ttl: float = 600.0  # seconds a gas limit estimate per contract function is reused
+    tx_gas_limit_margin: float = 1.5  # headroom over the estimate, which is reused for other arguments
+    tx_poll_interval: float = 2.0  # seconds between receipt polls of pending transactions
+    tx_pending_timeout: float = 600.0  # seconds before a transaction without receipt counts as dropped
+    tx_status_ttl: float = 3600.0  # seconds the status of a settled transaction is kept
+    signature_cache_size: int = 10000  # recovered signer addresses kept, least recently used evicted
+    signature_workers: int = 4  # processes recovering signers for verify_signatures
+
+    verify_max_items: int = 10000  # records per bulk verification request
+    verify_batch_size: int = 100  # receipts per JSON-RPC batch request
+    verify_batch_concurrency: int = 4  # JSON-RPC batch requests in flight
 
     contract_address: str = "0x1234567890abcdef1234567890abcdef12345678"
     contract_abi_path: str = "config/contract_abi.json"
@@ -26,10 +51,24 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str
     jwt_access_expires_in: str
+    jwt_backend: str = "jose"  # "jose", or "pyjwt" for the faster PyJWT decoder (pip install PyJWT)
+    jwt_cache_size: int = 10000  # verified tokens kept, least recently used evicted
+    jwt_negative_cache_ttl: float = 60.0  # seconds a rejected token is answered from the cache
 
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "password"
+    neo4j_max_connection_pool_size: int = 100
+    neo4j_connection_acquisition_timeout: float = 60.0  # seconds
+    neo4j_max_connection_lifetime: float = 3600.0  # seconds
+    neo4j_liveness_check_timeout: float | None = None  # seconds, None disables the check
+    graph_page_max_size: int = 1000  # records per page of a paginated graph endpoint
+    search_max_results: int = 50  # ranked hits per /graph/search request
+    search_records_per_hit: int = 20  # vaccination records returned around each hit
+    expand_max_fan_out: int = 100  # relationships followed per node by /graph/expand
+    expand_max_nodes: int = 500  # new nodes per level of /graph/expand
+    batch_max_items: int = 5000  # patients or vaccinations per batch create request
+    batch_chunk_size: int = 500  # rows per UNWIND transaction of a batch create
 
     # db_dialect: str
     # db_driver: str
@@ -45,6 +84,21 @@ class Settings(BaseSettings):
     redis_port: str
     redis_db: str
 
+    cache_namespace: str = "hbv"
+    cache_lock_timeout: float = 60.0  # seconds a cache miss may hold its single-flight lock, above the slowest load
+    cache_lock_wait: float = 2.0  # seconds a concurrent miss waits for that load before loading itself
+    cache_ttl_missing: int = 10  # seconds a not-found result is cached
+    cache_ttl_patient: int = 300  # seconds
+    cache_ttl_vaccination: int = 300
+    cache_ttl_records: int = 60
+    cache_ttl_hashes: int = 30
+    cache_ttl_coverage: int = 3600  # the coverage dataset only changes on redeploy
+
+    analytics_dataset_path: str = "../data/data/hepb_data_long.parquet"
+    analytics_births_path: str | None = None  # CSV of province_reg, year_dob, birth_number
+    analytics_store_path: str = "../data/data/partitioned"  # written by data/partition_dataset.py
+    analytics_batch_size: int = 65536  # rows scanned at a time by store queries
+
 
 settings = Settings()
 settings.contract_abi = load_contract_abi(settings.contract_abi_path)
@@ -1,18 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from app.core.security import setup_cors
 # from app.core.database import setup_database
-from app.core.graph import setup_graph_db
-from app.core.blockchain import setup_blockchain
+from app.core.graph import setup_graph_db, close_graph_db
+from app.core.blockchain import setup_blockchain, close_blockchain
+from app.blockchain.authorization import watch_authorization_events
+from app.blockchain.indexer import setup_indexer, close_indexer, run_indexer
+from app.blockchain.transactions import run_receipt_poller
+from app.blockchain.signature import close_signature_pool
+from app.blockchain.anchor import (
+    setup_anchor_store,
+    close_anchor_store,
+    run_anchor_queue,
+    flush_anchor_queue,
+)
 from app.api import router
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # setup_database()
+    await setup_graph_db()
+    await setup_blockchain()
+    setup_indexer()
+    setup_anchor_store()
+    authorization_watcher = asyncio.create_task(watch_authorization_events())
+    indexer = asyncio.create_task(run_indexer())
+    anchor_queue = asyncio.create_task(run_anchor_queue())
+    receipt_poller = asyncio.create_task(run_receipt_poller())
+    yield
+    authorization_watcher.cancel()
+    indexer.cancel()
+    anchor_queue.cancel()
+    receipt_poller.cancel()
+    # A batch being sent finishes before the records still queued are anchored
+    with suppress(asyncio.CancelledError):
+        await anchor_queue
+    await flush_anchor_queue()
+    close_signature_pool()
+    close_indexer()
+    close_anchor_store()
+    await close_graph_db()
+    await close_blockchain()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(router)
 
 setup_cors(app)
-# setup_database()
-setup_graph_db()
-setup_blockchain()
 
 @app.get("/")
 def read_root():
@@ -1,4 +1,7 @@
 from .auth import AuthDetails, AuthToken
-from .eth import EthMessage, EthAddress, EthHash, EthRecord
-from .graph import GraphNode, GraphLink, GraphData, GraphPatient, GraphHealthcareProvider, GraphVaccination
+from .eth import EthMessage, EthAddress, EthHash, EthAnchor, EthRecord, EthTransaction, EthTransactionStatus, EthVerification
+from .graph import GraphNode, GraphLink, GraphData, GraphPage, GraphPatient, GraphHealthcareProvider, GraphVaccination
+from .graph import GraphNodeDict, GraphLinkDict, GraphDataDict, GraphPageDict
 from .vaccination import VaccinationData, VaccinationAddress
+from .stats import AggregateScope, AggregateStats
+from .batch import BatchStatus, BatchVaccination, BatchItemResult, BatchResult
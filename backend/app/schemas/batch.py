@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
+from .graph import GraphHealthcareProvider, GraphVaccination
+
+
+BatchStatus = Literal["created", "updated", "not_found"]
+
+
+class BatchVaccination(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    vaccination: GraphVaccination
+    healthcare_provider: GraphHealthcareProvider
+
+
+class BatchItemResult(BaseModel):
+    index: int                  # Position of the item in the request
+    status: BatchStatus
+    detail: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    not_found: int = 0
+    items: list[BatchItemResult]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 from pydantic.alias_generators import to_camel
 
 
@@ -28,6 +29,11 @@ class EthHash(BaseModel):
     tx_hash: str
 
 
+class EthAnchor(EthHash):
+    root: str                   # Merkle root anchored by the transaction
+    proof: list[str]            # Sibling hashes from the record up to the root
+
+
 class EthRecord(BaseModel):
     model_config = ConfigDict(
         from_attributes=True, alias_generator=to_camel, populate_by_name=True
@@ -35,3 +41,30 @@ class EthRecord(BaseModel):
 
     data_hash: str
     timestamp: int
+
+
+class EthTransaction(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True, alias_generator=to_camel, populate_by_name=True
+    )
+
+    patient: str
+    tx_hash: str
+
+
+class EthTransactionStatus(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True, alias_generator=to_camel, populate_by_name=True
+    )
+
+    tx_hash: str
+    status: Literal["pending", "confirmed", "failed", "dropped"]
+    sender: Optional[str] = None        # Known for transactions sent by the backend
+    nonce: Optional[int] = None
+    block_number: Optional[int] = None  # Set once the transaction is mined
+    gas_used: Optional[int] = None
+
+
+class EthVerification(EthTransaction):
+    data_hash: Optional[str] = None     # Set when the record is verified
+    error: Optional[str] = None         # Set when the verification failed
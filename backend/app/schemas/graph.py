@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import date
-from typing import Optional, Union
+from typing import Optional, TypedDict, Union
 
 
 class GraphPatient(BaseModel):
@@ -55,3 +55,33 @@ class GraphData(BaseModel):
     nodes: list[GraphNode]
     links: list[GraphLink]
     root: Optional[GraphNode]
+
+
+class GraphPage(GraphData):
+    # Cursor of the next page, None on the last page or when the request was not paginated
+    next_cursor: Optional[str] = None
+
+
+# Lean counterparts of the models above, used to build large graph responses without validation
+
+
+class GraphNodeDict(TypedDict):
+    id: str
+    type: str
+    data: dict
+
+
+class GraphLinkDict(TypedDict):
+    source: str
+    target: str
+    type: str
+
+
+class GraphDataDict(TypedDict):
+    nodes: list[GraphNodeDict]
+    links: list[GraphLinkDict]
+    root: Optional[GraphNodeDict]
+
+
+class GraphPageDict(GraphDataDict):
+    next_cursor: Optional[str]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
+
+
+AggregateScope = Literal["total", "provider", "province", "vaccine"]
+
+
+class AggregateStats(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    scope: AggregateScope
+    key: str
+    patients: int = 0
+    vaccinations: int = 0
+    updated: Optional[int] = None  # milliseconds since the epoch
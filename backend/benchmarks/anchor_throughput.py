@@ -0,0 +1,99 @@
+"""
+Compare anchoring vaccination hashes one transaction each against Merkle-root batches.
+
+Runs against a local dev chain (settings.blockchain_rpc, e.g. Ganache or Anvil with
+unlocked accounts) where HBVTracker is deployed at settings.contract_address by the
+first account. The second account is authorized as a healthcare provider, then the
+same random records are anchored with one `storeHash` each and through the anchor
+queue (`storeRoot` per batch). Reports transactions, gas and records/s for each, and
+verifies every batched record on chain with its Merkle proof.
+
+Usage (from the backend directory):
+    python -m benchmarks.anchor_throughput --records 500 --batch-sizes 50 256
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from app.core.blockchain import web3, contract, setup_blockchain, close_blockchain
+from app.core.settings import settings
+from app.blockchain import anchor
+
+
+async def wait_for_receipts(tx_hashes: list) -> int:
+    """Wait until every transaction is mined and return their total gas used."""
+    gas = 0
+    for tx_hash in tx_hashes:
+        receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+        gas += receipt["gasUsed"]
+    return gas
+
+
+async def one_per_record(provider: str, records: list[tuple[str, str]]) -> tuple[int, int, float]:
+    start = time.perf_counter()
+    tx_hashes = []
+    for patient, data_hash in records:
+        tx_hashes.append(
+            await contract.functions.storeHash(patient, data_hash).transact({"from": provider})
+        )
+    gas = await wait_for_receipts(tx_hashes)
+    return len(tx_hashes), gas, time.perf_counter() - start
+
+
+async def batched(provider: str, records: list[tuple[str, str]]) -> tuple[int, int, float]:
+    start = time.perf_counter()
+    results = [anchor.queue_hash(provider, patient, data_hash) for patient, data_hash in records]
+    await anchor.flush_anchor_queue()
+    anchors = await asyncio.gather(*results)
+    tx_hashes = list(dict.fromkeys(a.tx_hash for a in anchors))
+    gas = await wait_for_receipts(tx_hashes)
+    elapsed = time.perf_counter() - start
+
+    for patient, data_hash in records:
+        assert await anchor.verify_anchored_record(patient, data_hash), data_hash
+    return len(tx_hashes), gas, elapsed
+
+
+def report(name: str, records: int, transactions: int, gas: int, elapsed: float):
+    print(
+        f"{name:>20} {transactions:>6} {gas:>12,} {gas / records:>10,.0f} "
+        f"{records / elapsed:>10,.1f}"
+    )
+
+
+async def main(records: int, batch_sizes: list[int]):
+    await setup_blockchain()
+    deployer, provider = (await web3.eth.accounts)[:2]
+    await web3.eth.wait_for_transaction_receipt(
+        await contract.functions.authorizeHealthcareProvider(provider).transact({"from": deployer})
+    )
+
+    def random_records() -> list[tuple[str, str]]:
+        return [
+            (web3.to_checksum_address("0x" + os.urandom(20).hex()), "0x" + os.urandom(32).hex())
+            for _ in range(records)
+        ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.anchor_db_path = os.path.join(directory, "anchor_proofs.db")
+        anchor.setup_anchor_store()
+
+        print(f"{'anchoring':>20} {'txs':>6} {'gas':>12} {'gas/record':>10} {'records/s':>10}")
+        report("storeHash each", records, *await one_per_record(provider, random_records()))
+        for batch_size in batch_sizes:
+            settings.anchor_batch_size = batch_size
+            report(f"storeRoot per {batch_size}", records, *await batched(provider, random_records()))
+        print("✅ Every batched record verified on chain with its Merkle proof")
+
+        anchor.close_anchor_store()
+    await close_blockchain()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[50, 256])
+    args = parser.parse_args()
+    asyncio.run(main(args.records, args.batch_sizes))
@@ -0,0 +1,101 @@
+"""
+Measure patient and vaccination write throughput, one per call versus batched.
+
+Writes synthetic patients (pid `bench-*`) and their vaccinations to a local Neo4j
+(settings.neo4j_uri), first with one CREATE_PATIENT / CREATE_VACCINATION call each, as
+the single create endpoints do, then with CREATE_PATIENTS / CREATE_VACCINATIONS through
+`write_batches` at each chunk size. The synthetic nodes are deleted afterwards and the
+aggregate statistics rebuilt.
+
+Usage (from the backend directory, with a local Neo4j running and the schema migrated):
+    python -m benchmarks.batch_writes --items 2000 --chunk-sizes 100 500 2000
+"""
+
+import argparse
+import asyncio
+import time
+from app.core.aggregates import rebuild_aggregates
+from app.core.graph import create_driver, write_batches
+from app.core import queries
+
+
+PROVIDER = {"name": "Benchmark clinic", "type": "bench"}
+
+CREATE_PROVIDER = "MERGE (h:HealthcareProvider {name: $name, type: $type})"
+
+CLEAN_UP = """
+    MATCH (n)
+    WHERE (n:Patient OR n:Vaccination) AND n.pid STARTS WITH "bench-"
+       OR n:HealthcareProvider AND n.type = "bench"
+    DETACH DELETE n
+"""
+
+
+def patients(count: int) -> list[dict]:
+    return [
+        {
+            "index": i, "pid": f"bench-{i}", "wallet": None, "sex": "nu", "dob": "2020-01-01",
+            "ethnic": "Kinh", "reg_province": "Benchmark", "reg_district": "-", "reg_commune": "-",
+        }
+        for i in range(count)
+    ]
+
+
+def vaccinations(count: int) -> list[dict]:
+    return [
+        {
+            "index": i, "pid": f"bench-{i}", "name": "Quinvaxem", "date": "2020-03-01",
+            "type": "TCMR", "data_hash": None, "tx_hash": None,
+            "provider_name": PROVIDER["name"], "provider_type": PROVIDER["type"],
+        }
+        for i in range(count)
+    ]
+
+
+async def one_by_one(driver, query: str, name: str, rows: list[dict]) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        async with driver.session() as session:
+            result = await session.run(query, {name: row})
+            await result.consume()
+    return time.perf_counter() - start
+
+
+async def batched(driver, query: str, rows: list[dict], chunk_size: int) -> float:
+    start = time.perf_counter()
+    await write_batches(driver, query, rows, chunk_size)
+    return time.perf_counter() - start
+
+
+async def main(items: int, chunk_sizes: list[int]):
+    driver = create_driver()
+    async with driver:
+        await driver.execute_query(CLEAN_UP)
+        await driver.execute_query(CREATE_PROVIDER, PROVIDER)
+
+        print(f"{'writes':>24} {'items':>6} {'seconds':>8} {'items/s':>9}")
+        runs = [("one per call", None)] + [(f"chunks of {size}", size) for size in chunk_sizes]
+        for name, chunk_size in runs:
+            for label, query, batch_query, rows in (
+                ("patients", queries.CREATE_PATIENT, queries.CREATE_PATIENTS, patients(items)),
+                ("vaccinations", queries.CREATE_VACCINATION, queries.CREATE_VACCINATIONS, vaccinations(items)),
+            ):
+                if chunk_size is None:
+                    elapsed = await one_by_one(driver, query, label[:-1], rows)
+                else:
+                    elapsed = await batched(driver, batch_query, rows, chunk_size)
+                print(f"{label + ', ' + name:>24} {items:>6} {elapsed:>8.2f} {items / elapsed:>9,.0f}")
+            # Start every run from an empty graph so each one creates rather than updates
+            await driver.execute_query(CLEAN_UP)
+            await driver.execute_query(CREATE_PROVIDER, PROVIDER)
+
+        await driver.execute_query(CLEAN_UP)
+        await rebuild_aggregates(driver)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000, help="patients and vaccinations per run")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.chunk_sizes))
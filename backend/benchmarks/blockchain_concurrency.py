@@ -0,0 +1,93 @@
+"""
+Measure request throughput of contract calls made from async handlers when the RPC is slow.
+
+A local JSON-RPC stand-in answers every `eth_call` after a fixed delay. The same batch of
+concurrent "requests" calling `is_authorized_healthcare_provider` is run once through a
+synchronous Web3 client (which blocks the event loop, as the backend used to) and once
+through the AsyncWeb3 client used by `app.blockchain.contract`.
+
+Usage (from the backend directory, no Ethereum node needed):
+    python -m benchmarks.blockchain_concurrency --requests 50 --delays 0 0.05 0.2
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from aiohttp import web
+from web3 import Web3, AsyncWeb3
+from app.core.settings import settings
+
+
+HOST, PORT = "127.0.0.1", 8599
+ADDRESS = "0x4ca32d107c8BF5481aA8EE9C0d287F7F5aDe62EE"
+TRUE = "0x" + "0" * 63 + "1"  # ABI-encoded `true`
+
+rpc_delay = 0.0
+
+
+async def handle_rpc(request: web.Request) -> web.Response:
+    """Answer JSON-RPC requests like an Ethereum node would, after `rpc_delay` seconds."""
+    body = await request.json()
+    await asyncio.sleep(rpc_delay)
+    results = {"eth_call": TRUE, "eth_chainId": "0x539", "net_version": "1337"}
+    return web.json_response(
+        {"jsonrpc": "2.0", "id": body["id"], "result": results.get(body["method"])}
+    )
+
+
+def start_stand_in():
+    """Run the RPC stand-in on its own thread so a blocked client loop cannot stall it."""
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post("/", handle_rpc)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, HOST, PORT).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+async def run_blocking(requests: int) -> float:
+    w3 = Web3(Web3.HTTPProvider(f"http://{HOST}:{PORT}"))
+    contract = w3.eth.contract(address=settings.contract_address, abi=settings.contract_abi)
+
+    async def handler():
+        return contract.functions.authorizedHealthcareProviders(ADDRESS).call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[handler() for _ in range(requests)])
+    return time.perf_counter() - start
+
+
+async def run_async(requests: int) -> float:
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(f"http://{HOST}:{PORT}"))
+    contract = w3.eth.contract(address=settings.contract_address, abi=settings.contract_abi)
+
+    async def handler():
+        return await contract.functions.authorizedHealthcareProviders(ADDRESS).call()
+
+    await handler()  # open the pooled session outside the measurement
+    start = time.perf_counter()
+    await asyncio.gather(*[handler() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    await w3.provider.disconnect()
+    return elapsed
+
+
+async def main(requests: int, delays: list[float]):
+    global rpc_delay
+    print(f"{'RPC delay':>10} {'sync Web3 req/s':>16} {'AsyncWeb3 req/s':>16}")
+    for delay in delays:
+        rpc_delay = delay
+        blocking = await run_blocking(requests)
+        non_blocking = await run_async(requests)
+        print(f"{delay * 1000:>8.0f}ms {requests / blocking:>16.1f} {requests / non_blocking:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delays", type=float, nargs="+", default=[0, 0.05, 0.2])
+    args = parser.parse_args()
+    start_stand_in()
+    asyncio.run(main(args.requests, args.delays))
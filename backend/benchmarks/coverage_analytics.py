@@ -0,0 +1,146 @@
+"""
+Time the vectorized coverage pipeline of app.analytics on the full dataset.
+
+Reports the time of each stage (read, prepare, per-child status, every metric) and
+checks the per-child dose delays against a row-by-row port of the R notebooks' nested
+`ifelse`, run on a sample of children to extrapolate its time on the full dataset.
+
+Without the dataset (data/data/hepb_data_long.parquet is not in the repository),
+`--synthetic` writes a random dataset of that many children to a temporary file.
+
+Usage (from the backend directory):
+    python -m benchmarks.coverage_analytics --path ../data/data/hepb_data_long.parquet
+    python -m benchmarks.coverage_analytics --synthetic 1000000
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from app.analytics.coverage import (
+    COVERAGE_KINDS,
+    PROVINCE_REGIONS,
+    read_doses,
+    prepare_doses,
+    dose_status,
+    coverage,
+    age_at_dose,
+    dose_completion,
+)
+from app.core.settings import settings
+
+
+VACCINES = ["Hep B vaccine for newborn", "Quinvaxem", "Hexaxim", "ENGERIX-B", "Boostrix"]
+
+
+def write_synthetic(children: int, path: str):
+    """Write a long-format dataset of `children` with 1 to 5 doses each."""
+    rng = np.random.default_rng(0)
+    doses = rng.integers(1, 6, children)
+    pid = np.repeat(np.arange(children).astype(str), doses)
+    dob = np.repeat(
+        np.datetime64("2014-01-01") + rng.integers(0, 8 * 365, children).astype("timedelta64[D]"),
+        doses,
+    )
+    # Roughly the schedule: birth, then months 2, 3 and 4, with random delays
+    order = np.concatenate([np.arange(n) for n in doses])
+    age = order * 30 + (order > 0) * 30 + rng.integers(-2, 60, len(pid))
+    provinces = list(PROVINCE_REGIONS)
+    pd.DataFrame(
+        {
+            "pid": pid,
+            "vacname": rng.choice(VACCINES, len(pid)),
+            "vacdate": dob + age.astype("timedelta64[D]"),
+            "dob": dob,
+            "province_reg": np.repeat(rng.choice(provinces, children), doses),
+        }
+    ).to_parquet(path, index=False)
+
+
+def delays_by_rows(months: list[float]) -> tuple:
+    """The notebooks' nested ifelse on one child's V1-V4, NA (None) propagating."""
+    v1, v2, v3, v4 = (months + [math.nan] * 4)[:4]
+
+    def chain(branches, default):
+        for value, condition, result in branches:
+            if math.isnan(value):
+                return None
+            if condition(value):
+                return result
+        return default
+
+    return (
+        chain([(v1, lambda v: v == -2, 0), (v1, lambda v: v == -1, 1), (v1, lambda v: v == 0, 2)], 3),
+        chain([(v1, lambda v: v > 8, 2), (v1, lambda v: v > 2, 1), (v1, lambda v: v == 2, 0), (v1, lambda v: v == 1, -1),
+               (v2, lambda v: v > 8, 2), (v2, lambda v: v > 2, 1), (v2, lambda v: v == 2, 0)], -1),
+        chain([(v2, lambda v: v > 9, 2), (v2, lambda v: v > 3, 1), (v2, lambda v: v == 3, 0), (v1, lambda v: v >= 1, -1),
+               (v3, lambda v: v > 9, 2), (v3, lambda v: v > 3, 1), (v3, lambda v: v == 3, 0)], -1),
+        chain([(v3, lambda v: v > 10, 2), (v3, lambda v: v > 4, 1), (v3, lambda v: v == 4, 0), (v2, lambda v: v >= 3, -1),
+               (v4, lambda v: v > 10, 2), (v4, lambda v: v > 4, 1), (v4, lambda v: v == 4, 0)], -1),
+    )
+
+
+def row_loop_status(prepared: pd.DataFrame, pids: set) -> dict:
+    """Per-child delays computed with a Python loop over the dose rows."""
+    months = {}
+    for row in prepared[prepared["pid"].isin(pids)].sort_values(["pid", "vacdate"], kind="stable").itertuples():
+        months.setdefault(row.pid, []).append(row.vac_month)
+    return {pid: delays_by_rows(values) for pid, values in months.items()}
+
+
+def timed(name: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{name:>32}: {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return result
+
+
+def main(path: str, sample: int):
+    doses = timed("read parquet", read_doses, path)
+    prepared = timed("prepare doses", prepare_doses, doses)
+    status = timed("dose status (per child)", dose_status, prepared)
+    print(f"{len(prepared)} doses, {len(status)} children")
+
+    start = time.perf_counter()
+    for kind, doses_of_kind in COVERAGE_KINDS.items():
+        for dose in doses_of_kind:
+            for by in ("province", "region"):
+                coverage(status, kind, dose, by)
+    print(f"{'20 coverage curves':>32}: {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    timed("age at dose (months 2, 3, 4)", age_at_dose, prepared, [2, 3, 4])
+    timed("dose completion", dose_completion, status)
+
+    pids = set(status["pid"].sample(min(sample, len(status)), random_state=0))
+    start = time.perf_counter()
+    expected = row_loop_status(prepared, pids)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'row loop, ' + str(len(pids)) + ' children':>32}: {elapsed * 1000:>9.1f} ms "
+        f"(~{elapsed / len(pids) * len(status):.1f} s for every child)"
+    )
+
+    columns = ["newborn_delay", "hbv1_delay", "hbv2_delay", "hbv3_delay"]
+    vectorized = status[status["pid"].isin(pids)].set_index("pid")[columns]
+    for pid, delays in expected.items():
+        row = [None if math.isnan(value) else value for value in vectorized.loc[pid]]
+        assert row == list(delays), f"delays differ for {pid}: {row} != {delays}"
+    print("✅ Vectorized delays match the row loop")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", default=settings.analytics_dataset_path)
+    parser.add_argument("--synthetic", type=int, help="children in a generated dataset")
+    parser.add_argument("--sample", type=int, default=20000, help="children checked by the row loop")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "synthetic.parquet")
+            write_synthetic(args.synthetic, path)
+            main(path, args.sample)
+    else:
+        main(args.path, args.sample)
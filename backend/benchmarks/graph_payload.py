@@ -0,0 +1,116 @@
+"""
+Compare graph response payload sizes with and without node and link deduplication.
+
+The naive path reproduces what the graph endpoints used to emit: every node seen in a
+hop and both links of every record path, repeated as often as they occur. The deduped
+path is `GraphBuilder`, used by `extract_graph_data` and `/graph/hop`.
+
+Duplicates occur in real data: vaccinations that differ only by type share one node ID,
+and a provider hop lists the same patients and vaccinations once per relationship.
+
+Usage (from the backend directory, no database needed):
+    python -m benchmarks.graph_payload --sizes 1000 10000 100000 --duplicates 0.3
+"""
+
+import argparse
+import random
+from app.core.graph import GraphBuilder, extract_graph_data, graph_response, map_node
+from app.schemas import GraphDataDict
+
+
+def make_records(count: int, duplicates: float) -> list[dict]:
+    """Build path records where a `duplicates` fraction repeats a vaccination with another type."""
+    random.seed(0)
+    records = []
+    for i in range(count):
+        pid = str(100000000000000 + i // 2)
+        patient = {
+            "pid": pid, "wallet": None, "sex": "nu", "dob": "2017-02-14", "ethnic": "Kinh",
+            "reg_province": "Vĩnh Phúc", "reg_district": "Bình Xuyên", "reg_commune": "Bá Hiến",
+        }
+        provider = {"name": f"TYT {i % (count // 10 + 1)}", "type": "TCMR", "wallet": None}
+        types = ["TCCD", "TCDV"] if random.random() < duplicates else ["TCCD"]
+        for type in types:
+            vaccination = {"pid": pid, "name": f"Vaccine {i % 2}", "date": "2017-06-11", "type": type}
+            records.append(
+                {"r": [patient, "RECEIVED", vaccination, "ADMINISTERED_BY", provider]}
+            )
+    return records
+
+
+def make_hop(records: list[dict]) -> dict:
+    """Build the `/graph/hop` record of the first provider, which every path points to."""
+    provider = records[0]["r"][4]
+    in_ = [
+        [record["r"][2], "ADMINISTERED_BY", provider]
+        for record in records
+        if record["r"][4]["name"] == provider["name"]
+    ]
+    return {"node": provider, "out": [], "in": in_}
+
+
+def naive_records(data: list[dict]) -> GraphDataDict:
+    """The previous extract_graph_data: nodes deduped by a set, links appended per record."""
+    graph = extract_graph_data(data)
+    links = []
+    for record in data:
+        chain = record["r"]
+        patient = chain[0]["pid"]
+        vaccination = f"{chain[2]['pid']}_{chain[2]['name']}_{chain[2]['date']}"
+        provider = f"{chain[4]['type']}_{chain[4]['name']}"
+        links.append({"source": patient, "target": vaccination, "type": "RECEIVED"})
+        links.append({"source": vaccination, "target": provider, "type": "ADMINISTERED_BY"})
+    return {"nodes": graph["nodes"], "links": links, "root": graph["root"]}
+
+
+def naive_hop(record: dict) -> GraphDataDict:
+    """The previous /graph/hop: every neighbour and link appended as it is read."""
+    node = map_node(record["node"])
+    graph: GraphDataDict = {"nodes": [node], "links": [], "root": node}
+    for link in record["in"]:
+        source = map_node(link[0])
+        graph["nodes"].append(source)
+        graph["links"].append({"source": source["id"], "target": node["id"], "type": link[1]})
+    return graph
+
+
+def deduped_hop(record: dict) -> GraphDataDict:
+    graph = GraphBuilder()
+    node = map_node(record["node"])
+    graph.set_root(node)
+    for link in record["in"]:
+        source = graph.add_node(map_node(link[0]))
+        graph.add_link(source, node["id"], link[1])
+    return graph.build()
+
+
+def report(name: str, naive, deduped, data):
+    before = naive(data)
+    after = deduped(data)
+    before_size = len(graph_response(before).body)
+    after_size = len(graph_response(after).body)
+    print(
+        f"{name:>18} {len(before['nodes']):>8} {len(after['nodes']):>8} "
+        f"{len(before['links']):>8} {len(after['links']):>8} "
+        f"{before_size / 1024:>10.1f} {after_size / 1024:>10.1f} "
+        f"{1 - after_size / before_size:>6.0%}"
+    )
+
+
+def main(sizes: list[int], duplicates: float):
+    print(
+        f"{'case':>18} {'nodes':>8} {'deduped':>8} {'links':>8} {'deduped':>8} "
+        f"{'before KB':>10} {'after KB':>10} {'saved':>6}"
+    )
+    for size in sizes:
+        records = make_records(size, duplicates)
+        report(f"records {size}", naive_records, extract_graph_data, records)
+        report(f"hop {size}", naive_hop, deduped_hop, make_hop(records))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--duplicates", type=float, default=0.3, help="fraction of duplicated vaccinations")
+    args = parser.parse_args()
+    main(args.sizes, args.duplicates)
@@ -0,0 +1,112 @@
+"""
+Compare the Pydantic graph response path with the lean dict + orjson path.
+
+The Pydantic path reproduces what the graph endpoints used to do: validate every node
+into a model while extracting the graph, then let FastAPI dump, re-validate and
+JSON-encode the whole `GraphData` response. The lean path is `extract_graph_data`
+followed by `graph_response`.
+
+Usage (from the backend directory, no database needed):
+    python -m benchmarks.graph_serialization --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import time
+from pydantic import TypeAdapter
+from app.core.graph import extract_graph_data, graph_response
+from app.schemas import (
+    GraphData,
+    GraphNode,
+    GraphLink,
+    GraphPatient,
+    GraphVaccination,
+    GraphHealthcareProvider,
+)
+
+
+def make_records(count: int) -> list[dict]:
+    """Build `count` Patient-RECEIVED-Vaccination-ADMINISTERED_BY-Provider path records."""
+    records = []
+    for i in range(count):
+        pid = str(100000000000000 + i // 2)
+        patient = {
+            "pid": pid, "wallet": None, "sex": "nu", "dob": "2017-02-14", "ethnic": "Kinh",
+            "reg_province": "Vĩnh Phúc", "reg_district": "Bình Xuyên", "reg_commune": "Bá Hiến",
+        }
+        vaccination = {"pid": pid, "name": f"Vaccine {i % 2}", "date": "2017-06-11", "type": "TCCD"}
+        provider = {"name": f"TYT {i % (count // 10 + 1)}", "type": "TCMR", "wallet": None}
+        records.append(
+            {"r": [patient, "RECEIVED", vaccination, "ADMINISTERED_BY", provider]}
+        )
+    return records
+
+
+def extract_graph_models(data: list[dict]) -> GraphData:
+    """The previous implementation of extract_graph_data, validating every node."""
+    graph_data = GraphData(nodes=[], links=[], root=None)
+    unique_ids = set()
+    for record in data:
+        chain = record.get("r")
+        patient = GraphPatient.model_validate(chain[0])
+        vaccination = GraphVaccination.model_validate(chain[2])
+        provider = GraphHealthcareProvider.model_validate(chain[4])
+        patient_id = patient.pid
+        vaccination_id = f"{vaccination.pid}_{vaccination.name}_{vaccination.date}"
+        provider_id = f"{provider.type}_{provider.name}"
+        for node in [
+            GraphNode(id=patient_id, type="Patient", data=patient),
+            GraphNode(id=vaccination_id, type="Vaccination", data=vaccination),
+            GraphNode(id=provider_id, type="HealthcareProvider", data=provider),
+        ]:
+            if node.id not in unique_ids:
+                graph_data.nodes.append(node)
+                unique_ids.add(node.id)
+        graph_data.links.extend(
+            [
+                GraphLink(source=patient_id, target=vaccination_id, type="RECEIVED"),
+                GraphLink(source=vaccination_id, target=provider_id, type="ADMINISTERED_BY"),
+            ]
+        )
+    return graph_data
+
+
+adapter = TypeAdapter(GraphData)
+
+
+def pydantic_path(data: list[dict]) -> bytes:
+    # FastAPI dumps the returned model, validates it against the response model and encodes it
+    content = extract_graph_models(data).model_dump()
+    validated = adapter.validate_python(content)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def lean_path(data: list[dict]) -> bytes:
+    return graph_response(extract_graph_data(data)).body
+
+
+def measure(function, data: list[dict], repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = function(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def main(sizes: list[int], repeat: int):
+    print(f"{'records':>8} {'pydantic (ms)':>14} {'lean (ms)':>10} {'speedup':>8}")
+    for size in sizes:
+        data = make_records(size)
+        slow, slow_body = measure(pydantic_path, data, repeat)
+        fast, fast_body = measure(lean_path, data, repeat)
+        assert json.loads(slow_body) == json.loads(fast_body), "responses differ"
+        print(f"{size:>8} {slow:>14.1f} {fast:>10.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,133 @@
+"""
+Measure requests/s through an authenticated no-op endpoint, before and after the token cache.
+
+Builds a FastAPI app with one endpoint per `secure_endpoint` version: the previous one
+(decoding and validating the token on every request, printing every failure) and the
+current one (verification cached by token digest). Each is called in process through
+httpx's ASGI transport, with one valid bearer token reused like a graph page does, and
+with a rejected token retried. The PyJWT backend is measured too when installed.
+
+Usage (from the backend directory, no services needed):
+    python -m benchmarks.jwt_verification --requests 5000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import time
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.api.dependencies import bearer_scheme, secure_endpoint
+from app.auth import jwt as auth_jwt
+from app.auth.jwt import create_jwt_token
+from app.core.settings import settings
+from app.schemas import AuthDetails
+
+
+async def previous_secure_endpoint(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> AuthDetails:
+    """The dependency before the cache: decode, validate and check on every request."""
+    try:
+        payload = AuthDetails.model_validate(
+            jwt.decode(
+                credentials.credentials, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
+            )
+        )
+        if payload.contract != settings.contract_address:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return payload
+    except Exception as e:
+        print("Failed to validate token:", e)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+app = FastAPI()
+
+
+@app.get("/previous")
+async def previous(payload: AuthDetails = Depends(previous_secure_endpoint)) -> bool:
+    return True
+
+
+@app.get("/current")
+async def current(payload: AuthDetails = Depends(secure_endpoint)) -> bool:
+    return True
+
+
+async def run(
+    client: httpx.AsyncClient, path: str, dependency, token: str, requests: int
+) -> tuple[int, float, float]:
+    """Return the last status, requests/s through the app and calls/s of the dependency alone."""
+    headers = {"Authorization": f"Bearer {token}"}
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    # Printed failures are kept off the terminal but still paid for
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path, headers=headers)
+        through_app = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            try:
+                await dependency(credentials)
+            except HTTPException:
+                pass
+        alone = time.perf_counter() - start
+    return response.status_code, requests / through_app, requests / alone
+
+
+def report(name: str, token: str, code: int, requests_per_second: float, calls_per_second: float):
+    print(f"{name:>16} {token:>8} {code:>7} {requests_per_second:>11,.0f} {calls_per_second:>13,.0f}")
+
+
+async def main(requests: int):
+    valid = create_jwt_token("0x4ca32d107c8BF5481aA8EE9C0d287F7F5aDe62EE")
+    invalid = valid[:-4] + ("AAAA" if not valid.endswith("AAAA") else "BBBB")
+
+    cache_size = settings.jwt_cache_size
+    backends = ["jose"]
+    if importlib.util.find_spec("jwt") is not None:
+        backends.append("pyjwt")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        print(f"{'dependency':>16} {'token':>8} {'status':>7} {'requests/s':>11} {'dependency/s':>13}")
+        for token_name, token in (("valid", valid), ("invalid", invalid)):
+            report(
+                "previous", token_name,
+                *await run(client, "/previous", previous_secure_endpoint, token, requests),
+            )
+
+            for backend in backends:
+                settings.jwt_backend = backend
+                auth_jwt._verified.clear()
+                report(
+                    f"cached, {backend}", token_name,
+                    *await run(client, "/current", secure_endpoint, token, requests),
+                )
+
+                # Every request misses the cache: the cost of the decoder itself
+                settings.jwt_cache_size = 0
+                auth_jwt._verified.clear()
+                report(
+                    f"uncached, {backend}", token_name,
+                    *await run(client, "/current", secure_endpoint, token, requests),
+                )
+                settings.jwt_cache_size = cache_size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
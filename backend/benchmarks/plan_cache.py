@@ -0,0 +1,135 @@
+"""
+Compare inline-literal Cypher against the parameterized query catalog.
+
+Neo4j caches execution plans by query text, so every distinct literal forces a
+re-plan while a parameterized query is planned once. This benchmark replays the
+same lookups in both styles against a local Neo4j (settings.neo4j_uri) and reports
+the latency of each style, and the plan-cache hit rate Neo4j itself recorded.
+
+The hit rate is read from the server's query collection (`db.stats.collect('QUERIES')`,
+which needs an admin user): Neo4j Community exposes no plan-cache hit/miss counters,
+but the collection records the compile time of every invocation. A cache hit skips
+planning, so its compile phase is only the cache lookup; invocations compiled in less
+than `--hit-threshold` microseconds are counted as hits.
+
+Usage (from the backend directory, with a local Neo4j running):
+    python -m benchmarks.plan_cache --runs 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Optional
+from app.core import queries
+from app.core.graph import create_driver
+
+
+def inline(template: str, **parameters) -> str:
+    """Inline the parameters as literals, the way the endpoints used to build queries."""
+    for key, value in parameters.items():
+        template = template.replace(f"${key}", f"'{value}'")
+    return template
+
+
+async def run(session, query: str, parameters: dict) -> tuple[float, float]:
+    start = time.perf_counter()
+    result = await session.run(query, parameters)
+    await result.data()
+    summary = await result.consume()
+    return (time.perf_counter() - start) * 1000, summary.result_available_after
+
+
+async def call(session, query: str) -> list[dict]:
+    result = await session.run(query)
+    return await result.data()
+
+
+async def start_collection(session) -> bool:
+    """Restart the server's query collection, or return False if it is unavailable."""
+    try:
+        await call(session, "CALL db.stats.stop('QUERIES')")
+        await call(session, "CALL db.stats.clear('QUERIES')")
+        await call(session, "CALL db.stats.collect('QUERIES')")
+        return True
+    except Exception as e:
+        print("Query collection unavailable, no hit rate reported:", e)
+        return False
+
+
+async def collected_compile_times(session) -> list[int]:
+    """Stop the query collection and return the compile time (µs) of each invocation."""
+    await call(session, "CALL db.stats.stop('QUERIES')")
+    rows = await call(session, "CALL db.stats.retrieve('QUERIES') YIELD data RETURN data")
+    return [
+        invocation["elapsedCompileTimeInUs"]
+        for row in rows
+        for query in row["data"].get("queries", [])
+        for invocation in query.get("invocations", [])
+        if "elapsedCompileTimeInUs" in invocation
+    ]
+
+
+def report(
+    name: str,
+    texts: list[str],
+    timings: list[tuple[float, float]],
+    compile_times: Optional[list[int]],
+    hit_threshold: int,
+):
+    wall = [t[0] for t in timings]
+    server = [t[1] for t in timings]
+    print(f"{name}:")
+    print(f"  distinct query texts: {len(set(texts))}")
+    if compile_times:
+        hits = sum(compile_time < hit_threshold for compile_time in compile_times)
+        print(
+            f"  plan cache hit rate : {hits / len(compile_times):.1%} "
+            f"of {len(compile_times)} collected invocations"
+        )
+        print(
+            f"  compile time (µs)   : p50={statistics.median(compile_times):.0f} "
+            f"mean={statistics.mean(compile_times):.0f}"
+        )
+    print(f"  wall latency (ms)   : p50={statistics.median(wall):.2f} mean={statistics.mean(wall):.2f}")
+    print(f"  server time (ms)    : p50={statistics.median(server):.2f} mean={statistics.mean(server):.2f}")
+
+
+async def main(runs: int, hit_threshold: int):
+    driver = create_driver()
+    async with driver:
+        async with driver.session() as session:
+            result = await session.run(
+                "MATCH (p:Patient) RETURN p.pid AS pid LIMIT $limit", limit=runs
+            )
+            pids = [record["pid"] for record in await result.data()]
+        if not pids:
+            print("No patients found, import some data first.")
+            return
+
+        lookups = [{"pid": pids[i % len(pids)]} for i in range(runs)]
+        styles = {
+            "Inline literals": lambda parameters: (inline(queries.HOP_PATIENT, **parameters), {}),
+            "Parameterized": lambda parameters: (queries.HOP_PATIENT, parameters),
+        }
+
+        async with driver.session() as session:
+            for name, style in styles.items():
+                collecting = await start_collection(session)
+                texts, timings = [], []
+                for parameters in lookups:
+                    text, query_parameters = style(parameters)
+                    texts.append(text)
+                    timings.append(await run(session, text, query_parameters))
+                compile_times = await collected_compile_times(session) if collecting else None
+                report(name, texts, timings, compile_times, hit_threshold)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument(
+        "--hit-threshold", type=int, default=1000, help="µs below which a compile is a cache hit"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.hit_threshold))
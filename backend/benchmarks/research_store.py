@@ -0,0 +1,98 @@
+"""
+Compare research queries on the partitioned store against loading the whole dataset.
+
+Each query runs cold in a fresh process, once through app.analytics.store (memory-mapped,
+pushed-down filters, projected columns) and once the way data/count.py and the notebooks
+do it (read the whole file with pandas, then filter and group). Reports the time and the
+peak resident memory of each process.
+
+The store is written by data/partition_dataset.py from the same file:
+    cd ../data && python partition_dataset.py data/cleaned_data.csv --output data/partitioned
+
+Usage (from the backend directory):
+    python -m benchmarks.research_store --source ../data/data/cleaned_data.csv
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from app.core.settings import settings
+
+
+QUERIES = {
+    "count all": ([], {}, None, None),
+    "province, 2017-2018": ([], {"province_reg": ["Hà Nội"]}, 2017, 2018),
+    "by vaccine and year": (["vacname", "year"], {}, None, None),
+    "by sex, one vaccine": (["sex"], {"vacname": ["Quinvaxem"]}, None, None),
+}
+
+
+def run_store(path: str, group_by, filters, year_from, year_to) -> int:
+    from app.analytics.store import open_store, filter_expression, count_records
+
+    expression = filter_expression(filters, year_from, year_to)
+    return len(count_records(open_store(path), group_by, expression))
+
+
+def run_pandas(path: str, group_by, filters, year_from, year_to) -> int:
+    import pandas as pd
+
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    df["year"] = df["vacdate"].astype(str).str[:4].astype(int)
+    for column, values in filters.items():
+        df = df[df[column].isin(values)]
+    if year_from is not None:
+        df = df[df["year"] >= year_from]
+    if year_to is not None:
+        df = df[df["year"] <= year_to]
+    return len(df.groupby(group_by).size()) if group_by else 1
+
+
+def peak_memory() -> str:
+    """Return the peak resident memory of this process in MB, where the platform reports it."""
+    # The resource module is Unix-only
+    if sys.platform == "win32":
+        return "n/a"
+    import resource
+
+    # ru_maxrss is in KB on Linux
+    return f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}"
+
+
+def measure(function, path: str, query: tuple, results):
+    start = time.perf_counter()
+    groups = function(path, *query)
+    elapsed = time.perf_counter() - start
+    results.put((elapsed, peak_memory(), groups))
+
+
+def cold(function, path: str, query: tuple) -> tuple:
+    """Run `function` in a fresh process, returning its time, peak RSS in MB and groups."""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(function, path, query, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main(store: str, source: str):
+    print(f"{'query':>24} | {'store ms':>9} {'peak MB':>8} | {'pandas ms':>9} {'peak MB':>8}")
+    for name, query in QUERIES.items():
+        store_ms, store_mb, store_groups = cold(run_store, store, query)
+        pandas_ms, pandas_mb, pandas_groups = cold(run_pandas, source, query)
+        assert store_groups == pandas_groups, f"{name}: {store_groups} != {pandas_groups} groups"
+        print(
+            f"{name:>24} | {store_ms * 1000:>9.1f} {store_mb:>8} | "
+            f"{pandas_ms * 1000:>9.1f} {pandas_mb:>8}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--store", default=settings.analytics_store_path)
+    parser.add_argument("--source", default="../data/data/cleaned_data.csv", help="CSV or parquet")
+    args = parser.parse_args()
+
+    main(args.store, args.source)
@@ -0,0 +1,108 @@
+"""
+Measure /graph/search latency per kind of query.
+
+Samples PIDs, wallets, transaction hashes, vaccine and provider names from a local
+Neo4j (settings.neo4j_uri), then times the query picked by `search_statement` for
+exact values and for prefixes of them. Exact wallets and hashes are also timed with
+the previous three-way UNION equality query, which could not match prefixes at all.
+
+Usage (from the backend directory, with a local Neo4j running and the schema migrated):
+    python -m benchmarks.search_latency --runs 200 --limit 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from app.core.graph import create_driver
+from app.core.search import search_statement
+
+
+# The previous search query, kept for comparison
+EQUALITY_UNION = """
+    CALL () {
+        MATCH r1=(n:Patient {wallet: $query})-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(:HealthcareProvider)
+        RETURN r1 AS r, n
+    }
+    RETURN r, n
+    UNION
+    CALL () {
+        MATCH r2=(:Patient)-[:RECEIVED]->(n:Vaccination {tx_hash: $query})-[:ADMINISTERED_BY]->(:HealthcareProvider)
+        RETURN r2 AS r, n
+    }
+    RETURN r, n
+    UNION
+    CALL () {
+        MATCH r3=(:Patient)-[:RECEIVED]->(:Vaccination)-[:ADMINISTERED_BY]->(n:HealthcareProvider {wallet: $query})
+        RETURN r3 AS r, n
+    }
+    RETURN r, n
+"""
+
+SAMPLES = {
+    "pid": "MATCH (p:Patient) RETURN p.pid AS value LIMIT $limit",
+    "wallet": "MATCH (p:Patient) WHERE p.wallet IS NOT NULL RETURN p.wallet AS value LIMIT $limit",
+    "tx_hash": "MATCH (v:Vaccination) WHERE v.tx_hash IS NOT NULL RETURN v.tx_hash AS value LIMIT $limit",
+    "vaccine": "MATCH (v:Vaccination) RETURN DISTINCT v.name AS value LIMIT $limit",
+    "provider": "MATCH (h:HealthcareProvider) RETURN h.name AS value LIMIT $limit",
+}
+
+
+async def sample(session, query: str, count: int) -> list[str]:
+    result = await session.run(query, limit=count)
+    return [record["value"] for record in await result.data() if record["value"]]
+
+
+async def run(session, query: str, parameters: dict) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = await session.run(query, parameters)
+    data = await result.data()
+    return (time.perf_counter() - start) * 1000, len(data)
+
+
+def report(name: str, timings: list[tuple[float, int]]):
+    latencies = sorted(t[0] for t in timings)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    rows = statistics.mean(t[1] for t in timings)
+    print(
+        f"{name:>24} {len(latencies):>6} {statistics.median(latencies):>9.2f} "
+        f"{p95:>9.2f} {rows:>9.1f}"
+    )
+
+
+async def main(runs: int, limit: int):
+    driver = create_driver()
+    async with driver:
+        async with driver.session() as session:
+            values = {kind: await sample(session, query, runs) for kind, query in SAMPLES.items()}
+        if not values["pid"]:
+            print("No patients found, import some data first.")
+            return
+
+        print(f"{'query':>24} {'runs':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'rows':>9}")
+        async with driver.session() as session:
+            for kind, samples in values.items():
+                if not samples:
+                    continue
+                cases = {f"{kind} exact": samples, f"{kind} prefix": [s[: max(3, len(s) // 2)] for s in samples]}
+                for name, texts in cases.items():
+                    timings = []
+                    for i in range(runs):
+                        query, parameters = search_statement(texts[i % len(texts)], limit)
+                        timings.append(await run(session, query, parameters))
+                    report(name, timings)
+
+                if kind in ("wallet", "tx_hash"):
+                    timings = [
+                        await run(session, EQUALITY_UNION, {"query": samples[i % len(samples)]})
+                        for i in range(runs)
+                    ]
+                    report(f"{kind} exact (old)", timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10, help="ranked hits per search")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.limit))
@@ -0,0 +1,94 @@
+"""
+Measure signatures/s of signature verification: uncached, memoized and batched.
+
+Signs a set of messages with generated accounts, half as `/auth/token` login text and half
+as EIP-712 storeHash requests like the frontend sends, then verifies them one at a time
+with an empty recovery cache, again with the cache warm (a login storm of retries), and
+through `verify_signatures` with an empty cache for each worker count.
+
+Usage (from the backend directory, no Ethereum node needed):
+    python -m benchmarks.signature_verification --signatures 2000 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from eth_account import Account
+from app.core.settings import settings
+from app.schemas.eth import EthMessage
+from app.blockchain import signature
+
+
+def typed_message(provider: str, patient: str, data_hash: str) -> EthMessage:
+    return EthMessage(
+        domain={"name": "HBVTracker", "version": "1", "chainId": 1337},
+        primaryType="StoreHash",
+        types={
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+            ],
+            "StoreHash": [
+                {"name": "provider", "type": "address"},
+                {"name": "patient", "type": "address"},
+                {"name": "dataHash", "type": "bytes32"},
+            ],
+        },
+        message={"provider": provider, "patient": patient, "dataHash": data_hash},
+    )
+
+
+def signed_items(count: int) -> list[tuple[EthMessage | str, str, str]]:
+    items = []
+    for i in range(count):
+        account = Account.create()
+        if i % 2:
+            message = f"Sign in to HBV Tracker\nNonce: {os.urandom(8).hex()}"
+        else:
+            patient = Account.create().address
+            message = typed_message(account.address, patient, "0x" + os.urandom(32).hex())
+        items.append((message, signature.sign_message(message, account.key), account.address))
+    return items
+
+
+def report(name: str, count: int, elapsed: float):
+    print(f"{name:>22} {count:>8} {elapsed:>9.3f} {count / elapsed:>13,.0f}")
+
+
+def single(items: list) -> float:
+    start = time.perf_counter()
+    for message, sig, address in items:
+        assert signature.verify_signature(message, sig, address)
+    return time.perf_counter() - start
+
+
+async def main(count: int, workers: list[int]):
+    settings.signature_cache_size = count
+    items = signed_items(count)
+
+    print(f"{'verification':>22} {'count':>8} {'seconds':>9} {'signatures/s':>13}")
+    signature._recovered.clear()
+    report("single, uncached", count, single(items))
+    report("single, cached", count, single(items))
+
+    for n in workers:
+        settings.signature_workers = n
+        signature._recovered.clear()
+        # Start the pool outside the measurement, as a running server would have
+        await signature.verify_signatures(items[:n])
+        signature._recovered.clear()
+
+        start = time.perf_counter()
+        assert all(await signature.verify_signatures(items))
+        report(f"batch, {n} workers", count, time.perf_counter() - start)
+        signature.close_signature_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signatures", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(main(args.signatures, args.workers))
@@ -0,0 +1,140 @@
+"""
+Measure concurrent storeHash submissions from one provider, per-request nonce versus the pipeline.
+
+A local JSON-RPC stand-in plays a node whose mempool rejects a second transaction with a
+nonce it already accepted, and never mines, as when submissions outpace blocks. The same
+burst of concurrent stores is sent once the way `store_hash` used to (reading the
+transaction count for every request, fixed gas) and once through
+`app.blockchain.transactions.submit_transaction` (local nonces, cached gas estimates).
+Reports the accepted and rejected submissions, RPC calls and submissions/s.
+
+Usage (from the backend directory, no Ethereum node needed):
+    python -m benchmarks.tx_pipeline --requests 100 --delays 0 0.02 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from aiohttp import web
+
+HOST, PORT = "127.0.0.1", 8598
+os.environ["BLOCKCHAIN_RPC"] = f"http://{HOST}:{PORT}"
+
+from app.core.blockchain import web3, contract  # noqa: E402 (after pointing at the stand-in)
+from app.blockchain import transactions  # noqa: E402
+
+
+PROVIDER = "0x4ca32d107c8BF5481aA8EE9C0d287F7F5aDe62EE"
+PATIENT = "0x8ba1f109551bD432803012645Ac136ddd64DBA72"
+
+# The latest block, which web3 reads to fill in transaction defaults
+BLOCK = {
+    "number": "0x1", "hash": "0x" + "11" * 32, "parentHash": "0x" + "00" * 32,
+    "timestamp": "0x0", "gasLimit": "0x1c9c380", "gasUsed": "0x0", "baseFeePerGas": "0x1",
+    "transactions": [],
+}
+
+rpc_delay = 0.0
+rpc_calls = Counter()
+accepted: dict[str, set[int]] = {}
+
+
+async def handle_rpc(request: web.Request) -> web.Response:
+    """Answer JSON-RPC requests like a node that never mines, after `rpc_delay` seconds."""
+    body = await request.json()
+    await asyncio.sleep(rpc_delay)
+    method, params = body["method"], body.get("params", [])
+    rpc_calls[method] += 1
+
+    error = None
+    result = None
+    if method == "eth_getTransactionCount":
+        # Only the pending count includes the accepted transactions, none are mined
+        nonces = accepted.get(params[0].lower(), set())
+        result = hex(len(nonces)) if params[1] == "pending" else "0x0"
+    elif method == "eth_sendTransaction":
+        nonces = accepted.setdefault(params[0]["from"].lower(), set())
+        nonce = int(params[0]["nonce"], 16)
+        if nonce in nonces:
+            error = {"code": -32000, "message": "nonce too low"}
+        else:
+            nonces.add(nonce)
+            result = "0x" + os.urandom(32).hex()
+    else:
+        result = {
+            "eth_estimateGas": "0xc350",
+            "eth_gasPrice": hex(5 * 10**9),
+            "eth_chainId": "0x539",
+            "eth_getBlockByNumber": BLOCK,
+        }.get(method)
+
+    response = {"jsonrpc": "2.0", "id": body["id"]}
+    response.update({"error": error} if error else {"result": result})
+    return web.json_response(response)
+
+
+def start_stand_in():
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_post("/", handle_rpc)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, HOST, PORT).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+async def previous_store(index: int):
+    """The submission `store_hash` used to make."""
+    return await contract.functions.storeHash(PATIENT, os.urandom(32)).transact(
+        {
+            "from": PROVIDER,
+            "to": contract.address,
+            "nonce": await web3.eth.get_transaction_count(PROVIDER),
+            "gas": 200000,
+            "gasPrice": web3.to_wei("5", "gwei"),
+        }
+    )
+
+
+async def pipeline_store(index: int):
+    return await transactions.submit_transaction(
+        contract.functions.storeHash(PATIENT, os.urandom(32)), PROVIDER
+    )
+
+
+async def run(store, requests: int) -> tuple[int, int, int, float]:
+    accepted.clear()
+    rpc_calls.clear()
+    transactions.reset_nonce(PROVIDER)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(store(i) for i in range(requests)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    rejected = sum(isinstance(result, Exception) for result in results)
+    return requests - rejected, rejected, sum(rpc_calls.values()), elapsed
+
+
+async def main(requests: int, delays: list[float]):
+    global rpc_delay
+    await web3.eth.chain_id  # open the pooled session and cache the chain ID outside the measurement
+    print(f"{'RPC delay':>10} {'submission':>12} {'accepted':>9} {'rejected':>9} {'RPC calls':>10} {'stores/s':>9}")
+    for delay in delays:
+        rpc_delay = delay
+        for name, store in (("per request", previous_store), ("pipeline", pipeline_store)):
+            ok, rejected, calls, elapsed = await run(store, requests)
+            print(
+                f"{delay * 1000:>8.0f}ms {name:>12} {ok:>9} {rejected:>9} {calls:>10} "
+                f"{ok / elapsed:>9.1f}"
+            )
+    await web3.provider.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--delays", type=float, nargs="+", default=[0, 0.02, 0.1])
+    args = parser.parse_args()
+    start_stand_in()
+    asyncio.run(main(args.requests, args.delays))
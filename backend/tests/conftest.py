@@ -0,0 +1,10 @@
+import os
+
+# Required settings without defaults, so app modules import without a config/.env.dev
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_ACCESS_EXPIRES_IN", "1d")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("REDIS_PORT", "6379")
+os.environ.setdefault("REDIS_DB", "0")
+os.environ.setdefault("CONTRACT_ADDRESS", "0x1234567890AbcdEF1234567890aBcdef12345678")
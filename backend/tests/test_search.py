@@ -0,0 +1,18 @@
+from app.core import queries
+from app.core.search import fulltext_query, search_statement
+
+
+def test_hyphenated_value_is_split_into_prefix_terms():
+    assert fulltext_query("HepB-1") == "hepb* AND 1*"
+    assert fulltext_query("anti-HBs  positive") == "anti* AND hbs* AND positive*"
+
+
+def test_syntax_only_text_is_not_searchable():
+    assert fulltext_query('-- "*" ') is None
+    assert search_statement(" ~ ", 10) is None
+
+
+def test_hyphenated_value_goes_through_the_fulltext_index():
+    query, parameters = search_statement("HepB-1", 10)
+    assert query == queries.SEARCH_FULLTEXT
+    assert parameters["query"] == "hepb* AND 1*"
@@ -0,0 +1,44 @@
+import asyncio
+from eth_account import Account
+from app.blockchain import signature
+from app.schemas.eth import EthMessage
+
+
+def uint256_message(amount: int) -> EthMessage:
+    return EthMessage(
+        domain={"name": "HBVTracker", "version": "1", "chainId": 1337},
+        primaryType="Record",
+        types={
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+            ],
+            "Record": [{"name": "amount", "type": "uint256"}],
+        },
+        message={"amount": amount},
+    )
+
+
+def test_verify_typed_data_with_uint256_above_64_bits():
+    account = Account.create()
+    message = uint256_message(2**64 + 1)
+    sig = signature.sign_message(message, account.key)
+
+    assert signature.verify_signature(message, sig, account.address)
+    # Answered from the cache the second time
+    assert signature.verify_signature(message, sig, account.address)
+    assert not signature.verify_signature(message, sig, Account.create().address)
+
+
+def test_verify_signatures_with_uint256_above_64_bits():
+    account = Account.create()
+    message = uint256_message(2**255)
+    sig = signature.sign_message(message, account.key)
+
+    try:
+        assert asyncio.run(
+            signature.verify_signatures([(message, sig, account.address), (message, "0x12", account.address)])
+        ) == [True, None]
+    finally:
+        signature.close_signature_pool()
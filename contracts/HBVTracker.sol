@@ -11,8 +11,11 @@ contract HBVTracker {
     mapping(address => VaccinationRecord[]) private vaccinationRecords;
     mapping(address => bool) public authorizedHealthcareProviders;
     mapping(address => bool) public authorizedResearchers;
+    // Merkle root of a batch of records => timestamp of the block that anchored it
+    mapping(bytes32 => uint256) public anchoredRoots;
 
     event VaccinationStored(address indexed patient, bytes32 dataHash);
+    event BatchAnchored(address indexed provider, bytes32 indexed root, uint256 count);
     event ResearcherAuthorized(address indexed researcher);
     event HealthcareProviderAuthorized(address indexed provider);
 
@@ -38,6 +41,32 @@ contract HBVTracker {
         emit VaccinationStored(patient, dataHash);
     }
 
+    // Anchor a batch of vaccination hashes with one Merkle root, instead of one storeHash each.
+    // Leaves are keccak256(bytes.concat(keccak256(abi.encode(patient, dataHash)))) and
+    // pairs are hashed in sorted order, so a proof is just the list of sibling hashes.
+    function storeRoot(bytes32 root, uint256 count) public {
+        require(
+            authorizedHealthcareProviders[msg.sender],
+            "Not an authorized healthcare provider"
+        );
+        require(anchoredRoots[root] == 0, "Root already anchored");
+
+        anchoredRoots[root] = block.timestamp;
+        emit BatchAnchored(msg.sender, root, count);
+    }
+
+    // Return the timestamp at which a record was anchored, or 0 if the proof does not lead
+    // to an anchored root
+    function verifyRecord(address patient, bytes32 dataHash, bytes32[] calldata proof) public view returns (uint256) {
+        bytes32 node = keccak256(bytes.concat(keccak256(abi.encode(patient, dataHash))));
+        for (uint256 i = 0; i < proof.length; i++) {
+            node = node < proof[i]
+                ? keccak256(abi.encodePacked(node, proof[i]))
+                : keccak256(abi.encodePacked(proof[i], node));
+        }
+        return anchoredRoots[node];
+    }
+
     // Retrieve all vaccination records for a patient
     function getHashes(address patient) public view returns (bytes32[] memory, uint256[] memory) {
         require(vaccinationRecords[patient].length > 0, "No vaccination records found");
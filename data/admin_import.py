@@ -0,0 +1,122 @@
+import argparse
+import time
+from pathlib import Path
+import pandas as pd
+
+# Offline full rebuild: turns the cleaned dataset into the node and relationship CSVs
+# that `neo4j-admin database import full` loads directly into an empty database.
+#
+#   python admin_import.py data/cleaned_data.csv --output data/admin
+#   python admin_import.py data/chunked_data_*.csv --output data/admin
+#
+# IDs match map_node in the backend, so the frontend sees the same node IDs:
+#   Patient -> pid, Vaccination -> pid_name_date, HealthcareProvider -> type_name
+
+COLUMNS = [
+    "pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type",
+    "province_reg", "district_reg", "commune_reg", "sex", "dob", "ethnic",
+]
+
+
+def read_dataset(paths: list[str]) -> pd.DataFrame:
+    frames = []
+    for path in paths:
+        if path.endswith(".parquet"):
+            frames.append(pd.read_parquet(path, columns=COLUMNS))
+        else:
+            frames.append(pd.read_csv(path, usecols=COLUMNS, dtype=str, engine="pyarrow"))
+    df = pd.concat(frames, ignore_index=True).fillna("-").astype(str)
+    # Dates are stored as YYYY-MM-DD, whatever time suffix the source has
+    df["vacdate"] = df["vacdate"].str[:10]
+    df["dob"] = df["dob"].str[:10]
+    return df
+
+
+def build_tables(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Build every node and relationship table with column-wise operations only."""
+    vaccination_id = df["pid"] + "_" + df["vacname"] + "_" + df["vacdate"]
+    provider_id = df["vacplace_type"] + "_" + df["vacplace"]
+
+    patients = df.drop_duplicates("pid")[
+        ["pid", "sex", "dob", "ethnic", "province_reg", "district_reg", "commune_reg"]
+    ].rename(
+        columns={
+            "pid": "pid:ID(Patient)",
+            "province_reg": "reg_province",
+            "district_reg": "reg_district",
+            "commune_reg": "reg_commune",
+        }
+    )
+
+    vaccinations = (
+        df.assign(id=vaccination_id, provider=provider_id)
+        .drop_duplicates("id")
+    )
+    providers = df.assign(id=provider_id).drop_duplicates("id")
+
+    return {
+        "patients": patients,
+        "vaccinations": vaccinations[["id", "pid", "vacname", "vacdate", "vactype"]].rename(
+            columns={"id": ":ID(Vaccination)", "vacname": "name", "vacdate": "date", "vactype": "type"}
+        ),
+        "providers": providers[["id", "vacplace", "vacplace_type"]].rename(
+            columns={"id": ":ID(HealthcareProvider)", "vacplace": "name", "vacplace_type": "type"}
+        ),
+        "received": pd.DataFrame(
+            {
+                ":START_ID(Patient)": vaccinations["pid"],
+                ":END_ID(Vaccination)": vaccinations["id"],
+            }
+        ),
+        "administered_by": pd.DataFrame(
+            {
+                ":START_ID(Vaccination)": vaccinations["id"],
+                ":END_ID(HealthcareProvider)": vaccinations["provider"],
+            }
+        ),
+    }
+
+
+def import_command(output: Path, database: str) -> str:
+    return " ".join(
+        [
+            f"neo4j-admin database import full {database}",
+            f"--nodes=Patient={output / 'patients.csv'}",
+            f"--nodes=Vaccination={output / 'vaccinations.csv'}",
+            f"--nodes=HealthcareProvider={output / 'providers.csv'}",
+            f"--relationships=RECEIVED={output / 'received.csv'}",
+            f"--relationships=ADMINISTERED_BY={output / 'administered_by.csv'}",
+            "--overwrite-destination",
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write neo4j-admin import CSVs for the HBV dataset.")
+    parser.add_argument("paths", nargs="+", help="cleaned CSV or parquet files")
+    parser.add_argument("--output", default="data/admin", help="output directory")
+    parser.add_argument("--database", default="neo4j", help="database name in the printed command")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    df = read_dataset(args.paths)
+    read_time = time.perf_counter()
+    tables = build_tables(df)
+    transform_time = time.perf_counter()
+    for name, table in tables.items():
+        table.to_csv(output / f"{name}.csv", index=False)
+    write_time = time.perf_counter()
+
+    for name, table in tables.items():
+        print(f"✅ {name}.csv: {len(table)} rows")
+    print(
+        f"Read {len(df)} rows in {read_time - start:.2f}s, "
+        f"transformed in {transform_time - read_time:.2f}s, "
+        f"wrote in {write_time - transform_time:.2f}s "
+        f"({len(df) / (write_time - start):,.0f} rows/s overall)"
+    )
+    print("Import into a stopped, empty database with:")
+    print(import_command(output, args.database))
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import pyarrow.parquet as pq
+from neo4j import GraphDatabase
+from import_graph import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, migrate_schema, build_aggregates
+
+# Streams the cleaned dataset into Neo4j in chunks, instead of LOAD CSV over HTTP.
+#
+#   python bulk_import.py data/cleaned_data.csv --batch-size 5000 --workers 4
+#
+# Nodes are deduplicated in memory, then written with one UNWIND transaction per batch
+# across parallel sessions. Progress is checkpointed after every chunk, so an interrupted
+# import resumes where it stopped when run again with the same arguments.
+
+COLUMNS = [
+    "pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type",
+    "province_reg", "district_reg", "commune_reg", "sex", "dob", "ethnic",
+]
+
+PROVIDER_QUERY = """
+UNWIND $rows AS row
+MERGE (h:HealthcareProvider {name: row.name, type: row.type})
+"""
+
+PATIENT_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Patient {pid: row.pid})
+SET p.sex = row.sex, p.dob = row.dob, p.ethnic = row.ethnic, p.reg_commune = row.reg_commune, p.reg_district = row.reg_district, p.reg_province = row.reg_province
+"""
+
+VACCINATION_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Patient {pid: row.pid})
+MATCH (h:HealthcareProvider {name: row.provider_name, type: row.provider_type})
+MERGE (v:Vaccination {pid: row.pid, name: row.name, date: row.date, type: row.type})
+MERGE (p)-[:RECEIVED]->(v)
+MERGE (v)-[:ADMINISTERED_BY]->(h)
+"""
+
+
+def read_chunks(path: str, chunk_size: int):
+    """Yield the dataset as DataFrames of `chunk_size` rows without loading it whole."""
+    if path.endswith(".parquet"):
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=COLUMNS):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=COLUMNS, dtype=str)
+
+
+def load_checkpoint(path: str) -> int:
+    if os.path.exists(path):
+        with open(path) as file:
+            return json.load(file)["rows"]
+    return 0
+
+
+def save_checkpoint(path: str, rows: int):
+    with open(path, "w") as file:
+        json.dump({"rows": rows}, file)
+
+
+def _unseen(df: pd.DataFrame, columns: list[str], seen: set) -> pd.DataFrame:
+    """Drop the rows whose key was already seen, and remember the keys of the others."""
+    df = df.drop_duplicates(columns)
+    keys = list(zip(*(df[column] for column in columns)))
+    mask = [key not in seen for key in keys]
+    seen.update(key for key, new in zip(keys, mask) if new)
+    return df[mask]
+
+
+class Deduplicator:
+    """Keeps the keys of every node already written, so each node is sent once."""
+
+    def __init__(self):
+        self.patients = set()
+        self.providers = set()
+        self.vaccinations = set()
+
+    def split(self, df: pd.DataFrame) -> tuple[list, list, list]:
+        df = df.fillna("-").astype(str)
+        # Dates are stored as YYYY-MM-DD, whatever time suffix the source has
+        df["vacdate"] = df["vacdate"].str[:10]
+        df["dob"] = df["dob"].str[:10]
+
+        providers = _unseen(df, ["vacplace", "vacplace_type"], self.providers)
+        patients = _unseen(df, ["pid"], self.patients)
+        vaccinations = _unseen(df, ["pid", "vacname", "vacdate", "vactype"], self.vaccinations)
+
+        providers = providers[["vacplace", "vacplace_type"]].rename(
+            columns={"vacplace": "name", "vacplace_type": "type"}
+        )
+        patients = patients[
+            ["pid", "sex", "dob", "ethnic", "commune_reg", "district_reg", "province_reg"]
+        ].rename(
+            columns={
+                "commune_reg": "reg_commune",
+                "district_reg": "reg_district",
+                "province_reg": "reg_province",
+            }
+        )
+        vaccinations = vaccinations[
+            ["pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type"]
+        ].rename(
+            columns={
+                "vacname": "name",
+                "vacdate": "date",
+                "vactype": "type",
+                "vacplace": "provider_name",
+                "vacplace_type": "provider_type",
+            }
+        )
+
+        return (
+            providers.to_dict("records"),
+            patients.to_dict("records"),
+            vaccinations.to_dict("records"),
+        )
+
+
+def write_batches(driver, executor: ThreadPoolExecutor, query: str, rows: list, batch_size: int):
+    """Write `rows` with one UNWIND transaction per batch, batches spread over the worker sessions."""
+
+    def write(batch):
+        with driver.session() as session:
+            # execute_write retries transient errors such as lock deadlocks between workers
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+
+    batches = [rows[i : i + batch_size] for i in range(0, len(rows), batch_size)]
+    list(executor.map(write, batches))
+
+
+def bulk_import(path: str, batch_size: int, chunk_size: int, workers: int, checkpoint: str):
+    driver = GraphDatabase.driver(
+        NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD), max_connection_pool_size=workers
+    )
+    deduplicator = Deduplicator()
+    done = load_checkpoint(checkpoint)
+    if done:
+        print(f"Resuming after {done} rows")
+
+    rows_read = 0
+    rows_imported = 0
+    start = time.perf_counter()
+    with driver, ThreadPoolExecutor(max_workers=workers) as executor:
+        for df in read_chunks(path, chunk_size):
+            rows_read += len(df)
+            if rows_read <= done:
+                continue
+            # Only part of this chunk may have been imported before the interruption
+            df = df.iloc[max(0, done - (rows_read - len(df))) :]
+
+            chunk_start = time.perf_counter()
+            providers, patients, vaccinations = deduplicator.split(df)
+            # Providers and patients must exist before the vaccinations link to them
+            write_batches(driver, executor, PROVIDER_QUERY, providers, batch_size)
+            write_batches(driver, executor, PATIENT_QUERY, patients, batch_size)
+            write_batches(driver, executor, VACCINATION_QUERY, vaccinations, batch_size)
+            save_checkpoint(checkpoint, rows_read)
+
+            rows_imported += len(df)
+            elapsed = time.perf_counter() - chunk_start
+            print(
+                f"✅ Rows {rows_read - len(df) + 1}-{rows_read}: "
+                f"{len(patients)} patients, {len(vaccinations)} vaccinations, {len(providers)} providers "
+                f"({len(df) / elapsed:,.0f} rows/s)"
+            )
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Imported {rows_imported} rows in {elapsed:.1f}s ({rows_imported / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the cleaned HBV dataset into Neo4j.")
+    parser.add_argument("path", nargs="?", default="data/cleaned_data.csv", help="CSV or parquet file")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per UNWIND transaction")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows read from the file at a time")
+    parser.add_argument("--workers", type=int, default=4, help="parallel Neo4j sessions")
+    parser.add_argument("--checkpoint", help="progress file (default: <path>.checkpoint.json)")
+    parser.add_argument("--skip-schema", action="store_true", help="do not create indexes first")
+    args = parser.parse_args()
+
+    if not args.skip_schema:
+        migrate_schema()
+    bulk_import(
+        args.path,
+        args.batch_size,
+        args.chunk_size,
+        args.workers,
+        args.checkpoint or str(Path(args.path).with_suffix(".checkpoint.json")),
+    )
+    # The UNWIND writes bypass the incremental aggregate updates of the API
+    build_aggregates()
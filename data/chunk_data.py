@@ -1,17 +1,27 @@
-import pandas as pd
+import argparse
+import time
+from clean import read_chunks, ShardWriter, report
 
-# Load the large CSV file
-input_file = "data/cleaned_data.csv"  # Change this to your actual file path
-chunk_size = 10_000  # Number of rows per chunk
+# Splits an already cleaned CSV into shards without loading it whole. `clean.py` writes
+# the same shards while cleaning, this is for re-sharding an existing file:
+#
+#   python chunk_data.py data/cleaned_data.csv --shard-size 10000
 
-# Read CSV in chunks
-df = pd.read_csv(input_file)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split the cleaned HBV dataset into shards.")
+    parser.add_argument("path", nargs="?", default="data/cleaned_data.csv")
+    parser.add_argument("--shards", default="data/chunked_data_{}.csv", help="shard file pattern")
+    parser.add_argument("--shard-size", type=int, default=10_000, help="rows per shard")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows read at a time")
+    args = parser.parse_args()
 
-# Split into chunks
-for i, chunk in enumerate(range(0, len(df), chunk_size)):
-    chunk_df = df.iloc[chunk : chunk + chunk_size]
-    output_file = f"data/chunked_data_{i+1}.csv"
-    chunk_df.to_csv(output_file, index=False)
-    print(f"Saved: {output_file}")
+    start = time.perf_counter()
+    rows = 0
+    shards = ShardWriter(args.shards, args.shard_size)
+    for chunk in read_chunks(args.path, args.chunk_size):
+        shards.write(chunk)
+        rows += len(chunk)
+    shards.close()
 
-print("✅ Chunked CSV file into smaller files!")
+    print("✅ Chunked CSV file into smaller files!")
+    report(rows, args.path, start)
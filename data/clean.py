@@ -1,20 +1,121 @@
+import argparse
+import os
+import sys
+import time
 import pandas as pd
 
-# Load CSV from GitHub (or change to local file path)
-url = "data/sampled_data.csv"
-df = pd.read_csv(url)
+# Cleans the sampled dataset and splits it into shards in one streaming pass:
+#
+#   python clean.py data/sampled_data.csv --output data/cleaned_data.csv --shard-size 10000
+#
+# The file is read `--chunk-size` rows at a time and both outputs are appended to as each
+# chunk is cleaned, so peak memory is bounded by the chunk size, not the file size.
+# Low-cardinality columns are read as categoricals: the fixes below then touch each
+# distinct value once per chunk instead of every row.
 
-# Fill missing 'vacplace' with "-"
-df["vacplace"] = df["vacplace"].fillna("-")
-df["district_reg"] = df["district_reg"].fillna("-")
+COLUMNS = [
+    "pid", "vacname", "vacdate", "vactype", "vacplace", "vacplace_type",
+    "province_reg", "district_reg", "commune_reg", "sex", "dob", "ethnic",
+]
+CATEGORICAL = ["vacname", "vactype", "vacplace_type", "province_reg", "district_reg", "sex", "ethnic"]
 
-# Replace missing or incorrect 'vacplace_type' with "Other"
-df["vacplace_type"] = df["vacplace_type"].replace(
-    ["Dia diem khac", None, "nan"], "Khác"
-)
 
-# Save cleaned data
-cleaned_file_path = "data/cleaned_data.csv"
-df.to_csv(cleaned_file_path, index=False)
+def read_chunks(path: str, chunk_size: int):
+    """Yield the CSV as DataFrames of `chunk_size` rows, keeping every value as written."""
+    dtype = {column: "category" if column in CATEGORICAL else str for column in COLUMNS}
+    yield from pd.read_csv(path, chunksize=chunk_size, usecols=COLUMNS, dtype=dtype)
 
-print(f"✅ Cleaned CSV saved as: {cleaned_file_path}")
+
+def replace_category(column: pd.Series, values: list, replacement: str) -> pd.Series:
+    """Replace missing values and `values` of a categorical column with `replacement`."""
+    if replacement not in column.cat.categories:
+        column = column.cat.add_categories(replacement)
+    return column.where(~(column.isna() | column.isin(values)), replacement)
+
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    # Fill missing 'vacplace' with "-"
+    df["vacplace"] = df["vacplace"].fillna("-")
+    df["district_reg"] = replace_category(df["district_reg"], [], "-")
+
+    # Replace missing or incorrect 'vacplace_type' with "Other"
+    df["vacplace_type"] = replace_category(df["vacplace_type"], ["Dia diem khac", "nan"], "Khác")
+    return df
+
+
+class ShardWriter:
+    """Append rows to numbered CSV shards of `shard_size` rows, e.g. data/chunked_data_1.csv."""
+
+    def __init__(self, pattern: str, shard_size: int):
+        self.pattern = pattern
+        self.shard_size = shard_size
+        self.shards = 0
+        self.rows_in_shard = shard_size  # the first write opens shard 1
+
+    def write(self, df: pd.DataFrame):
+        start = 0
+        while start < len(df):
+            if self.rows_in_shard == self.shard_size:
+                self.shards += 1
+                self.rows_in_shard = 0
+            rows = min(self.shard_size - self.rows_in_shard, len(df) - start)
+            df.iloc[start : start + rows].to_csv(
+                self.pattern.format(self.shards),
+                mode="w" if self.rows_in_shard == 0 else "a",
+                header=self.rows_in_shard == 0,
+                index=False,
+            )
+            self.rows_in_shard += rows
+            start += rows
+            if self.rows_in_shard == self.shard_size:
+                print(f"Saved: {self.pattern.format(self.shards)}")
+
+    def close(self):
+        if 0 < self.rows_in_shard < self.shard_size:
+            print(f"Saved: {self.pattern.format(self.shards)}")
+
+
+def peak_memory() -> str:
+    """Return the peak resident memory of this process, where the platform reports it."""
+    # The resource module is Unix-only
+    if sys.platform == "win32":
+        return "n/a"
+    import resource
+
+    # ru_maxrss is in KB on Linux
+    return f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB"
+
+
+def report(rows: int, path: str, start: float):
+    """Print the rows/s and MB/s read from `path`, and the peak resident memory."""
+    elapsed = time.perf_counter() - start
+    megabytes = os.path.getsize(path) / 1024**2
+    print(
+        f"{rows} rows in {elapsed:.1f}s: {rows / elapsed:,.0f} rows/s, "
+        f"{megabytes / elapsed:.1f} MB/s, peak memory {peak_memory()}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the sampled HBV dataset and split it into shards.")
+    parser.add_argument("path", nargs="?", default="data/sampled_data.csv")
+    parser.add_argument("--output", default="data/cleaned_data.csv", help="cleaned CSV")
+    parser.add_argument("--shards", default="data/chunked_data_{}.csv", help="shard file pattern")
+    parser.add_argument("--shard-size", type=int, default=10_000, help="rows per shard, 0 to skip")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows read at a time")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = 0
+    shards = ShardWriter(args.shards, args.shard_size) if args.shard_size else None
+    for chunk in read_chunks(args.path, args.chunk_size):
+        chunk = clean_chunk(chunk)
+        chunk.to_csv(args.output, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+        if shards:
+            shards.write(chunk)
+        rows += len(chunk)
+
+    if shards:
+        shards.close()
+    print(f"✅ Cleaned CSV saved as: {args.output}")
+    report(rows, args.path, start)
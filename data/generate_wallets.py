@@ -1,7 +1,21 @@
+import argparse
 import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from eth_account import Account
 from neo4j import GraphDatabase
 
+# Generates an Ethereum wallet for every patient without one:
+#
+#   python generate_wallets.py --limit 0 --batch-size 5000 --workers 8
+#
+# Keys are derived across a process pool, appended to the CSV and only then stored in
+# Neo4j, one UNWIND transaction per batch, so a stored wallet always has its key on disk.
+# Patients that already have a wallet are skipped, so an interrupted run resumes when
+# started again. A key written to the CSV just before an interruption is superseded by
+# the later line of the same pid.
+
 # Neo4j connection settings
 NEO4J_URI = "neo4j+s://d8af6d58.databases.neo4j.io"  # Change to your Neo4j instance
 NEO4J_USER = "neo4j"
@@ -10,49 +24,86 @@ NEO4J_PASSWORD = "cO0PNP_Kq14TGtkE3c6BrcwlF25aAkHsydFFjF1_s3c"
 # CSV output file
 CSV_FILE = "data/generated_wallets.csv"
 
-# Connect to Neo4j
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+READ_PATIENTS = """
+MATCH (p:Patient)
+WHERE p.wallet IS NULL AND p.pid > $after
+RETURN p.pid AS pid
+ORDER BY p.pid
+LIMIT $limit
+"""
+
+SET_WALLETS = """
+UNWIND $rows AS row
+MATCH (p:Patient {pid: row.pid})
+WHERE p.wallet IS NULL
+SET p.wallet = row.wallet
+"""
+
+
+def create_accounts(count: int) -> list[tuple[str, str]]:
+    """Create `count` accounts, returning their addresses and private keys."""
+    accounts = [Account.create() for _ in range(count)]
+    return [(account.address, "0x" + account.key.hex()) for account in accounts]
+
+
+def generate_keys(executor: ProcessPoolExecutor, count: int, workers: int) -> list[tuple[str, str]]:
+    """Split the creation of `count` accounts evenly across the pool."""
+    sizes = [count // workers + (i < count % workers) for i in range(workers)]
+    return [keys for part in executor.map(create_accounts, sizes) for keys in part]
+
 
+def open_csv(path: str):
+    """Open the CSV for appending, writing the header if it is new."""
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    file = open(path, "a", newline="")
+    writer = csv.writer(file)
+    if new:
+        writer.writerow(["pid", "wallet_address", "private_key"])
+    return file, writer
 
-def generate_wallets(limit=100):
+
+def generate_wallets(limit: int = 100, batch_size: int = 5000, workers: int = os.cpu_count()):
     """Generate Ethereum wallets for patients and save to CSV & Neo4j"""
-    with driver.session() as session:
-        # Get patient PIDs
-        result = session.run(
-            "MATCH (p:Patient) WHERE p.wallet IS NULL RETURN p.pid LIMIT $limit",
-            limit=limit,
-        )
-        patients = [{"pid": record["p.pid"]} for record in result]
-
-        if not patients:
-            print("No patients found without wallets.")
-            return
-
-        # Open CSV file
-        with open(CSV_FILE, "w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(["pid", "wallet_address", "private_key"])
-
-            for patient in patients:
-                # Generate a new wallet
-                account = Account.create()
-                wallet_address = account.address
-                private_key = "0x" + account.key.hex()
-
-                # Save to CSV
-                writer.writerow([patient["pid"], wallet_address, private_key])
-
-                # Store only wallet address in Neo4j
-                session.run(
-                    "MATCH (p:Patient {pid: $pid}) SET p.wallet = $wallet",
-                    pid=patient["pid"],
-                    wallet=wallet_address,
-                )
-
-                print(f"Generated: {patient['pid']} → {wallet_address}")
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    file, writer = open_csv(CSV_FILE)
+    generated = 0
+    after = ""
+    start = time.perf_counter()
+
+    with driver, file, ProcessPoolExecutor(max_workers=workers) as executor:
+        while not limit or generated < limit:
+            size = min(batch_size, limit - generated) if limit else batch_size
+            records, _, _ = driver.execute_query(READ_PATIENTS, after=after, limit=size)
+            pids = [record["pid"] for record in records]
+            if not pids:
+                break
+
+            keys = generate_keys(executor, len(pids), workers)
+            writer.writerows((pid, address, key) for pid, (address, key) in zip(pids, keys))
+            # The keys must be on disk before their addresses are stored
+            file.flush()
+            os.fsync(file.fileno())
 
+            rows = [{"pid": pid, "wallet": address} for pid, (address, _) in zip(pids, keys)]
+            with driver.session() as session:
+                session.execute_write(lambda tx: tx.run(SET_WALLETS, rows=rows).consume())
+
+            generated += len(pids)
+            after = pids[-1]
+            elapsed = time.perf_counter() - start
+            print(f"Generated {generated} wallets ({generated / elapsed:,.0f} wallets/s)")
+
+    if not generated:
+        print("No patients found without wallets.")
+        return
     print(f"✅ Wallets saved to {CSV_FILE}")
 
 
-# Generate wallets for the first 100 patients
-generate_wallets(limit=100)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Ethereum wallets for patients.")
+    parser.add_argument("--limit", type=int, default=100, help="patients to generate for, 0 for all")
+    parser.add_argument("--batch-size", type=int, default=5000, help="wallets per UNWIND transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="key generation processes")
+    args = parser.parse_args()
+
+    generate_wallets(args.limit, args.batch_size, args.workers)
@@ -1,4 +1,12 @@
-from neo4j import GraphDatabase
+import asyncio
+import sys
+from pathlib import Path
+from neo4j import GraphDatabase, AsyncGraphDatabase
+
+# Share the schema migration with the backend
+sys.path.append(str(Path(__file__).resolve().parents[1] / "backend"))
+from app.core.schema import bootstrap_schema
+from app.core.aggregates import rebuild_aggregates
 
 # Neo4j connection details
 NEO4J_URI = "neo4j+s://d8af6d58.databases.neo4j.io"  # Change to your Neo4j instance
@@ -34,6 +42,36 @@ def clear_neo4j(driver):
         print(f"❌ Failed to clear Neo4j database: {e}")
 
 
+def migrate_schema():
+    """Create the indexes and uniqueness constraints the MERGE statements rely on."""
+
+    async def run():
+        async with AsyncGraphDatabase.driver(
+            NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)
+        ) as driver:
+            await bootstrap_schema(driver)
+
+    try:
+        asyncio.run(run())
+    except Exception as e:
+        print(f"❌ Failed to migrate Neo4j schema: {e}")
+
+
+def build_aggregates():
+    """Recompute the aggregate statistics served by /api/stats after an import."""
+
+    async def run():
+        async with AsyncGraphDatabase.driver(
+            NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)
+        ) as driver:
+            return await rebuild_aggregates(driver)
+
+    try:
+        print("✅ Aggregate statistics built:", asyncio.run(run()), "aggregates")
+    except Exception as e:
+        print(f"❌ Failed to build aggregate statistics: {e}")
+
+
 def load_csv_to_neo4j(driver, csv_url):
     print(f"Loading: {csv_url}")
     try:
@@ -88,7 +126,9 @@ MERGE (v2)-[:ADMINISTERED_BY]->(h);
 if __name__ == "__main__":
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
     # clear_neo4j(driver=driver)
+    migrate_schema()
     # load_csv_to_neo4j(driver=driver, csv_url=csv_path_format.format(i=5))
     # load_chunked_files_to_neo4j(driver=driver, start=4, end=4)
     load_custom_data_to_neo4j(driver=driver)
+    build_aggregates()
     print("✅ Done!")